@@ -0,0 +1,67 @@
+# --- BENCHMARK: TIEMPO HASTA LA PRIMERA VENTANA ---
+# Uso:  python benchmarks/bench_arranque.py --repeticiones 5
+# (en Linux sin pantalla:  xvfb-run python benchmarks/bench_arranque.py)
+# Cada medición se realiza en un proceso nuevo. El modo "anterior" reproduce las descargas de
+# NLTK que se hacían al importar el módulo; el modo "actual" usa la carga perezosa.
+# Cada proceso usa una carpeta temporal para los datos (proyecto y caché de extracción), de modo que
+# la medición no lee ni modifica el proyecto real que está junto a Interfaz_CodCual.py.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CARPETA_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+PROGRAMA_HIJO = r"""
+import sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, {src!r})
+if {anterior!r}:
+    import nltk
+    try:
+        nltk.download('punkt_tab', quiet=True)
+        nltk.download('punkt', quiet=True)
+    except Exception:
+        pass
+import tkinter as tk
+import Interfaz_CodCual
+Interfaz_CodCual.carpeta_de_datos = lambda: {carpeta!r}
+raiz = tk.Tk()
+try:
+    app = Interfaz_CodCual.EtiquetadoApp(raiz)
+    try:
+        # Se procesan los eventos pendientes para que la ventana quede dibujada
+        raiz.update()
+        print(time.perf_counter() - inicio)
+    finally:
+        # Se cierran el proyecto y la caché para que la carpeta temporal se pueda borrar
+        app.cache_extraccion.sincronizar()
+        app.proyecto.cerrar()
+finally:
+    raiz.destroy()
+"""
+
+
+def medir(anterior, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        with tempfile.TemporaryDirectory() as carpeta:
+            programa = PROGRAMA_HIJO.format(src=os.path.abspath(CARPETA_SRC), anterior=anterior, carpeta=carpeta)
+            salida = subprocess.run([sys.executable, "-c", programa], capture_output=True,
+                                    text=True, check=True)
+        tiempos.append(float(salida.stdout.strip().splitlines()[-1]))
+    return tiempos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo hasta la primera ventana")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    for etiqueta, anterior in (("Anterior (descarga al importar)", True),
+                               ("Actual (carga perezosa)", False)):
+        tiempos = medir(anterior, args.repeticiones)
+        print(f"{etiqueta:34s} mediana {statistics.median(tiempos):7.3f} s"
+              f"   mín {min(tiempos):7.3f} s   máx {max(tiempos):7.3f} s")
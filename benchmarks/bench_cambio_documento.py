@@ -0,0 +1,120 @@
+# --- BENCHMARK: TIEMPO HASTA QUE LA INTERFAZ RESPONDE AL CAMBIAR A UN DOCUMENTO MUY CODIFICADO ---
+# Uso (Linux sin pantalla):  xvfb-run -a python benchmarks/bench_cambio_documento.py
+# Se reproduce lo que hace 'cambiar_archivo': mostrar el texto del documento y restaurar sus
+# subrayados. El modo "original" restaura fragmento por fragmento (tag_add, tag_configure, tres
+# tag_bind y un Tooltip nuevo por subrayado); el modo "actual" agrupa los tramos por código y los
+# aplica con una sola llamada por grupo. El tiempo incluye el procesamiento de las tareas
+# pendientes de Tk (update_idletasks), es decir, hasta que la ventana vuelve a responder.
+import argparse
+import os
+import random
+import sys
+import time
+import tkinter as tk
+import uuid
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from capa_subrayados import CapaSubrayados  # noqa: E402
+from datos_sinteticos import color_de, lineas_del_panel  # noqa: E402
+
+
+class TooltipVacio:
+    # Misma forma que la clase Tooltip de la aplicación, sin crear ventanas
+    def __init__(self, widget, text):
+        self.widget = widget
+        self.text = text
+        self.tooltip_window = None
+
+    def show_tooltip(self, event, tag_name):
+        pass
+
+    def hide_tooltip(self, event):
+        pass
+
+    def update_position(self, event):
+        pass
+
+
+def subrayados_sinteticos(lineas_texto, cantidad, codigos, semilla=3):
+    aleatorio = random.Random(semilla)
+    subrayados = []
+    for i in range(cantidad):
+        linea = aleatorio.randrange(1, lineas_texto, 2)
+        inicio = aleatorio.randrange(0, 40)
+        color = color_de(i % codigos)
+        subrayados.append({
+            "tag": f"Color_{color}_{str(uuid.uuid4())[:8]}",
+            "start": f"{linea}.{inicio}",
+            "end": f"{linea}.{inicio + aleatorio.randrange(5, 40)}",
+            "color": color,
+            "etiqueta": f"Código {i % codigos}",
+        })
+    return subrayados
+
+
+# --- RESTAURACIÓN ORIGINAL: FRAGMENTO POR FRAGMENTO ---
+def restaurar_original(texto_widget, subrayados):
+    for sub in subrayados:
+        tag_name = sub["tag"]
+        texto_widget.tag_add(tag_name, sub["start"], sub["end"])
+        texto_widget.tag_configure(tag_name, underline=True, font=("Arial", 14, "bold"), foreground=sub["color"])
+        tooltip = TooltipVacio(texto_widget, sub["etiqueta"])
+        texto_widget.tag_bind(tag_name, "<Enter>", lambda event, tooltip=tooltip, tag_name=tag_name: tooltip.show_tooltip(event, tag_name))
+        texto_widget.tag_bind(tag_name, "<Leave>", tooltip.hide_tooltip)
+        texto_widget.tag_bind(tag_name, "<Motion>", tooltip.update_position)
+    texto_widget.tag_raise("sel")
+
+
+# --- RESTAURACIÓN ACTUAL: UNA LLAMADA POR CÓDIGO Y COLOR ---
+def restaurar_actual(texto_widget, subrayados):
+    capa = CapaSubrayados(texto_widget)
+    tramos_por_estilo = {}
+    for sub in subrayados:
+        tramos_por_estilo.setdefault((sub["etiqueta"], sub["color"]), []).append((sub["start"], sub["end"]))
+    for (etiqueta, color), tramos in tramos_por_estilo.items():
+        capa.agregar_varios(etiqueta, color, tramos)
+    texto_widget.tag_raise("sel")
+
+
+def cambiar_documento(raiz, texto_widget, texto, subrayados, restaurar):
+    # Se parte de un widget sin tags de un documento anterior
+    for tag in texto_widget.tag_names():
+        if tag != "sel":
+            texto_widget.tag_delete(tag)
+    raiz.update_idletasks()
+    inicio = time.perf_counter()
+    texto_widget.delete("1.0", tk.END)
+    texto_widget.insert(tk.END, texto)
+    restaurar(texto_widget, subrayados)
+    raiz.update_idletasks()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de cambio a un documento codificado")
+    parser.add_argument("--subrayados", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--codigos", type=int, default=25)
+    parser.add_argument("--oraciones", type=int, default=5000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    raiz = tk.Tk()
+    texto_widget = tk.Text(raiz, wrap=tk.WORD, width=77, height=23, font=("Arial", 14))
+    texto_widget.pack()
+    raiz.update()
+
+    texto = lineas_del_panel(args.oraciones)
+
+    print(f"{'subrayados':>10} {'original (s)':>14} {'actual (s)':>12} {'aceleración':>12}")
+    for cantidad in args.subrayados:
+        subrayados = subrayados_sinteticos(2 * args.oraciones, cantidad, args.codigos)
+        tiempos = []
+        for restaurar in (restaurar_original, restaurar_actual):
+            tiempos.append(min(cambiar_documento(raiz, texto_widget, texto, subrayados, restaurar)
+                               for _ in range(args.repeticiones)))
+        t_original, t_actual = tiempos
+        print(f"{cantidad:>10} {t_original:>14.3f} {t_actual:>12.3f} {t_original / t_actual:>11.1f}x")
+
+    raiz.destroy()
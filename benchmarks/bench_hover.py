@@ -0,0 +1,116 @@
+# --- BENCHMARK: LATENCIA DEL HOVER SOBRE EL PANEL "TEXTO" SEGÚN EL NÚMERO DE SUBRAYADOS ---
+# Uso (Linux sin pantalla):  xvfb-run -a python benchmarks/bench_hover.py
+# Se compara el esquema original (un tag 'Color_{color}_{uuid}' por fragmento, cada uno con su estilo
+# y tres manejadores de eventos) con la capa de subrayados actual (un tag compartido por código).
+# Para cada caso se mide el tiempo de la consulta que hace 'cambiar_cursor_segun_posicion' en cada
+# evento <Motion>, recorriendo una trayectoria fija de posiciones del ratón sobre el widget.
+import argparse
+import os
+import random
+import sys
+import time
+import tkinter as tk
+import uuid
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from capa_subrayados import CapaSubrayados  # noqa: E402
+from datos_sinteticos import color_de, lineas_del_panel  # noqa: E402
+
+
+class TooltipVacio:
+    def show_tooltip(self, event, tag_name):
+        pass
+
+    def hide_tooltip(self, event):
+        pass
+
+    def update_position(self, event):
+        pass
+
+
+def tramos_aleatorios(texto_widget, cantidad, semilla=1):
+    # Se eligen fragmentos de una línea dentro del texto (en el widget cada oración ocupa una línea)
+    aleatorio = random.Random(semilla)
+    ultima_linea = int(texto_widget.index("end-1c").split('.')[0])
+    tramos = []
+    for _ in range(cantidad):
+        linea = aleatorio.randrange(1, ultima_linea, 2)
+        inicio = aleatorio.randrange(0, 40)
+        tramos.append((f"{linea}.{inicio}", f"{linea}.{inicio + aleatorio.randrange(5, 60)}"))
+    return tramos
+
+
+# --- ESQUEMA ORIGINAL: UN TAG POR FRAGMENTO ---
+def subrayar_original(texto_widget, tramos, codigos):
+    tooltip = TooltipVacio()
+    for i, (inicio, fin) in enumerate(tramos):
+        color = color_de(i)
+        tag_name = f"Color_{color}_{str(uuid.uuid4())[:8]}"
+        texto_widget.tag_add(tag_name, inicio, fin)
+        texto_widget.tag_configure(tag_name, underline=True, font=("Arial", 14, "bold"), foreground=color)
+        texto_widget.tag_bind(tag_name, "<Enter>", lambda event, t=tag_name: tooltip.show_tooltip(event, t))
+        texto_widget.tag_bind(tag_name, "<Leave>", tooltip.hide_tooltip)
+        texto_widget.tag_bind(tag_name, "<Motion>", tooltip.update_position)
+    return lambda tag: tag.startswith("Color_")
+
+
+# --- ESQUEMA ACTUAL: UN TAG COMPARTIDO POR CÓDIGO Y COLOR ---
+def subrayar_actual(texto_widget, tramos, codigos):
+    capa = CapaSubrayados(texto_widget)
+    for i, (inicio, fin) in enumerate(tramos):
+        capa.agregar(f"Código {i % codigos}", color_de(i % codigos), inicio, fin)
+    return capa.estilo_por_tag.__contains__
+
+
+def medir_hover(texto_widget, es_tag_de_codigo, posiciones):
+    inicio = time.perf_counter()
+    for x, y in posiciones:
+        tags = texto_widget.tag_names(f"@{x},{y}")
+        any(es_tag_de_codigo(tag) for tag in tags)
+    return (time.perf_counter() - inicio) / len(posiciones)
+
+
+def preparar(texto_widget, lineas):
+    texto_widget.delete("1.0", tk.END)
+    for tag in texto_widget.tag_names():
+        if tag != "sel":
+            texto_widget.tag_delete(tag)
+    texto_widget.insert(tk.END, lineas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia del hover según el número de subrayados")
+    parser.add_argument("--subrayados", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--codigos", type=int, default=25)
+    parser.add_argument("--movimientos", type=int, default=2000)
+    args = parser.parse_args()
+
+    raiz = tk.Tk()
+    texto_widget = tk.Text(raiz, wrap=tk.WORD, width=77, height=23, font=("Arial", 14))
+    texto_widget.pack()
+    raiz.update()
+
+    lineas = lineas_del_panel(5000)
+    aleatorio = random.Random(7)
+    posiciones = [(aleatorio.randrange(0, texto_widget.winfo_width()),
+                   aleatorio.randrange(0, texto_widget.winfo_height())) for _ in range(args.movimientos)]
+
+    print(f"{'subrayados':>10} {'tags orig.':>10} {'tags act.':>10} {'original (µs)':>14} {'actual (µs)':>12}")
+    for cantidad in args.subrayados:
+        resultados = []
+        for subrayar in (subrayar_original, subrayar_actual):
+            preparar(texto_widget, lineas)
+            tramos = tramos_aleatorios(texto_widget, cantidad)
+            es_tag_de_codigo = subrayar(texto_widget, tramos, args.codigos)
+            raiz.update_idletasks()
+            # Se desplaza la vista a una zona con subrayados para que la trayectoria los recorra
+            texto_widget.see(tramos[0][0])
+            raiz.update_idletasks()
+            tags_totales = len(texto_widget.tag_names()) - 1
+            resultados.append((tags_totales, medir_hover(texto_widget, es_tag_de_codigo, posiciones)))
+        (tags_original, t_original), (tags_actual, t_actual) = resultados
+        print(f"{cantidad:>10} {tags_original:>10} {tags_actual:>10} {t_original * 1e6:>14.1f} {t_actual * 1e6:>12.1f}")
+
+    raiz.destroy()
@@ -0,0 +1,131 @@
+# --- BENCHMARK: REPRODUCCIÓN DE UNA TRAYECTORIA DEL RATÓN SOBRE EL PANEL "TEXTO" ---
+# Uso (Linux sin pantalla):  xvfb-run -a python benchmarks/bench_hover_cursor.py
+# Se reproduce una secuencia de eventos <Motion> con marcas de tiempo (un ratón que informa a 250 Hz)
+# contra dos versiones del manejador 'cambiar_cursor_segun_posicion':
+#   - original: en cada evento, tag_names("@x,y"), startswith("Color_") sobre cada tag y config(cursor=...)
+#   - actual: los eventos se agrupan en una consulta por cuadro (INTERVALO_HOVER_MS), la pregunta
+#     "¿está codificada esta posición?" se responde con el índice de intervalos del almacén de
+#     anotaciones (hay_en, la misma consulta que hace 'actualizar_cursor_hover') y el cursor solo se
+#     reconfigura cuando cambia. Los nombres de los códigos no se consultan por cuadro: el tooltip los
+#     pide solo al aparecer, así que no forman parte del costo por evento.
+# El reloj de la agrupación es simulado con las marcas de tiempo de la trayectoria, de modo que el
+# resultado no depende de la velocidad con la que se reproducen los eventos.
+import argparse
+import os
+import random
+import sys
+import time
+import tkinter as tk
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from anotaciones import AlmacenAnotaciones  # noqa: E402
+from documento import Documento, DisposicionTexto  # noqa: E402
+from datos_sinteticos import texto_sintetico, limites_sinteticos, crear_codigos, agregar_fragmentos  # noqa: E402
+
+INTERVALO_HOVER_MS = 16
+NOMBRE = "entrevista.pdf"
+
+
+def documento_sintetico(oraciones):
+    return Documento(NOMBRE, texto_sintetico(oraciones), limites_sinteticos(oraciones))
+
+
+def trayectoria(ancho, alto, eventos, hz=250, semilla=9):
+    # Paseo aleatorio del ratón: (milisegundos, x, y)
+    aleatorio = random.Random(semilla)
+    x, y = ancho // 2, alto // 2
+    puntos = []
+    for i in range(eventos):
+        x = min(max(x + aleatorio.randint(-6, 6), 0), ancho - 1)
+        y = min(max(y + aleatorio.randint(-4, 4), 0), alto - 1)
+        puntos.append((i * 1000.0 / hz, x, y))
+    return puntos
+
+
+# --- MANEJADOR ORIGINAL: UNA CONSULTA DE TAGS Y UN CAMBIO DE CURSOR POR EVENTO ---
+def reproducir_original(texto_widget, puntos):
+    consultas = cambios = 0
+    for _, x, y in puntos:
+        tags = texto_widget.tag_names("@{},{}".format(x, y))
+        consultas += 1
+        if any(tag.startswith("Color_") for tag in tags):
+            texto_widget.config(cursor="circle")
+        else:
+            texto_widget.config(cursor="xterm")
+        cambios += 1
+    return consultas, cambios
+
+
+# --- MANEJADOR ACTUAL: UNA CONSULTA POR CUADRO, ÍNDICE EN MEMORIA Y CURSOR SOLO SI CAMBIA ---
+def reproducir_actual(texto_widget, puntos, disposicion, almacen):
+    consultas = cambios = 0
+    cursor_actual = None
+    posicion = None
+    vencimiento = None
+
+    def consultar():
+        nonlocal consultas, cambios, cursor_actual
+        consultas += 1
+        x, y = posicion
+        desplazamiento = disposicion.a_desplazamiento(texto_widget.index("@{},{}".format(x, y)))
+        cursor = "circle" if almacen.hay_en(NOMBRE, desplazamiento) else "xterm"
+        if cursor != cursor_actual:
+            cursor_actual = cursor
+            texto_widget.config(cursor=cursor)
+            cambios += 1
+
+    for instante, x, y in puntos:
+        # Se ejecuta la consulta programada si ya venció su intervalo (equivalente a 'after')
+        if vencimiento is not None and instante >= vencimiento:
+            vencimiento = None
+            consultar()
+        posicion = (x, y)
+        if vencimiento is None:
+            vencimiento = instante + INTERVALO_HOVER_MS
+    if vencimiento is not None:
+        consultar()
+    return consultas, cambios
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproducción de eventos de movimiento sobre el panel Texto")
+    parser.add_argument("--oraciones", type=int, default=5000)
+    parser.add_argument("--subrayados", type=int, default=10000)
+    parser.add_argument("--eventos", type=int, default=5000)
+    args = parser.parse_args()
+
+    raiz = tk.Tk()
+    texto_widget = tk.Text(raiz, wrap=tk.WORD, width=77, height=23, font=("Arial", 14))
+    texto_widget.pack()
+    documento = documento_sintetico(args.oraciones)
+    disposicion = DisposicionTexto(documento)
+    texto_widget.insert(tk.END, '\n'.join(documento.oraciones).replace('\n', '\n\n') + '\n\n')
+    raiz.update()
+
+    # Fragmentos concentrados en la zona visible para que la trayectoria pase por texto codificado
+    aleatorio = random.Random(3)
+    limite = documento.limites_oraciones[2 * 40 - 1]
+    almacen = AlmacenAnotaciones()
+    codigos = crear_codigos(almacen.libro, 25)
+    # En el esquema original cada fragmento tiene su propio tag 'Color_...'
+    for anotacion in agregar_fragmentos(almacen, NOMBRE, codigos, args.subrayados, limite, aleatorio, largo=(5, 40)):
+        texto_widget.tag_add(anotacion.id, disposicion.a_indice(anotacion.inicio), disposicion.a_indice(anotacion.fin))
+        texto_widget.tag_configure(anotacion.id, underline=True, foreground=anotacion.color)
+    raiz.update_idletasks()
+
+    puntos = trayectoria(texto_widget.winfo_width(), texto_widget.winfo_height(), args.eventos)
+    duracion = puntos[-1][0] / 1000.0
+
+    print(f"Trayectoria: {args.eventos} eventos <Motion> en {duracion:.1f} s; {args.subrayados} fragmentos")
+    print(f"{'manejador':>10} {'consultas':>10} {'config()':>9} {'total (ms)':>11} {'por evento (µs)':>16}")
+    for nombre, reproducir in (("original", lambda: reproducir_original(texto_widget, puntos)),
+                               ("actual", lambda: reproducir_actual(texto_widget, puntos, disposicion, almacen))):
+        inicio = time.perf_counter()
+        consultas, cambios = reproducir()
+        raiz.update_idletasks()
+        total = time.perf_counter() - inicio
+        print(f"{nombre:>10} {consultas:>10} {cambios:>9} {total * 1e3:>11.1f} {total / len(puntos) * 1e6:>16.1f}")
+
+    raiz.destroy()
@@ -0,0 +1,74 @@
+# --- BENCHMARK: MEMORIA DEL MODELO DE DOCUMENTO (LISTAS DE CADENAS VS. ARREGLOS DE LÍMITES) ---
+# Uso:  python benchmarks/bench_memoria_documentos.py --documentos 100
+# Se simula un proyecto de N entrevistas a partir de los archivos de ejemplo de 'data/' y se mide
+# con tracemalloc la memoria que ocupa cada representación de los documentos abiertos.
+import argparse
+import os
+import sys
+import tracemalloc
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from documento import Documento  # noqa: E402
+from segmentacion import segmentar_limites, oraciones_desde_limites  # noqa: E402
+
+
+# --- GENERACIÓN DE LOS TEXTOS DEL PROYECTO SINTÉTICO ---
+def textos_del_proyecto(documentos):
+    with open(os.path.join(RAIZ, "data", "Entrevista_2.txt"), encoding="utf-8") as archivo:
+        base = archivo.read()
+    # Cada documento recibe un encabezado distinto para que sus textos no sean la misma cadena
+    return [f"Entrevista {n}\n{base}" for n in range(documentos)]
+
+
+# --- MODELO ANTERIOR: CONTENIDO + LISTA 'tokens' + LISTA 'sentencias' ---
+def construir_modelo_anterior(textos, limites):
+    proyecto = {}
+    for n, (texto, lim) in enumerate(zip(textos, limites)):
+        proyecto[f"doc_{n}"] = {
+            "contenido": texto,
+            "tokens": oraciones_desde_limites(texto, lim),
+            "sentencias": oraciones_desde_limites(texto, lim),
+        }
+    return proyecto
+
+
+# --- MODELO NUEVO: TEXTO ÚNICO + ARREGLO DE LÍMITES ---
+def construir_modelo_nuevo(textos, limites):
+    return {f"doc_{n}": Documento(f"doc_{n}", texto, lim)
+            for n, (texto, lim) in enumerate(zip(textos, limites))}
+
+
+def medir_memoria(constructor, *args):
+    tracemalloc.start()
+    inicial = tracemalloc.get_traced_memory()[0]
+    proyecto = constructor(*args)
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return proyecto, actual - inicial, pico - inicial
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memoria del modelo de documento")
+    parser.add_argument("--documentos", type=int, default=100)
+    args = parser.parse_args()
+
+    textos = textos_del_proyecto(args.documentos)
+    limites = [segmentar_limites(texto) for texto in textos]
+    bytes_texto = sum(len(texto.encode("utf-8")) for texto in textos)
+
+    anterior, mem_anterior, pico_anterior = medir_memoria(construir_modelo_anterior, textos, limites)
+    nuevo, mem_nuevo, pico_nuevo = medir_memoria(construir_modelo_nuevo, textos, limites)
+
+    # Se comprueba que ambos modelos exponen exactamente las mismas oraciones
+    for nombre, documento in nuevo.items():
+        assert list(documento.oraciones) == anterior[nombre]["sentencias"]
+
+    # Los textos y los límites ya existían antes de medir: solo se mide lo que añade cada modelo,
+    # sumando el arreglo de límites al modelo nuevo porque forma parte de su representación
+    bytes_limites = sum(lim.itemsize * len(lim) for lim in limites)
+    print(f"Documentos:                    {args.documentos}")
+    print(f"Texto original (UTF-8):        {bytes_texto / 1e6:8.2f} MB")
+    print(f"Modelo anterior (listas):      {mem_anterior / 1e6:8.2f} MB  (pico {pico_anterior / 1e6:.2f} MB)")
+    print(f"Modelo nuevo (array + vistas): {(mem_nuevo + bytes_limites) / 1e6:8.2f} MB  (pico {pico_nuevo / 1e6:.2f} MB)")
@@ -0,0 +1,108 @@
+# --- BENCHMARK: COSTO DE UN PASO DE NAVEGACIÓN ENTRE LAS OCURRENCIAS DE UN CÓDIGO ---
+# Uso:  python benchmarks/bench_navegacion.py
+# Se compara lo que hacía 'resaltar_etiqueta' en cada clic sobre el botón de color de un código
+# (recorrer los subrayados de todos los documentos, convertir cada "start" en clave de orden y ordenar
+# la lista completa) con el índice invertido código -> ocurrencias que mantiene 'AlmacenAnotaciones',
+# en el que avanzar o retroceder es un acceso directo por posición. También se mide el costo de
+# mantener el índice al codificar y descodificar fragmentos.
+import argparse
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from anotaciones import AlmacenAnotaciones  # noqa: E402
+from datos_sinteticos import color_de  # noqa: E402
+
+
+def proyecto_sintetico(documentos, ocurrencias, codigos, semilla=11):
+    # Retorna las filas (documento, id, código, color, inicio, fin) de un proyecto codificado
+    aleatorio = random.Random(semilla)
+    filas = []
+    for i in range(ocurrencias):
+        documento = f"entrevista_{aleatorio.randrange(documentos):03d}.pdf"
+        inicio = aleatorio.randrange(0, 400000)
+        codigo = i % codigos
+        filas.append((documento, f"Color_{i:08x}", f"Código {codigo}", color_de(codigo),
+                      inicio, inicio + aleatorio.randrange(5, 200)))
+    return filas
+
+
+# --- NAVEGACIÓN ORIGINAL: RECORRER Y ORDENAR EN CADA CLIC ---
+def archivos_abiertos_originales(filas):
+    # Estructura de 'archivos_abiertos' con los subrayados guardados como índices "línea.columna"
+    archivos = {}
+    for documento, id, codigo, color, inicio, fin in filas:
+        archivos.setdefault(documento, {"subrayados": []})["subrayados"].append({
+            "tag": id, "start": f"{inicio // 80 + 1}.{inicio % 80}", "end": f"{fin // 80 + 1}.{fin % 80}",
+            "color": color, "etiqueta": codigo})
+    return archivos
+
+
+def paso_original(archivos, etiqueta, indice_navegacion):
+    coincidencias = []
+    for nombre, datos in archivos.items():
+        for sub in datos["subrayados"]:
+            if sub["etiqueta"] == etiqueta:
+                linea, columna = map(int, sub["start"].split('.'))
+                coincidencias.append((nombre, linea, columna, sub))
+    coincidencias.sort(key=lambda c: (c[0], c[1], c[2]))
+    posicion = (indice_navegacion.get(etiqueta, -1) + 1) % len(coincidencias)
+    indice_navegacion[etiqueta] = posicion
+    return coincidencias[posicion]
+
+
+# --- NAVEGACIÓN ACTUAL: ÍNDICE INVERTIDO MANTENIDO POR EL ALMACÉN ---
+def paso_actual(almacen, etiqueta, indice_navegacion):
+    anotacion, posicion = almacen.ocurrencia(etiqueta, indice_navegacion.get(etiqueta, -1) + 1)
+    indice_navegacion[etiqueta] = posicion
+    return anotacion
+
+
+def medir(paso, estructura, etiquetas, pasos):
+    indice_navegacion = {}
+    inicio = time.perf_counter()
+    for i in range(pasos):
+        paso(estructura, etiquetas[i % len(etiquetas)], indice_navegacion)
+    return (time.perf_counter() - inicio) / pasos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Costo de navegar entre las ocurrencias de un código")
+    parser.add_argument("--documentos", type=int, default=200)
+    parser.add_argument("--ocurrencias", type=int, default=20000)
+    parser.add_argument("--codigos", type=int, default=40)
+    parser.add_argument("--pasos", type=int, default=200)
+    args = parser.parse_args()
+
+    filas = proyecto_sintetico(args.documentos, args.ocurrencias, args.codigos)
+    etiquetas = [f"Código {c}" for c in range(args.codigos)]
+
+    archivos = archivos_abiertos_originales(filas)
+    inicio = time.perf_counter()
+    almacen = AlmacenAnotaciones()
+    for documento, id, codigo, color, ini, fin in filas:
+        almacen.agregar(id, documento, codigo, color, ini, fin)
+    t_carga = time.perf_counter() - inicio
+
+    t_original = medir(paso_original, archivos, etiquetas, args.pasos)
+    t_actual = medir(paso_actual, almacen, etiquetas, args.pasos * 100)
+
+    # Mantenimiento incremental: descodificar y volver a codificar fragmentos al azar
+    aleatorio = random.Random(5)
+    muestra = aleatorio.sample(list(almacen.por_id.values()), min(1000, len(almacen)))
+    inicio = time.perf_counter()
+    for anotacion in muestra:
+        almacen.eliminar(anotacion)
+        almacen.agregar(anotacion.id, anotacion.documento, anotacion.codigo, anotacion.color,
+                        anotacion.inicio, anotacion.fin)
+    t_mantenimiento = (time.perf_counter() - inicio) / len(muestra)
+
+    print(f"Proyecto: {args.documentos} documentos, {args.ocurrencias} ocurrencias, {args.codigos} códigos")
+    print(f"Construcción del almacén con su índice: {t_carga * 1e3:.1f} ms")
+    print(f"{'paso original (µs)':>20} {'paso actual (µs)':>18} {'aceleración':>12}")
+    print(f"{t_original * 1e6:>20.1f} {t_actual * 1e6:>18.2f} {t_original / t_actual:>11.0f}x")
+    print(f"Descodificar + codificar un fragmento (mantenimiento del índice): {t_mantenimiento * 1e6:.1f} µs")
@@ -0,0 +1,137 @@
+# --- BENCHMARK: LATENCIA DE GUARDADO Y TIEMPO DE ARRANQUE SEGÚN EL TAMAÑO DEL PROYECTO ---
+# Uso:  python benchmarks/bench_proyecto.py --documentos 10 50 200 500
+# Se comparan dos formas de persistir el mismo proyecto sintético:
+#   - pickle: todo el estado se serializa en un archivo (lo que hacía 'salir_programa'); guardar una
+#     acción de codificación obliga a reescribir el proyecto completo
+#   - sqlite: base en modo WAL; cada acción de codificación es una transacción con un solo fragmento
+# Para cada tamaño se mide el guardado de una acción (mediana), el arranque (leer el pickle completo o
+# solo el manifiesto de la base, y llenar el almacén de anotaciones) y, en la base, la lectura del texto
+# de un documento al abrirlo.
+import argparse
+import os
+import pickle
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from anotaciones import AlmacenAnotaciones  # noqa: E402
+from proyecto_sqlite import ProyectoSQLite  # noqa: E402
+from datos_sinteticos import (COLORES, texto_sintetico, limites_sinteticos, crear_codigos,  # noqa: E402
+                              agregar_fragmentos)
+
+
+def proyecto_sintetico(documentos, oraciones, fragmentos, semilla=5):
+    aleatorio = random.Random(semilla)
+    texto = texto_sintetico(oraciones)
+    limites = limites_sinteticos(oraciones)
+    archivos = {}
+    almacen = AlmacenAnotaciones()
+    codigos = crear_codigos(almacen.libro, 40)
+    for d in range(documentos):
+        nombre = f"entrevista_{d:04d}.docx"
+        # Un texto distinto por documento (pickle no puede compartir un mismo objeto entre documentos)
+        archivos[nombre] = {"contenido": texto.replace("clínica", f"clínica{d % 10}", 1), "limites": limites}
+        agregar_fragmentos(almacen, nombre, codigos, fragmentos, len(texto) - 60, aleatorio)
+    almacen.tomar_cambios()
+    return archivos, almacen
+
+
+def datos_pickle(archivos, almacen):
+    filas = almacen.a_datos()
+    return {
+        "libro_codigos": almacen.libro.a_datos(),
+        "archivos_abiertos": {nombre: {"contenido": datos["contenido"], "limites": datos["limites"],
+                                       "anotaciones": filas.get(nombre, [])}
+                              for nombre, datos in archivos.items()},
+    }
+
+
+def poblar_almacen(datos):
+    # Lo que hace la aplicación al iniciar con los datos leídos: libro de códigos y fragmentos
+    almacen = AlmacenAnotaciones()
+    almacen.libro.cargar(datos.get("libro_codigos"))
+    for nombre, datos_documento in datos["archivos_abiertos"].items():
+        almacen.cargar_documento(nombre, datos_documento.get("anotaciones", []))
+    return almacen
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def medir_pickle(carpeta, archivos, almacen, repeticiones):
+    ruta = os.path.join(carpeta, "datos_codificacion.pkl")
+
+    def guardar():
+        with open(ruta, "wb") as archivo:
+            pickle.dump(datos_pickle(archivos, almacen), archivo)
+
+    def cargar():
+        with open(ruta, "rb") as archivo:
+            poblar_almacen(pickle.load(archivo))
+
+    guardado = medir(guardar, repeticiones)
+    return guardado, medir(cargar, repeticiones), None, os.path.getsize(ruta)
+
+
+def medir_sqlite(carpeta, archivos, almacen, repeticiones):
+    ruta = os.path.join(carpeta, "proyecto_codificacion.db")
+    proyecto = ProyectoSQLite(ruta)
+    proyecto.importar(archivos, almacen.a_datos(), almacen.libro, {})
+    nombre = next(iter(archivos))
+    contador = [0]
+
+    def guardar_accion():
+        # Una acción de codificación: un fragmento nuevo y su transacción
+        contador[0] += 1
+        almacen.agregar(f"Nuevo_{contador[0]}", nombre, 1, COLORES[0], 10, 40)
+        proyecto.guardar_cambios(almacen.tomar_cambios(), almacen.libro)
+
+    guardado = medir(guardar_accion, repeticiones)
+    proyecto.cerrar()
+    # El arranque es abrir la base y leer el manifiesto; las conexiones se cierran fuera de la medición
+    abiertos = []
+
+    def arrancar():
+        abiertos.append(ProyectoSQLite(ruta))
+        poblar_almacen(abiertos[-1].cargar())
+
+    carga = medir(arrancar, repeticiones)
+    for abierto in abiertos:
+        abierto.cerrar()
+    proyecto = ProyectoSQLite(ruta)
+    nombres = list(archivos)
+    apertura = medir(lambda: proyecto.cargar_documento(nombres[len(nombres) // 2]), repeticiones)
+    proyecto.cerrar()
+    return guardado, carga, apertura, os.path.getsize(ruta)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia de guardado y arranque del proyecto: pickle y SQLite")
+    parser.add_argument("--documentos", type=int, nargs="+", default=[10, 50, 200, 500])
+    parser.add_argument("--oraciones", type=int, default=400)
+    parser.add_argument("--fragmentos", type=int, default=100, help="fragmentos codificados por documento")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'documentos':>10} {'formato':>8} {'guardar acción (ms)':>20} {'arranque (ms)':>14} "
+          f"{'abrir documento (ms)':>21} {'tamaño (MB)':>12}")
+    for documentos in args.documentos:
+        archivos, almacen = proyecto_sintetico(documentos, args.oraciones, args.fragmentos)
+        with tempfile.TemporaryDirectory() as carpeta:
+            for formato, medicion in (("pickle", medir_pickle), ("sqlite", medir_sqlite)):
+                guardado, carga, apertura, tamano = medicion(carpeta, archivos, almacen, args.repeticiones)
+                # Con el pickle todos los documentos ya están en memoria al terminar la carga
+                apertura = "-" if apertura is None else f"{apertura * 1e3:.2f}"
+                print(f"{documentos:>10} {formato:>8} {guardado * 1e3:>20.2f} {carga * 1e3:>14.1f} "
+                      f"{apertura:>21} {tamano / 1e6:>12.1f}")
@@ -0,0 +1,80 @@
+# --- BENCHMARK: TIEMPO DE CARGA DEL PANEL "TEXTO" SEGÚN EL NÚMERO DE ORACIONES ---
+# Uso (Linux sin pantalla):  xvfb-run -a python benchmarks/bench_renderizado.py
+# Se compara el renderizado original (una inserción y una fuente nueva por llamada) con la
+# inserción única de 'EtiquetadoApp.insertar_oraciones', usando un widget Text configurado igual
+# que el panel central de la aplicación.
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import font
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from documento import Documento  # noqa: E402
+from segmentacion import SegmentadorEspanol  # noqa: E402
+
+
+# --- RENDERIZADO ORIGINAL DE 'mostrar_contenido_original' ---
+def renderizar_original(texto_widget, oraciones):
+    contenido_mostrar = '\n'.join(str(t) for t in oraciones)
+    texto_widget.delete(1.0, tk.END)
+    bold_font = font.Font(texto_widget, texto_widget.cget("font"))
+    bold_font.configure(weight="bold")
+    for linea in contenido_mostrar.split('\n'):
+        texto_widget.insert(tk.END, f"{linea}\n\n")
+    texto_widget.tag_configure("bold", font=bold_font)
+
+
+# --- RENDERIZADO ACTUAL: UNA SOLA INSERCIÓN ---
+def renderizar_actual(texto_widget, oraciones):
+    texto_widget.delete(1.0, tk.END)
+    texto_widget.insert(tk.END, '\n'.join(oraciones).replace('\n', '\n\n') + '\n\n')
+
+
+def documento_sintetico(oraciones_objetivo):
+    with open(os.path.join(RAIZ, "data", "Entrevista_2.txt"), encoding="utf-8") as archivo:
+        base = archivo.read()
+    limites_base = SegmentadorEspanol().segmentar(base)
+    repeticiones = oraciones_objetivo // (len(limites_base) // 2) + 1
+    texto = "\n".join([base] * repeticiones)
+    documento = Documento("sintetico", texto, SegmentadorEspanol().segmentar(texto))
+    return documento.oraciones[:oraciones_objetivo]
+
+
+def medir(raiz, texto_widget, funcion, oraciones, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(texto_widget, oraciones)
+        # Se fuerza el cálculo de la disposición para incluir el costo de Tk en la medición
+        raiz.update_idletasks()
+        transcurrido = time.perf_counter() - inicio
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+    return mejor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de carga del panel Texto")
+    parser.add_argument("--oraciones", type=int, nargs="+", default=[500, 2000, 10000, 50000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    raiz = tk.Tk()
+    texto_widget = tk.Text(raiz, wrap=tk.WORD, width=77, height=23, font=("Arial", 14))
+    texto_widget.pack()
+    raiz.update()
+
+    print(f"{'oraciones':>10} {'original (s)':>14} {'actual (s)':>12} {'aceleración':>12}")
+    for cantidad in args.oraciones:
+        oraciones = documento_sintetico(cantidad)
+        t_original = medir(raiz, texto_widget, renderizar_original, list(oraciones), args.repeticiones)
+        contenido_original = texto_widget.get("1.0", tk.END)
+        t_actual = medir(raiz, texto_widget, renderizar_actual, oraciones, args.repeticiones)
+        # Se comprueba que ambos renderizados producen exactamente el mismo texto en el widget
+        assert texto_widget.get("1.0", tk.END) == contenido_original
+        print(f"{cantidad:>10} {t_original:>14.3f} {t_actual:>12.3f} {t_original / t_actual:>11.1f}x")
+
+    raiz.destroy()
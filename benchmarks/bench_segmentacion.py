@@ -0,0 +1,195 @@
+# --- BENCHMARK Y ARNÉS DE EXACTITUD DE LOS MOTORES DE SEGMENTACIÓN ---
+# Uso:  python benchmarks/bench_segmentacion.py --megabytes 4
+# 1) Exactitud: se compara cada motor contra tramos de data/Entrevista_2.txt segmentados a mano y
+#    contra casos construidos (precisión, exhaustividad y F1 de los cortes de oración).
+# 2) Concordancia: se comparan los cortes de ambos motores sobre los archivos de 'data/'.
+# 3) Velocidad: se mide el tiempo de cada motor sobre una transcripción de varios megabytes.
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from segmentacion import SEGMENTADORES, oraciones_desde_limites, punkt_disponible  # noqa: E402
+
+# Conjunto de referencia: tramos de una entrevista de 'data/' segmentados a mano. Cada tramo es la lista
+# de sus oraciones, copiadas tal como aparecen en el archivo y en el mismo orden; el texto del caso es el
+# tramo del archivo que las contiene (con sus saltos de línea y espacios originales)
+ARCHIVO_REFERENCIA = "Entrevista_2.txt"
+REFERENCIA = [
+    ["Joel: a mí, no hay problema, yo me llamo Joel Plata",
+     "Entrevistador: señor Joel ¿Cuántos años tiene usted?",
+     "Joel: tengo cincuenta y dos, cincuenta y tres años",
+     "Entrevistador: cincuenta y tres aha, y ¿a qué se dedica?",
+     "¿Cuál es su ocupación?",
+     "Joel: bueno yo soy profesor, bueno, soy este profesor en el área de enfermería",
+     "Entrevistador: A perfecto"],
+    ["Entrevistador: Ok, a usted ¿Cómo le puedo decir?",
+     "Cristina: Cristina",
+     "Cristina usted ¿Cuántos años tiene? y ¿a qué se dedica?",
+     "Cristina: este tengo cincuenta y este, bueno, también soy enfermera, nada más que, yo si eh, "
+     "trabajo en el área hospitalaria",
+     "Entrevistador: Ah ok",
+     "Cristina: este bueno, casi siempre he estado, en el área hospitalaria",
+     "Entrevistador: Perfecto, ¿tienen hijos?",
+     "Cristina: aha, tenemos dos hijos",
+     "Entrevistador: Dos hijos",
+     "Cristina: uno de veniti ¿Cuántos?",
+     "Joel: veinticinco",
+     "Cristina: veinticinco y una de dieciocho",
+     "Entrevistador: Ah ok, ¿ya tienen mucho tiempo viviendo por aquí?",
+     "En esta zona, de Chicoloapán",
+     "Cristina: si ya, mucho tiempo, ¿trece años?",
+     "Joel: si, trece años aproximadamente",
+     "Entrevistador: Ah más o menos igual que mis primos"],
+    ["Entrevistador: Ah ok, perfecto, si sobre, por ejemplo, sobre el tiempo libre, más o menos "
+     "¿Cuáles son sus como actividades comunes?",
+     "Cuando tienen tiempo libre ¿a qué se dedican normalmente?",
+     "¿En que lo ocupan?",
+     "Digamos no"],
+    ["Entrevistador: Si, sí, claro, gracias, ¿cristina verdad?",
+     "A usted ¿cuáles son las dos o tres cosas que se le vienen a la mente? cuando escucha molino de "
+     "flores o de las flores"],
+    ["Cristina: o sea como que uno se traslada a ese momento,  dice ¿pero porque les ponían tantos nombres?",
+     "O ¿Por qué tenían aquí su propia iglesia en esta hacienda?",
+     "Y hasta panteón  y cosas así no"],
+]
+
+# Casos construidos con abreviaturas, iniciales, números y puntos suspensivos, que casi no aparecen en
+# las transcripciones de 'data/'; las oraciones se unen con un espacio (o con un salto de línea si la
+# oración comienza con un marcador de hablante)
+CASOS_CONSTRUIDOS = [
+    ["Buenos días, Sr. Martínez.", "¿Cómo se encuentra hoy?"],
+    ["Trabajé con la Dra. López en la col. Centro.", "Después me cambié de hospital."],
+    ["Viví en EE.UU. durante tres años.", "Luego regresé a Texcoco."],
+    ["¡Qué bueno!", "¿Y cuándo fue eso?"],
+    ["Pues... no sé, la verdad.", "Tendría que pensarlo."],
+    ["Eh ¿sí? pues más o menos así fue.", "No me acuerdo bien."],
+    ["La J. Ramírez me dijo: \"Ven mañana.\"", "Y fui al otro día."],
+    ["Ganaba aprox. 3.500 pesos al mes.", "No alcanzaba."],
+    ["Entrevistador: ¿Cómo le puedo decir a usted?", "Joel: a mí, no hay problema, yo me llamo Joel"],
+    ["E1: ¿Desde cuándo trabaja en la clínica?", "E2: desde el 2010, más o menos"],
+    ["Estuve en el cap. 3 del manual, pág. 45.", "Ahí viene todo."],
+    ["Mi esposa es enfermera, etc. y yo soy profesor.", "Los dos trabajamos en salud."],
+    ["Nos vemos el lunes.", "1.", "Primer punto de la lista."],
+    ["¿Usted qué opina?", "Opino que sí, que hace falta más personal."],
+]
+
+
+# --- CONSTRUCCIÓN DE LOS CASOS Y DE SUS CORTES ESPERADOS ---
+def caso_de_archivo(texto_archivo, oraciones):
+    # Se ubica cada oración a continuación de la anterior; entre dos oraciones solo puede haber espacios
+    inicio = fin = texto_archivo.index(oraciones[0])
+    cortes = set()
+    for oracion in oraciones:
+        posicion = texto_archivo.index(oracion, fin)
+        if texto_archivo[fin:posicion].strip():
+            raise ValueError(f"La oración de referencia no sigue a la anterior: {oracion!r}")
+        fin = posicion + len(oracion)
+        cortes.add(fin - inicio)
+    return texto_archivo[inicio:fin], cortes
+
+
+def construir_caso(oraciones):
+    texto = ""
+    cortes = set()
+    for oracion in oraciones:
+        if texto:
+            separador = "\n" if ":" in oracion.split(" ")[0] else " "
+            texto += separador
+        texto += oracion
+        cortes.add(len(texto))
+    return texto, cortes
+
+
+def cortes_de(limites):
+    return {limites[i + 1] for i in range(0, len(limites), 2)}
+
+
+def exactitud(motor, casos, mostrar_errores=False):
+    # Precisión, exhaustividad y F1 de los cortes del motor, acumulados sobre todos los casos
+    esperados_total = obtenidos_total = aciertos_total = 0
+    for texto, esperados in casos:
+        limites = motor.segmentar(texto)
+        obtenidos = cortes_de(limites)
+        esperados_total += len(esperados)
+        obtenidos_total += len(obtenidos)
+        aciertos_total += len(esperados & obtenidos)
+        if mostrar_errores and obtenidos != esperados:
+            print(f"  [{motor.nombre}] {oraciones_desde_limites(texto, limites)}")
+    precision = aciertos_total / obtenidos_total if obtenidos_total else 0.0
+    exhaustividad = aciertos_total / esperados_total if esperados_total else 0.0
+    f = 2 * precision * exhaustividad / (precision + exhaustividad) if precision + exhaustividad else 0.0
+    return precision, exhaustividad, f
+
+
+def f1(esperados, obtenidos):
+    aciertos = len(esperados & obtenidos)
+    precision = aciertos / len(obtenidos) if obtenidos else 0.0
+    exhaustividad = aciertos / len(esperados) if esperados else 0.0
+    f = 2 * precision * exhaustividad / (precision + exhaustividad) if precision + exhaustividad else 0.0
+    return precision, exhaustividad, f
+
+
+# --- LECTURA DE LOS ARCHIVOS DE EJEMPLO ---
+def textos_de_data():
+    textos = {}
+    carpeta = os.path.join(RAIZ, "data")
+    for nombre in sorted(os.listdir(carpeta)):
+        ruta = os.path.join(carpeta, nombre)
+        if nombre.endswith(".txt"):
+            with open(ruta, encoding="utf-8") as archivo:
+                textos[nombre] = archivo.read()
+        elif nombre.endswith(".docx"):
+            try:
+                from extraccion import cargar_contenido
+                textos[nombre] = cargar_contenido(ruta)
+            except ImportError:
+                print(f"(se omite {nombre}: python-docx no está instalado)")
+    return textos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Motores de segmentación de oraciones")
+    parser.add_argument("--megabytes", type=float, default=4.0)
+    parser.add_argument("--mostrar-errores", action="store_true")
+    args = parser.parse_args()
+
+    if not punkt_disponible():
+        print("Aviso: el modelo punkt no está disponible; el motor NLTK usa la segmentación por puntos.\n")
+
+    # 1) Exactitud contra la referencia segmentada a mano y contra los casos construidos
+    textos = textos_de_data()
+    conjuntos = (
+        (f"la referencia de data/{ARCHIVO_REFERENCIA}",
+         [caso_de_archivo(textos[ARCHIVO_REFERENCIA], oraciones) for oraciones in REFERENCIA]),
+        ("los casos construidos", [construir_caso(oraciones) for oraciones in CASOS_CONSTRUIDOS]),
+    )
+    for titulo, casos in conjuntos:
+        print(f"Exactitud sobre {titulo} ({sum(len(cortes) for _, cortes in casos)} oraciones)")
+        for motor in SEGMENTADORES.values():
+            precision, exhaustividad, f = exactitud(motor, casos, args.mostrar_errores)
+            print(f"  {motor.descripcion:30s} precisión {precision:5.3f}  exhaustividad {exhaustividad:5.3f}  F1 {f:5.3f}")
+        print()
+
+    # 2) Concordancia entre motores sobre los archivos de ejemplo
+    motores = list(SEGMENTADORES.values())
+    print("Concordancia entre motores sobre data/")
+    for nombre, texto in textos.items():
+        cortes = [cortes_de(motor.segmentar(texto)) for motor in motores]
+        _, _, f = f1(cortes[0], cortes[1])
+        conteos = "  ".join(f"{motor.nombre}: {len(c):5d} oraciones" for motor, c in zip(motores, cortes))
+        print(f"  {nombre:22s} {conteos}  F1 entre motores {f:5.3f}")
+
+    # 3) Velocidad sobre una transcripción grande
+    base = "\n".join(textos.values())
+    repeticiones = max(1, int(args.megabytes * 1e6 / max(1, len(base))))
+    grande = "\n".join([base] * repeticiones)
+    print(f"\nVelocidad sobre {len(grande) / 1e6:.1f} millones de caracteres")
+    for motor in motores:
+        inicio = time.perf_counter()
+        limites = motor.segmentar(grande)
+        transcurrido = time.perf_counter() - inicio
+        print(f"  {motor.descripcion:30s} {transcurrido:8.3f} s  ({len(limites) // 2} oraciones)")
@@ -0,0 +1,83 @@
+# --- BENCHMARK: ESPACIO Y COSTO DE LECTURA DE LOS TEXTOS DEL PROYECTO SEGÚN LA COMPRESIÓN ---
+# Uso:  python benchmarks/bench_textos.py --documentos 300 --duplicados 0.2
+# Se genera un corpus de entrevistas sintéticas (palabras de un vocabulario con una distribución
+# sesgada, para que la compresión no resulte artificialmente alta) en el que una fracción de los
+# documentos son reimportaciones de otros con distinto nombre. Para cada método de compresión se
+# informa el tamaño de la base, la proporción de compresión (incluida la deduplicación), el tiempo
+# de importación y el tiempo de lectura de un documento al abrirlo.
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from proyecto_sqlite import ProyectoSQLite, COMPRESORES  # noqa: E402
+
+VOCABULARIO = ("pues", "mire", "yo", "entré", "a", "trabajar", "en", "la", "clínica", "hace", "ya",
+               "bastantes", "años", "más", "o", "menos", "cuando", "mi", "mamá", "se", "enfermó",
+               "nosotros", "no", "teníamos", "dinero", "para", "las", "medicinas", "y", "el", "doctor",
+               "nos", "dijo", "que", "había", "esperar", "comunidad", "escuela", "maestra", "tierra",
+               "siembra", "maíz", "lluvia", "camino", "ciudad", "familia", "hermanos", "trabajo", "salud")
+
+
+def corpus_sintetico(documentos, oraciones, duplicados, semilla=11):
+    aleatorio = random.Random(semilla)
+    pesos = [1.0 / (i + 1) for i in range(len(VOCABULARIO))]
+    textos = []
+    for d in range(documentos):
+        if textos and aleatorio.random() < duplicados:
+            # La misma entrevista importada otra vez con otro nombre
+            textos.append(aleatorio.choice(textos))
+            continue
+        frases = []
+        for _ in range(oraciones):
+            palabras = aleatorio.choices(VOCABULARIO, weights=pesos, k=aleatorio.randrange(8, 30))
+            frases.append(" ".join(palabras).capitalize() + ".")
+        textos.append(" ".join(frases))
+    return {f"entrevista_{d:04d}.docx": texto for d, texto in enumerate(textos)}
+
+
+def medir(corpus, compresion, repeticiones):
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "proyecto.db")
+        proyecto = ProyectoSQLite(ruta, compresion=compresion)
+        inicio = time.perf_counter()
+        for nombre, texto in corpus.items():
+            proyecto.guardar_documento(nombre, texto, None)
+        importacion = time.perf_counter() - inicio
+        proyecto.cerrar()
+
+        proyecto = ProyectoSQLite(ruta, compresion=compresion)
+        nombres = list(corpus)
+        tiempos = []
+        for i in range(repeticiones):
+            nombre = nombres[(i * 7919) % len(nombres)]
+            inicio = time.perf_counter()
+            proyecto.cargar_documento(nombre)
+            tiempos.append(time.perf_counter() - inicio)
+        estadisticas = proyecto.estadisticas_textos()
+        proyecto.cerrar()
+        return importacion, statistics.median(tiempos), estadisticas, os.path.getsize(ruta)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Espacio y lectura de los textos del proyecto según la compresión")
+    parser.add_argument("--documentos", type=int, default=300)
+    parser.add_argument("--oraciones", type=int, default=600)
+    parser.add_argument("--duplicados", type=float, default=0.2, help="fracción de documentos reimportados")
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = corpus_sintetico(args.documentos, args.oraciones, args.duplicados)
+    total = sum(len(texto.encode("utf-8")) for texto in corpus.values())
+    print(f"Corpus: {len(corpus)} documentos, {len(set(corpus.values()))} textos distintos, {total / 1e6:.1f} MB")
+    print(f"{'compresión':>10} {'base (MB)':>10} {'proporción':>11} {'importar (s)':>13} {'abrir documento (ms)':>21}")
+    for compresion in COMPRESORES:
+        importacion, apertura, estadisticas, tamano = medir(corpus, compresion, args.repeticiones)
+        print(f"{compresion:>10} {tamano / 1e6:>10.1f} {estadisticas['proporcion']:>10.1f}x "
+              f"{importacion:>13.2f} {apertura * 1e3:>21.2f}")
@@ -0,0 +1,49 @@
+# --- DATOS SINTÉTICOS COMPARTIDOS POR LOS BENCHMARKS ---
+# Colores de los códigos, la oración de entrevista con la que se arman los textos y los constructores
+# de documentos, códigos y fragmentos codificados, para que todos los benchmarks midan sobre los mismos
+# datos. Los módulos de la aplicación se importan desde 'src' (cada benchmark lo agrega a sys.path).
+from array import array
+
+COLORES = ["#FF0000", "#0000FF", "#008000", "#800080", "#FF8C00"]
+ORACION = "Pues mire, yo entré a trabajar en la clínica hace ya bastantes años, más o menos."
+
+
+def color_de(indice):
+    return COLORES[indice % len(COLORES)]
+
+
+# --- TEXTOS: LA MISMA ORACIÓN REPETIDA ---
+def texto_sintetico(oraciones):
+    # Oraciones separadas por un espacio, como el contenido de un documento importado
+    return " ".join(ORACION for _ in range(oraciones))
+
+
+def limites_sinteticos(oraciones):
+    # Límites [inicio_0, fin_0, ...] de las oraciones de 'texto_sintetico'
+    limites = array('I')
+    for i in range(oraciones):
+        inicio = i * (len(ORACION) + 1)
+        limites.extend((inicio, inicio + len(ORACION)))
+    return limites
+
+
+def lineas_del_panel(oraciones):
+    # Texto con la misma disposición del panel "Texto" (cada oración seguida de una línea en blanco)
+    return "".join(f"{ORACION}\n\n" for _ in range(oraciones))
+
+
+# --- CÓDIGOS Y FRAGMENTOS CODIFICADOS ---
+def crear_codigos(libro, cantidad):
+    return [libro.crear(f"Código {i}", color_de(i)) for i in range(cantidad)]
+
+
+def agregar_fragmentos(almacen, documento, codigos, cantidad, limite, aleatorio, largo=(5, 60), prefijo="Color"):
+    # Se agregan al almacén 'cantidad' fragmentos de códigos elegidos al azar, que comienzan en [0, limite);
+    # retorna las anotaciones creadas
+    anotaciones = []
+    for f in range(cantidad):
+        inicio = aleatorio.randrange(0, limite)
+        codigo = aleatorio.choice(codigos)
+        anotaciones.append(almacen.agregar(f"{prefijo}_{documento}_{f}", documento, codigo, almacen.libro.color(codigo),
+                                           inicio, inicio + aleatorio.randrange(*largo)))
+    return anotaciones
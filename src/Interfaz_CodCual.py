@@ -5,22 +5,42 @@ from tkinter import PhotoImage
 from PIL import Image, ImageTk
 import textwrap
 import pickle
-import docx
-import fitz  # Se importa PyMuPDF para manejo de archivos PDF
 import os
 import sys  
 import uuid  # Se importa uuid para generar identificadores únicos
-
-# --- IMPORTACIÓN Y MANEJO DE NLTK (PROCESAMIENTO DE LENGUAJE NATURAL) ---
-import nltk
-try:
-    # Se intenta descargar el recurso 'punkt_tab' necesario para tokenización de manera silenciosa
-    nltk.download('punkt_tab', quiet=True)
-    # Se intenta descargar el recurso 'punkt' necesario para tokenización de manera silenciosa
-    nltk.download('punkt', quiet=True)
-except Exception:
-    # Se captura cualquier excepción si falla la descarga y se continúa la ejecución sin interrupciones
-    pass 
+import multiprocessing
+import queue
+import threading
+# Se importa la función de carga de documentos (la extracción de PDF se reparte entre procesos)
+from extraccion import cargar_documento, listar_documentos, importar_documentos
+from cache_extraccion import CacheExtraccion
+# NLTK (procesamiento de lenguaje natural) se carga de forma perezosa desde el módulo de segmentación
+from segmentacion import (segmentar_limites, precargar_en_segundo_plano, punkt_disponible, SEGMENTADORES,
+                          MOTOR_POR_DEFECTO, SegmentadorNLTK)
+from documento import Documento, DisposicionTexto
+from anotaciones import AlmacenAnotaciones, migrar_subrayados
+from vista_virtual import VistaVirtual
+from capa_subrayados import CapaSubrayados
+from lista_codigos import ListaCodigos
+from tooltip_codigos import TooltipCodigos
+from proyecto_sqlite import ProyectoSQLite
+from documentos_residentes import DocumentosResidentes
+
+# --- PARÁMETROS DE LA INGESTA EN SEGUNDO PLANO Y DEL RENDERIZADO PROGRESIVO ---
+# Intervalo (ms) con el que el bucle de Tkinter revisa la cola de resultados del hilo de ingesta
+INTERVALO_COLA_MS = 50
+# Oraciones que se insertan de inmediato al abrir un documento importado (primera pantalla)
+ORACIONES_PRIMERA_PANTALLA = 150
+# Oraciones que se insertan en cada tanda posterior del renderizado progresivo
+ORACIONES_POR_TANDA = 400
+# A partir de este número de oraciones el panel "Texto" solo materializa la zona visible del documento
+ORACIONES_UMBRAL_VIRTUAL = 20000
+# Intervalo (ms) mínimo entre dos consultas del hover sobre el panel "Texto" (aprox. un cuadro)
+INTERVALO_HOVER_MS = 16
+# Intervalo (ms) con el que se sincronizan con el disco, en un solo lote, las transacciones del proyecto
+INTERVALO_SINCRONIZACION_MS = 1000
+# Motivo con el que se informa que no se reemplazó un documento codificado por una versión con otro texto
+MOTIVO_TEXTO_CAMBIADO = "su texto cambió y el documento ya tiene fragmentos codificados"
 
 # --- HABILITAR ALTA RESOLUCIÓN (DPI AWARENESS) PARA SISTEMAS WINDOWS ---
 try:
@@ -31,98 +51,6 @@ except Exception:
     # Se ignora la excepción si el sistema operativo no es Windows o no soporta esta configuración específica
     pass
 
-# --- FUNCIÓN GLOBAL PARA CARGAR CONTENIDO DE ARCHIVOS ---
-def cargar_contenido(ruta_archivo):
-    # Se verifica si la extensión del archivo corresponde a un archivo de texto plano (.txt)
-    if ruta_archivo.lower().endswith('.txt'):
-        # Se abre el archivo en modo lectura utilizando la codificación UTF-8
-        with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
-            # Se lee todo el contenido del archivo y se almacena en la variable 'contenido'
-            contenido = archivo.read()
-    # Se verifica si la extensión del archivo corresponde a un documento de Word (.docx)
-    elif ruta_archivo.lower().endswith('.docx'):
-        # Se utiliza la librería docx para crear un objeto Document con el archivo especificado
-        doc = docx.Document(ruta_archivo)
-        # Se unen los textos de todos los párrafos del documento separándolos con saltos de línea
-        contenido = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-    # Se verifica si la extensión del archivo corresponde a un documento PDF (.pdf)
-    elif ruta_archivo.lower().endswith('.pdf'):
-        # Se utiliza la librería fitz (PyMuPDF) para abrir el documento PDF
-        pdf_doc = fitz.open(ruta_archivo)
-        # Se inicializa la variable 'contenido' como una cadena de texto vacía
-        contenido = ''
-        # Se itera a través del rango de páginas del documento PDF
-        for page_num in range(pdf_doc.page_count):
-            # Se obtiene la página actual mediante su índice
-            page = pdf_doc[page_num]
-            # Se extrae el texto de la página actual y se concatena a la variable 'contenido'
-            contenido += page.get_text()
-    else:
-        # Se lanza una excepción de tipo ValueError si el formato del archivo no es compatible
-        raise ValueError(
-            "Formato de archivo no compatible. Utilice archivos .txt, .docx o .pdf.")
-    # Se retorna el contenido extraído del archivo procesado
-    return contenido
-
-
-# --- CLASE PARA LA CREACIÓN DE TOOLTIPS (VENTANAS EMERGENTES) ---
-class Tooltip:
-    def __init__(self, widget, text):
-        # Se asigna el widget padre (donde aparecerá el tooltip) al atributo de instancia 'self.widget'
-        self.widget = widget
-        # Se asigna el texto que mostrará el tooltip al atributo de instancia 'self.text'
-        self.text = text
-        # Se inicializa la variable 'self.tooltip_window' como None para controlar su estado
-        self.tooltip_window = None
-
-    def show_tooltip(self, event, tag_name):
-        # Se obtienen las coordenadas X e Y de la raíz del evento y se les suma un desplazamiento de 10 píxeles
-        x, y = event.x_root + 10, event.y_root + 10
-
-        # Se crea una nueva ventana Toplevel asociada al widget padre
-        self.tooltip_window = tk.Toplevel(self.widget)
-        # Se elimina la barra de título y los bordes de la ventana del tooltip para que parezca una etiqueta flotante
-        self.tooltip_window.wm_overrideredirect(True)
-        # Se establece la geometría de la ventana en la posición calculada previamente
-        self.tooltip_window.wm_geometry(f"+{x}+{y}")
-
-        # Se crea una etiqueta (Label) dentro de la ventana del tooltip con el formato deseado
-        label = tk.Label(
-            self.tooltip_window,
-            text=str(self.text),         # Se establece el texto de la etiqueta
-            justify='left',              # Se justifica el texto a la izquierda
-            background='#FFFF66',        # Se establece el color de fondo amarillo claro
-            relief='solid',              # Se establece un borde sólido alrededor de la etiqueta
-            borderwidth=1,               # Se define el ancho del borde
-            font=("arial", 11, "bold", "italic") # Se configura la fuente con estilo negrita y cursiva
-        )
-        # Se empaqueta la etiqueta dentro de la ventana con un relleno interno
-        label.pack(ipadx=5, ipady=2)
-
-        # Se cambia el cursor del widget padre a 'circle' para indicar visualmente la interacción
-        self.widget.config(cursor="circle")
-
-    def hide_tooltip(self, _):
-        # Se comprueba si la ventana del tooltip existe actualmente
-        if self.tooltip_window:
-            # Se destruye la ventana del tooltip para ocultarla de la vista
-            self.tooltip_window.destroy()
-            # Se restablece la referencia de la ventana a None
-            self.tooltip_window = None
-
-        # Se restablece el cursor del widget padre a su estado por defecto
-        self.widget.config(cursor="")
-
-    def update_position(self, event):
-        # Se comprueba si la ventana del tooltip está visible
-        if self.tooltip_window:
-            # Se calcula la nueva posición X sumando 10 píxeles a la posición actual del ratón
-            x = event.x_root + 10
-            # Se calcula la nueva posición Y sumando 10 píxeles a la posición actual del ratón
-            y = event.y_root + 10
-            # Se actualiza la geometría de la ventana del tooltip con las nuevas coordenadas dinámicas
-            self.tooltip_window.geometry(f"+{x}+{y}")
-
 # --- FUNCIÓN AUXILIAR PARA RUTAS RELATIVAS (COMPATIBILIDAD CON PYINSTALLER) ---
 def ruta_relativa(ruta):
     # Esta función se usa para ASSETS DE SOLO LECTURA (imágenes, iconos)
@@ -131,6 +59,16 @@ def ruta_relativa(ruta):
         return os.path.join(sys._MEIPASS, ruta)
     return ruta
 
+# --- FUNCIÓN AUXILIAR PARA LA CARPETA DE LOS DATOS DEL PROYECTO ---
+def carpeta_de_datos():
+    # Esta función se usa para los datos que se ESCRIBEN (proyecto, caché de extracción)
+    if getattr(sys, 'frozen', False):
+        # Si se está ejecutando como un .exe compilado (frozen)
+        # sys.executable es la ruta completa al archivo .exe
+        return os.path.dirname(sys.executable)
+    # Si se está ejecutando como script .py normal
+    return os.path.dirname(os.path.abspath(__file__))
+
 # --- CLASE PRINCIPAL DE LA APLICACIÓN ---
 class EtiquetadoApp:
     def __init__(self, raiz):
@@ -152,16 +90,13 @@ class EtiquetadoApp:
         # =========================================================================
         # Para guardar datos, NO queremos la carpeta temporal de PyInstaller (_MEIPASS).
         # Queremos la carpeta donde está el .exe o el script .py.
-        
-        if getattr(sys, 'frozen', False):
-            # Si se está ejecutando como un .exe compilado (frozen)
-            # sys.executable es la ruta completa al archivo .exe
-            self.base_dir_script = os.path.dirname(sys.executable)
-        else:
-            # Si se está ejecutando como script .py normal
-            self.base_dir_script = os.path.dirname(os.path.abspath(__file__))
+        self.base_dir_script = carpeta_de_datos()
             
+        # El proyecto se guarda en una base SQLite; el pickle de versiones anteriores solo se lee para migrarlo
         self.ruta_pickle = os.path.join(self.base_dir_script, "datos_codificacion.pkl")
+        self.ruta_proyecto = os.path.join(self.base_dir_script, "proyecto_codificacion.db")
+        # Se crea la caché en disco del texto extraído, junto al archivo de datos
+        self.cache_extraccion = CacheExtraccion(os.path.join(self.base_dir_script, "cache_extraccion"))
         # =========================================================================
 
         # --- VARIABLES DE CONTROL TKINTER ---
@@ -169,12 +104,16 @@ class EtiquetadoApp:
         self.palabras_clave_var = tk.StringVar()
         # Se inicializa la variable de control tipo cadena para la etiqueta actual
         self.etiqueta_var = tk.StringVar()
+        # Se inicializa la variable de control con el motor de segmentación de oraciones del proyecto
+        self.motor_segmentacion = tk.StringVar(value=MOTOR_POR_DEFECTO)
+        # Se inicializa la variable de control que habilita la vista virtual para documentos muy grandes
+        self.vista_virtual_activa = tk.BooleanVar(value=True)
 
         # --- ESTRUCTURAS DE DATOS ---
         # Se inicializa un diccionario para almacenar los archivos abiertos y sus datos asociados
         self.archivos_abiertos = {}
-        # Se inicializa un diccionario para mapear nombres de etiquetas con sus objetos Tooltip correspondientes
-        self.tooltips_asignados = {}
+        # Se inicializa el almacén de fragmentos codificados (desplazamientos sobre el texto original)
+        self.anotaciones = AlmacenAnotaciones()
         # Se inicializa una lista para mantener el historial de rutas de archivos accedidos
         self.historial_archivos = []
         # Se inicializa un diccionario para almacenar los colores asociados a los tooltips/etiquetas
@@ -186,6 +125,14 @@ class EtiquetadoApp:
         self.ruta = None
         self.contenido = None
 
+        # --- INGESTA EN SEGUNDO PLANO ---
+        # Cola por la que el hilo de ingesta envía llamadas que deben ejecutarse en el hilo de la interfaz
+        self.cola_ingesta = queue.Queue()
+        # Indicador de que hay una importación en curso
+        self.ingesta_activa = False
+        # Identificador de la tanda pendiente del renderizado progresivo (after de Tkinter)
+        self._renderizado_pendiente = None
+
         # --- CONFIGURACIÓN DEL MENÚ PRINCIPAL ---
         # Se crea el objeto de menú principal
         self.barraMenu = Menu(self.raiz)
@@ -239,11 +186,20 @@ class EtiquetadoApp:
         # Se añade la opción 'Importar Archivo' al menú con su comando, imagen y estilo asociados
         self.menu_desplegable.add_command(label="Importar Archivo", image=self.icono_importar, compound='left', font=(
             "arial", 12, "bold"), foreground="red", command=self.importar_archivo)
+        # Se añade la opción 'Importar Carpeta' para importar varias entrevistas a la vez
+        self.menu_desplegable.add_command(label="Importar Carpeta", image=self.icono_importar, compound='left', font=(
+            "arial", 12, "bold"), foreground="red", command=self.importar_carpeta)
         # Se añade un separador visual en el menú
         self.menu_desplegable.add_separator()
         # Se añade la opción 'Guardar Codificado' al menú
         self.menu_desplegable.add_command(label="Guardar Codificado", image=self.icono_guardado, compound='left', font=(
             "arial", 12, "bold"), foreground="brown", command=self.guardar_codificado)
+        # Se añade la opción para exportar los totales de cada código (fragmentos, documentos y caracteres)
+        self.menu_desplegable.add_command(label="Exportar Estadísticas", image=self.icono_guardado, compound='left', font=(
+            "arial", 12, "bold"), foreground="brown", command=self.exportar_estadisticas)
+        # Se añade la opción para consultar el espacio que ocupan los textos del proyecto y su costo de lectura
+        self.menu_desplegable.add_command(label="Información del Proyecto", font=(
+            "arial", 12, "bold"), foreground="brown", command=self.mostrar_informacion_proyecto)
         # Se añade otro separador visual
         self.menu_desplegable.add_separator()
         # Se añade la opción 'Salir' al menú
@@ -256,6 +212,25 @@ class EtiquetadoApp:
         # Se añade la opción 'Limpiar Citas del Código' al menú de edición
         self.edicionMenu.add_command(label="Limpiar Citas del Código", image=self.icono_limpiar, compound='left', font=(
             "arial", 12, "bold"), foreground="navy blue", command=self.limpiar_contenido)
+        # Se añade la opción para revertir la última anexión de un código a otro
+        self.edicionMenu.add_command(label="Deshacer Anexión de Códigos", image=self.icono_anexar, compound='left', font=(
+            "arial", 12, "bold"), foreground="navy blue", command=self.deshacer_anexion)
+        # Se añade un separador visual
+        self.edicionMenu.add_separator()
+        # Se crea el submenú para elegir el motor de segmentación de oraciones del proyecto
+        self.menu_segmentacion = Menu(self.edicionMenu, tearoff=0)
+        for motor in SEGMENTADORES.values():
+            self.menu_segmentacion.add_radiobutton(
+                label=motor.descripcion, value=motor.nombre, variable=self.motor_segmentacion,
+                font=("arial", 11), command=self.cambiar_segmentador)
+        self.edicionMenu.add_cascade(label="Segmentador de Oraciones", menu=self.menu_segmentacion, font=(
+            "arial", 12, "bold"), foreground="navy blue")
+        # Se añade la opción para descargar el modelo de NLTK (la aplicación nunca lo descarga por su cuenta)
+        self.edicionMenu.add_command(label="Descargar Modelo de NLTK", font=(
+            "arial", 12, "bold"), foreground="navy blue", command=self.descargar_modelo_nltk)
+        # Se añade la opción para mostrar solo la zona visible de los documentos muy grandes
+        self.edicionMenu.add_checkbutton(label="Vista Virtual (Documentos Grandes)", variable=self.vista_virtual_activa,
+            font=("arial", 12, "bold"), foreground="navy blue", command=self.cambiar_vista_virtual)
 
         # --- SUBMENÚ INFORMACIÓN ---
         # Se crea el menú desplegable 'Información'
@@ -316,7 +291,6 @@ class EtiquetadoApp:
         self.lista_etiquetado.bind("<<Clear>>", lambda e: "break")    
         self.lista_etiquetado.bind("<Control-v>", lambda e: "break") 
         self.lista_etiquetado.bind("<Control-x>", lambda e: "break")  
-        self.lista_etiquetado.bind("<Button-1>", lambda e: "break")   
         self.lista_etiquetado.bind("<B1-Motion>", lambda e: "break")
 
         # Barra de desplazamiento VERTICAL
@@ -341,6 +315,23 @@ class EtiquetadoApp:
         # Se vincula el evento de configuración para actualizar la visibilidad del scroll horizontal según necesidad
         self.lista_etiquetado.bind("<Configure>", lambda e: self.actualizar_scroll_horizontal_codigos())
 
+        # Menú contextual compartido por todas las filas de la lista; actúa sobre el código de la fila
+        # en la que se hizo clic derecho ('codigo_activo')
+        self.menu_contextual_codigos = tk.Menu(self.lista_etiquetado, tearoff=0)
+        self.menu_contextual_codigos.add_command(label="Eliminar Código", image=self.icono_eliminar, compound='left', font=(
+            "arial", 11, "bold"), foreground="red", command=lambda: self.eliminar_etiqueta(self.lista_codigos.codigo_activo))
+        self.menu_contextual_codigos.add_separator()
+        self.menu_contextual_codigos.add_command(
+            label="Anexar a otro Código", image=self.icono_anexar, compound='left', font=(
+            "arial", 12, "bold"), foreground="navy blue", command=lambda: self.asignar_etiqueta(self.lista_codigos.codigo_activo))
+
+        # Filas de la lista de códigos (contador, botón de color y nombre), actualizadas por diferencias
+        self.lista_codigos = ListaCodigos(
+            self.lista_etiquetado,
+            al_resaltar=lambda tag_name, paso: self.resaltar_etiqueta(tag_name, paso=paso),
+            al_recuperar=self.recuperar_fragmento_codificado,
+            menu_contextual=self.menu_contextual_codigos)
+
 
         # -------------------- ÁREA 2: PANEL CENTRAL (TEXTO ORIGINAL) --------------------
         
@@ -356,12 +347,22 @@ class EtiquetadoApp:
         self.texto_original.grid(row=5, column=2, padx=(
             8, 0), pady=(0, 8), sticky='nsew')
 
+        # Se crea una sola vez la fuente en negrita basada en la fuente del widget y se asigna al tag "bold"
+        self.fuente_negrita = font.Font(self.texto_original, self.texto_original.cget("font"))
+        self.fuente_negrita.configure(weight="bold")
+        self.texto_original.tag_configure("bold", font=self.fuente_negrita)
+        # Se crea la capa que dibuja los subrayados con un solo tag compartido por código y color
+        # (los fragmentos de un código anexado se dibujan con el color del código que lo absorbió)
+        self.capa_subrayados = CapaSubrayados(self.texto_original, color_visible=self.anotaciones.libro.color_visible)
+
         # Barra de desplazamiento para el texto original
         # Se crea y posiciona la barra vertical para el texto central
         scrollVertical1 = tk.Scrollbar(raiz, command=self.texto_original.yview)
         scrollVertical1.grid(row=5, column=3, pady=(0, 8), sticky="nsew")
         # Se conecta la barra al widget de texto central
         self.texto_original.config(yscrollcommand=scrollVertical1.set)
+        # Se conserva la barra para que la vista virtual pueda representar con ella el documento completo
+        self.scroll_texto_original = scrollVertical1
 
 
         # -------------------- ÁREA 3: PANEL DERECHO (CITAS DEL CÓDIGO) --------------------
@@ -399,14 +400,32 @@ class EtiquetadoApp:
         raiz.grid_columnconfigure(2, weight=1)     # Panel Central
         raiz.grid_columnconfigure(4, weight=1)     # Panel Derecho
 
+        # -------------------- BARRA DE ESTADO (AVANCE DE PROCESOS LARGOS) --------------------
+
+        # Se inicializa la variable de control que muestra el avance de importaciones y otros procesos
+        self.estado_var = tk.StringVar(value="")
+        # Se crea y posiciona la etiqueta de estado en la parte inferior de la ventana
+        tk.Label(raiz, textvariable=self.estado_var, font=("arial", 10, "bold"), fg="white",
+                 bg="green", anchor="w").grid(row=6, column=0, columnspan=6, padx=(8, 8), pady=(0, 4), sticky='ew')
+
         # =========================================================================================
 
         # --- INICIALIZACIÓN DE VARIABLES DE ESTADO ---
         # Se inicializan las variables de estado en None o listas vacías según corresponda
         self.ruta = None
         self.contenido = None
-        self.tokens = None
-        self.sentencias = None
+        # Documento activo: conserva el texto una sola vez y expone sus oraciones como vista perezosa
+        self.documento = None
+        # Disposición del documento activo en el panel (traduce desplazamientos a índices de Tk)
+        self.disposicion = None
+        # Vista virtual del documento activo (None si el documento se muestra completo en el widget)
+        self.vista_virtual = None
+        # Estado del hover: última posición del ratón, consulta pendiente y cursor aplicado al widget
+        self.posicion_hover = None
+        self.consulta_hover = None
+        self.cursor_texto = None
+        # Sincronización del proyecto con el disco programada (se agrupan las transacciones de un intervalo)
+        self.sincronizacion_programada = None
         self.etiqueta_actual = None
         self.parrafos_etiquetados = []
         self.indices_etiquetados = []
@@ -416,14 +435,20 @@ class EtiquetadoApp:
         self.actualizar_lista_etiquetado()
 
         # --- RECUPERACIÓN DE DATOS GUARDADOS (PERSISTENCIA) ---
+        self.proyecto = ProyectoSQLite(self.ruta_proyecto)
         datos_guardados = {}
-        try:
-            # Se intenta abrir el archivo pickle usando la RUTA ABSOLUTA calculada
-            with open(self.ruta_pickle, "rb") as archivo_datos:
-                datos_guardados = pickle.load(archivo_datos)
-        except (FileNotFoundError, Exception):
-            # Si hay error o no existe el archivo, se inicia con un diccionario vacío
-            datos_guardados = {}
+        migrar_pickle = False
+        if not self.proyecto.vacio():
+            datos_guardados = self.proyecto.cargar()
+        elif os.path.exists(self.ruta_pickle):
+            try:
+                # Proyecto de una versión anterior: se lee el pickle una vez para migrarlo a la base
+                with open(self.ruta_pickle, "rb") as archivo_datos:
+                    datos_guardados = pickle.load(archivo_datos)
+                migrar_pickle = True
+            except Exception:
+                # Si el archivo está dañado, se inicia con un diccionario vacío
+                datos_guardados = {}
 
         # Se cargan los datos recuperados en las variables de instancia correspondientes
         self.historial_archivos = datos_guardados.get("historial_archivos", [])
@@ -432,18 +457,20 @@ class EtiquetadoApp:
         self.parrafos_etiquetados = datos_guardados.get("parrafos_etiquetados", [])
         self.color_tooltips = datos_guardados.get("color_tooltips", {})
         self.indice_navegacion = datos_guardados.get("indice_navegacion", {})
-
-        # Validación y recuperación de tokens
-        self.tokens = datos_guardados.get("tokens", [])
-        # Se asegura que 'self.tokens' sea una lista válida
-        if not isinstance(self.tokens, list):
-            self.tokens = list(self.tokens) if self.tokens else []
-
-        # Validación y recuperación de sentencias
-        self.sentencias = datos_guardados.get("sentencias", [])
-        # Se asegura que 'self.sentencias' sea una lista válida
-        if not isinstance(self.sentencias, list):
-            self.sentencias = list(self.sentencias) if self.sentencias else []
+        # Se reproducen, en orden, las operaciones del diario posteriores al último estado guardado
+        for operacion, argumentos in datos_guardados.get("diario", []):
+            self.aplicar_operacion(operacion, *argumentos)
+        # Se recupera el motor de segmentación elegido para el proyecto
+        if datos_guardados.get("segmentador") in SEGMENTADORES:
+            self.motor_segmentacion.set(datos_guardados["segmentador"])
+        # Se carga el libro de códigos (nombres, colores y anexiones) antes que los fragmentos que lo referencian
+        self.anotaciones.libro.cargar(datos_guardados.get("libro_codigos"))
+        # Se cargan los fragmentos codificados de cada documento en el almacén de anotaciones
+        self.cargar_anotaciones_guardadas()
+        if migrar_pickle:
+            self.migrar_a_proyecto()
+        # El texto de cada documento se lee de la base al abrirlo; solo los últimos usados quedan en memoria
+        self.documentos_residentes = DocumentosResidentes(self.archivos_abiertos, self.proyecto.cargar_documento)
 
         # Se actualiza el menú de historial en la interfaz gráfica
         self.actualizar_menu_historial()
@@ -452,16 +479,11 @@ class EtiquetadoApp:
         # Se verifica si hay archivos abiertos registrados previamente
         if self.archivos_abiertos:
             # Se obtiene el primer archivo y sus datos del diccionario
-            nombre_archivo, datos = next(iter(self.archivos_abiertos.items()))
+            nombre_archivo = next(iter(self.archivos_abiertos))
+            datos = self.documentos_residentes.obtener(nombre_archivo)
             self.contenido = datos.get("contenido", "")
-            # Se intenta re-tokenizar el contenido para tener las estructuras de texto listas
-            try:
-                self.tokens = nltk.sent_tokenize(self.contenido)
-                self.sentencias = nltk.sent_tokenize(self.contenido)
-            except:
-                 # Se aplica un método alternativo de separación si NLTK falla
-                 self.tokens = self.contenido.split('.')
-                 self.sentencias = self.contenido.split('.')
+            # Se obtienen las oraciones desde el índice de límites guardado con el documento
+            self.cargar_oraciones(nombre_archivo, datos)
 
             # Se muestra el contenido en el panel central
             self.mostrar_contenido_original()
@@ -473,35 +495,20 @@ class EtiquetadoApp:
                     break
 
             # Se restauran visualmente los subrayados, estilos y tooltips guardados
-            for sub in datos.get("subrayados", []):
-                tag_name = sub["tag"]
-                start, end = sub["start"], sub["end"]
-                color = sub["color"]
-                etiqueta = sub["etiqueta"]
-
-                # Se añade el tag al rango de texto especificado
-                self.texto_original.tag_add(tag_name, start, end)
-                # Se configura el estilo visual del tag (subrayado, color, fuente)
-                self.texto_original.tag_configure(
-                    tag_name, underline=True, font=("Arial", 14, "bold"), foreground=color
-                )
-
-                # Se crea y vincula el tooltip correspondiente a la etiqueta
-                tooltip = Tooltip(self.texto_original, etiqueta)
-                self.texto_original.tag_bind(tag_name, "<Enter>", lambda event, tooltip=tooltip, tag_name=tag_name: tooltip.show_tooltip(event, tag_name))
-                self.texto_original.tag_bind(tag_name, "<Leave>", tooltip.hide_tooltip)
-                self.texto_original.tag_bind(tag_name, "<Motion>", tooltip.update_position)
-
-            # Se asegura que la selección de texto esté visible (capa superior)
-            self.texto_original.tag_raise("sel")
+            self.aplicar_anotaciones(self.anotaciones.de_documento(nombre_archivo))
         
         # Se refresca la lista lateral de etiquetas con los datos cargados
         self.actualizar_lista_etiquetado()
 
         # --- EVENTOS DEL MOUSE ---
         # Se asocia el movimiento del ratón para cambiar el cursor dinámicamente sobre áreas etiquetadas
+        # y mostrar el tooltip de los códigos (ambos con la misma consulta por cuadro)
         self.texto_original.bind(
             "<Motion>", self.cambiar_cursor_segun_posicion)
+        # Al salir del panel se descarta la consulta pendiente para que no vuelva a mostrar el tooltip
+        self.texto_original.bind("<Leave>", self.cancelar_hover, add="+")
+        # Se crea el tooltip único de los códigos (se agrega a los eventos del widget sin reemplazarlos)
+        self.tooltip_codigos = TooltipCodigos(self.texto_original, self.nombres_de_codigos_en)
 
         # --- MENÚ CONTEXTUAL (CLIC DERECHO) ---
         # Se crea el menú contextual para el texto original
@@ -515,6 +522,9 @@ class EtiquetadoApp:
         # Se añade la opción 'Remover Codificado' al menú contextual
         self.menu_contextual_texto_original.add_command(label="Remover Codificado", image=self.icono_remover, compound='left', font=(
             "arial", 12, "bold"), foreground="red", command=self.quitar_subrayado)
+        # Se añade la opción para consultar los códigos que se superponen con la selección
+        self.menu_contextual_texto_original.add_command(label="Códigos en la Selección", font=(
+            "arial", 12, "bold"), foreground="navy blue", command=self.mostrar_codigos_en_seleccion)
         # Se vincula el evento de clic derecho (Button-3) para mostrar el menú
         self.texto_original.bind(
             "<Button-3>", self.mostrar_menu_contextual_texto_original)
@@ -536,14 +546,21 @@ class EtiquetadoApp:
         self.menu_contextual_texto_original.post(event.x_root, event.y_root)
 
     # --- MÉTODO PARA REGISTRAR UN ARCHIVO EN EL SISTEMA INTERNO ---
-    def agregar_archivo_abierto(self, nombre_archivo, contenido):
-        # Se verifica si el archivo no existe ya en el diccionario de archivos abiertos
-        if nombre_archivo not in self.archivos_abiertos:
-            # Se añade el archivo con su contenido y una lista vacía de subrayados
-            self.archivos_abiertos[nombre_archivo] = {
-                "contenido": contenido,
-                "subrayados": []
-            }
+    def agregar_archivo_abierto(self, nombre_archivo, contenido, limites=None):
+        # Un archivo que ya estaba registrado (importado otra vez con el mismo nombre) se reemplaza por
+        # el contenido nuevo, que es el que se muestra ('registrar_documento' no lo reemplaza si el
+        # texto cambió y el documento tiene fragmentos codificados)
+        nuevo = nombre_archivo not in self.archivos_abiertos
+        # Se añade el archivo con su contenido y los límites de sus oraciones
+        # (sus fragmentos codificados se guardan en el almacén de anotaciones)
+        self.archivos_abiertos[nombre_archivo] = {
+            "contenido": contenido,
+            "limites": limites
+        }
+        # El texto y las oraciones se escriben en la base al registrar el documento (solo si el texto cambió)
+        self.proyecto.guardar_documento(nombre_archivo, contenido, limites)
+        self.documentos_residentes.registrar(nombre_archivo)
+        if nuevo:
             # Se añade la entrada al menú de historial de la barra de menú principal
             self.menu_archivos_abiertos.add_command(
                 label=nombre_archivo,
@@ -559,7 +576,8 @@ class EtiquetadoApp:
 
         # Se verifica si el archivo solicitado existe en el registro de archivos abiertos
         if nombre_archivo in self.archivos_abiertos:
-            datos = self.archivos_abiertos[nombre_archivo]
+            # Se leen de la base el texto y las oraciones si el documento no está en memoria
+            datos = self.documentos_residentes.obtener(nombre_archivo)
             
             # Se busca la ruta completa correspondiente en el historial
             encontrado = False
@@ -574,85 +592,321 @@ class EtiquetadoApp:
 
             # Se carga el contenido del nuevo archivo seleccionado
             self.contenido = datos.get("contenido", "")
-            # Se intenta tokenizar el contenido nuevamente para preparar el texto
-            try:
-                self.tokens = nltk.sent_tokenize(self.contenido)
-                self.sentencias = nltk.sent_tokenize(self.contenido)
-            except:
-                # Se usa tokenización simple basada en puntos si falla la librería NLTK
-                self.tokens = self.contenido.split('.')
-                self.sentencias = self.contenido.split('.')
+            # Se reutilizan los límites de oraciones calculados al importar (sin volver a tokenizar)
+            self.cargar_oraciones(nombre_archivo, datos)
 
             # Se muestra el contenido nuevo en el editor central
             self.mostrar_contenido_original()
 
             # Se restauran las etiquetas visuales y los tooltips asociados desde los datos guardados
-            for subrayado in datos.get("subrayados", []):
-                tag_name = subrayado['tag']
-                start = subrayado['start']
-                end = subrayado['end']
-                color = subrayado['color']
-                etiqueta = subrayado['etiqueta']
-
-                # Se añade el tag al rango de texto especificado
-                self.texto_original.tag_add(tag_name, start, end)
-                # Se configura el estilo visual del tag (subrayado, color, fuente)
-                self.texto_original.tag_configure(
-                    tag_name, underline=True, font=("Arial", 14, "bold"), foreground=color
-                )
-
-                # Se crea y vincula el tooltip correspondiente a la etiqueta
-                tooltip = Tooltip(self.texto_original, etiqueta)
-                self.texto_original.tag_bind(tag_name, "<Enter>", lambda event, tooltip=tooltip, tag_name=tag_name: tooltip.show_tooltip(event, tag_name))
-                self.texto_original.tag_bind(tag_name, "<Leave>", tooltip.hide_tooltip)
-                self.texto_original.tag_bind(tag_name, "<Motion>", tooltip.update_position)
-
-            # Se asegura que la selección de texto esté visible (capa superior)
-            self.texto_original.tag_raise("sel")
+            self.aplicar_anotaciones(self.anotaciones.de_documento(nombre_archivo))
+
+    # --- MÉTODO PARA CARGAR LAS ANOTACIONES GUARDADAS DE TODOS LOS DOCUMENTOS ---
+    def cargar_anotaciones_guardadas(self):
+        for nombre_archivo, datos in self.archivos_abiertos.items():
+            if "anotaciones" in datos:
+                self.anotaciones.cargar_documento(nombre_archivo, datos["anotaciones"])
+            elif datos.get("subrayados"):
+                # Datos de versiones anteriores: índices de Tk que se traducen a desplazamientos del texto
+                if datos.get("limites") is None:
+                    datos["limites"] = segmentar_limites(datos.get("contenido", ""), self.motor_segmentacion.get())
+                disposicion = DisposicionTexto(Documento.desde_datos(nombre_archivo, datos))
+                self.anotaciones.cargar_documento(nombre_archivo, migrar_subrayados(datos["subrayados"], disposicion))
+            datos.pop("subrayados", None)
+            # Los fragmentos quedan en el almacén (y en la base del proyecto); no se duplican aquí
+            datos.pop("anotaciones", None)
+
+    # --- MÉTODO PARA MIGRAR UN PROYECTO GUARDADO EN PICKLE A LA BASE SQLITE ---
+    def migrar_a_proyecto(self):
+        self.proyecto.importar(self.archivos_abiertos, self.anotaciones.a_datos(),
+                               self.anotaciones.libro, self.estado_del_proyecto())
+        # Se conserva el pickle renombrado por si se necesita volver a una versión anterior
+        try:
+            os.replace(self.ruta_pickle, self.ruta_pickle + ".migrado")
+        except OSError:
+            pass
+
+    # --- MÉTODO PARA APLICAR EN EL WIDGET LAS ANOTACIONES DE UN DOCUMENTO ---
+    def aplicar_anotaciones(self, anotaciones):
+        # Se agrupan los tramos por código y color para aplicarlos con una sola llamada por grupo
+        tramos_por_estilo = {}
+        for anotacion in anotaciones:
+            # Los desplazamientos se traducen a índices del widget; con la vista virtual, las anotaciones
+            # que quedan fuera de la ventana materializada se aplicarán al desplazarse
+            tramo = self.tramo_en_widget(anotacion.inicio, anotacion.fin)
+            if tramo is None:
+                continue
+            tramos_por_estilo.setdefault((anotacion.codigo, anotacion.color), []).append(tramo)
+
+        # Se añaden todos los rangos de cada grupo a su tag compartido (el estilo se configura una sola vez)
+        for (etiqueta, color), tramos in tramos_por_estilo.items():
+            self.capa_subrayados.agregar_varios(etiqueta, color, tramos)
+
+        # Se asegura que la selección de texto esté visible (capa superior)
+        self.texto_original.tag_raise("sel")
+
+    # --- MÉTODO PARA ACTIVAR UN DOCUMENTO A PARTIR DE SU ÍNDICE DE LÍMITES DE ORACIONES ---
+    def cargar_oraciones(self, nombre_archivo, datos):
+        # Solo se segmenta el documento si aún no tiene su índice (por ejemplo, datos de versiones anteriores)
+        if datos.get("limites") is None:
+            datos["limites"] = segmentar_limites(datos.get("contenido", ""), self.motor_segmentacion.get())
+            # Se guarda el índice para no volver a segmentar cuando el documento se vuelva a cargar
+            # (junto con el motor usado, para que coincidan si el programa se cierra de forma inesperada)
+            self.proyecto.guardar_oraciones(nombre_archivo, datos["limites"],
+                                            {"segmentador": self.motor_segmentacion.get()})
+        # El documento comparte el mismo texto y el mismo arreglo de límites que la entrada guardada
+        self.documento = Documento.desde_datos(nombre_archivo, datos)
+        self.disposicion = DisposicionTexto(self.documento)
 
     # --- MÉTODO PARA IMPORTAR NUEVOS ARCHIVOS ---
     def importar_archivo(self):
         # Se abre el diálogo del sistema operativo para seleccionar un archivo
-        self.ruta = filedialog.askopenfilename(title="Importar Archivo", filetypes=[
-                                               ("Todos los archivos", "*.*")])
+        ruta = filedialog.askopenfilename(title="Importar Archivo", filetypes=[
+                                          ("Todos los archivos", "*.*")])
         # Se procede únicamente si se seleccionó una ruta válida
-        if self.ruta:
-            # Se carga el contenido del archivo seleccionado usando la función global
-            self.contenido = cargar_contenido(self.ruta)
-            
-            # Se realiza el proceso de tokenización del contenido
+        if not ruta:
+            return
+        # Se extrae el nombre base del archivo para su identificación
+        nombre_archivo = os.path.basename(ruta)
+        motor = self.motor_segmentacion.get()
+
+        # Tarea que se ejecuta en el hilo de ingesta: carga y tokeniza el contenido del archivo
+        # (o lo recupera de la caché si no ha cambiado), informando el avance de la extracción
+        def tarea():
+            contenido, limites = cargar_documento(
+                ruta, cache=self.cache_extraccion, motor=motor, progreso=lambda hechas, total: self.enviar_a_interfaz(
+                    self.mostrar_estado, f"Extrayendo '{nombre_archivo}': página {hechas} de {total}..."))
+            self.enviar_a_interfaz(self.abrir_documento_importado, ruta, contenido, limites)
+
+        self.mostrar_estado(f"Importando '{nombre_archivo}'...")
+        self.iniciar_ingesta(tarea)
+
+    # --- MÉTODO PARA MOSTRAR UN DOCUMENTO RECIÉN IMPORTADO (SE EJECUTA EN EL HILO DE LA INTERFAZ) ---
+    def abrir_documento_importado(self, ruta, contenido, limites):
+        # Se guardan los subrayados del documento visible antes de reemplazarlo
+        self.guardar_subrayados()
+
+        nombre_archivo = os.path.basename(ruta)
+        if self.texto_codificado_cambiado(nombre_archivo, contenido):
+            self.cache_extraccion.sincronizar()
+            self.mostrar_estado("")
+            messagebox.showwarning("Importar Archivo", f"No se importó '{nombre_archivo}': "
+                                   f"{MOTIVO_TEXTO_CAMBIADO}. Cámbiele el nombre para importarlo como otro documento.")
+            return
+        self.ruta = ruta
+        self.contenido = contenido
+        self.documento = Documento(nombre_archivo, contenido, limites)
+        self.disposicion = DisposicionTexto(self.documento)
+
+        # Se renderiza el contenido de forma progresiva: primero la pantalla visible y luego el resto
+        self.mostrar_contenido_original(progresivo=True)
+        
+        # Se configura el estilo de alto contraste para la selección de texto
+        self.texto_original.tag_configure("sel", background="#0078D7", foreground="white")
+        self.texto_original.tag_raise("sel")
+
+        # Se registra el archivo en la estructura de datos interna y en el historial
+        self.registrar_documento(ruta, contenido, limites)
+
+        # Se actualiza el menú visual del historial en la barra de menú
+        self.actualizar_menu_historial()
+        # Se escribe el índice de la caché una vez terminada la importación
+        self.cache_extraccion.sincronizar()
+        self.mostrar_estado(f"'{nombre_archivo}' importado ({self.cache_extraccion.resumen()}).{self.aviso_sin_punkt()}")
+
+    # --- MÉTODO PARA EJECUTAR UNA TAREA DE INGESTA EN UN HILO DE TRABAJO ---
+    def iniciar_ingesta(self, tarea):
+        # Solo se permite una importación a la vez (la caché y los grupos de procesos no se comparten)
+        if self.ingesta_activa:
+            messagebox.showinfo("Importación en curso", "Espere a que termine la importación actual.")
+            return False
+        self.ingesta_activa = True
+
+        def ejecutar():
             try:
-                self.tokens = nltk.sent_tokenize(self.contenido)
-                self.sentencias = nltk.sent_tokenize(self.contenido)
-            except (LookupError, Exception):
-                # Fallback de tokenización manual si ocurre un error con NLTK
-                self.tokens = self.contenido.replace('\n', ' ').split('.')
-                self.sentencias = self.contenido.replace('\n', ' ').split('.')
-                # Se asegura que los tokens conserven el punto final
-                self.tokens = [t + '.' for t in self.tokens if t.strip()]
-                self.sentencias = [s + '.' for s in self.sentencias if s.strip()]
-
-            # Se renderiza el contenido procesado en la interfaz
-            self.mostrar_contenido_original()
-            
-            # Se configura el estilo de alto contraste para la selección de texto
-            self.texto_original.tag_configure("sel", background="#0078D7", foreground="white")
-            self.texto_original.tag_raise("sel")
+                tarea()
+            except Exception as e:
+                # Se informa el error desde el hilo de la interfaz
+                self.enviar_a_interfaz(messagebox.showerror, "Error al importar", str(e))
+                self.enviar_a_interfaz(self.mostrar_estado, "")
+            finally:
+                self.enviar_a_interfaz(self.terminar_ingesta)
+
+        threading.Thread(target=ejecutar, name="ingesta", daemon=True).start()
+        # Se comienza a revisar periódicamente la cola de resultados
+        self.raiz.after(INTERVALO_COLA_MS, self.atender_cola_ingesta)
+        return True
+
+    # --- MÉTODO PARA ENVIAR UNA LLAMADA AL HILO DE LA INTERFAZ (SEGURO DESDE CUALQUIER HILO) ---
+    def enviar_a_interfaz(self, funcion, *argumentos):
+        self.cola_ingesta.put((funcion, argumentos))
+
+    # --- MÉTODO QUE ATIENDE LA COLA DE RESULTADOS DESDE EL BUCLE PRINCIPAL DE TKINTER ---
+    def atender_cola_ingesta(self):
+        try:
+            while True:
+                try:
+                    funcion, argumentos = self.cola_ingesta.get_nowait()
+                except queue.Empty:
+                    break
+                # Un error en una llamada se informa sin interrumpir las siguientes de la cola
+                # (entre ellas 'terminar_ingesta', que libera la importación)
+                try:
+                    funcion(*argumentos)
+                except Exception as e:
+                    messagebox.showerror("Error al importar", str(e))
+        finally:
+            # Se vuelve a programar la revisión mientras la ingesta siga en curso
+            if self.ingesta_activa:
+                self.raiz.after(INTERVALO_COLA_MS, self.atender_cola_ingesta)
+
+    def terminar_ingesta(self):
+        self.ingesta_activa = False
+
+    # --- MÉTODO PARA REGISTRAR UN DOCUMENTO IMPORTADO Y SU RUTA EN EL HISTORIAL ---
+    def registrar_documento(self, ruta, contenido, limites):
+        # Se extrae el nombre base del archivo para su identificación
+        nombre_archivo = os.path.basename(ruta)
+        # Los fragmentos codificados son desplazamientos sobre el texto guardado: si el texto cambió
+        # quedarían fuera de lugar, así que se conserva la versión anterior y se informa (retorna False)
+        if self.texto_codificado_cambiado(nombre_archivo, contenido):
+            return False
+        # Se registra el archivo en la estructura de datos interna
+        self.agregar_archivo_abierto(nombre_archivo, contenido, limites)
+
+        # Se actualiza el historial de archivos, evitando duplicados en la lista
+        registro = {"nombre": nombre_archivo, "ruta": ruta}
+        self.historial_archivos = [
+            r for r in self.historial_archivos if r["ruta"] != ruta
+        ]
+        self.historial_archivos.append(registro)
+        self.proyecto.guardar_estado({"historial_archivos": self.historial_archivos})
+        return True
+
+    # --- MÉTODO QUE INDICA SI UN DOCUMENTO CODIFICADO SE VOLVIÓ A IMPORTAR CON OTRO TEXTO ---
+    def texto_codificado_cambiado(self, nombre_archivo, contenido):
+        return bool(self.anotaciones.de_documento(nombre_archivo)) and \
+            self.proyecto.texto_distinto(nombre_archivo, contenido)
+
+    # --- MÉTODO PARA IMPORTAR TODOS LOS DOCUMENTOS DE UNA CARPETA ---
+    def importar_carpeta(self):
+        # Se abre el diálogo del sistema operativo para seleccionar la carpeta de entrevistas
+        carpeta = filedialog.askdirectory(title="Importar Carpeta")
+        if not carpeta:
+            return
 
-            # Se extrae el nombre base del archivo para su identificación
-            nombre_archivo = os.path.basename(self.ruta)
-            # Se registra el archivo en la estructura de datos interna
-            self.agregar_archivo_abierto(nombre_archivo, self.contenido)
+        rutas = listar_documentos(carpeta)
+        if not rutas:
+            messagebox.showinfo("Importar Carpeta", "La carpeta no contiene archivos .txt, .docx o .pdf.")
+            return
+
+        # Se guardan los subrayados del documento visible antes de registrar los nuevos
+        self.guardar_subrayados()
+
+        importados = []
+        rechazados = []
+        motor = self.motor_segmentacion.get()
+
+        # Se define la función que registra cada documento conforme termina su procesamiento
+        # (se ejecuta en el hilo de la interfaz, que es el único que modifica 'archivos_abiertos')
+        def registrar(ruta, contenido, limites):
+            if self.registrar_documento(ruta, contenido, limites):
+                importados.append(os.path.basename(ruta))
+            else:
+                rechazados.append((ruta, MOTIVO_TEXTO_CAMBIADO))
 
-            # Se actualiza el historial de archivos, evitando duplicados en la lista
-            registro = {"nombre": nombre_archivo, "ruta": self.ruta}
-            self.historial_archivos = [
-                r for r in self.historial_archivos if r["ruta"] != self.ruta
-            ]
-            self.historial_archivos.append(registro)
+        # Tarea del hilo de ingesta: se extraen y segmentan los documentos en un grupo de procesos
+        def tarea():
+            fallos = importar_documentos(
+                rutas, lambda *resultado: self.enviar_a_interfaz(registrar, *resultado),
+                cache=self.cache_extraccion, motor=motor, progreso=lambda hechos, total: self.enviar_a_interfaz(
+                    self.mostrar_estado, f"Importando carpeta: {hechos} de {total} documentos..."))
+            self.enviar_a_interfaz(self.finalizar_importacion_carpeta, rutas, importados, fallos, rechazados)
 
-            # Se actualiza el menú visual del historial en la barra de menú
-            self.actualizar_menu_historial()
+        self.iniciar_ingesta(tarea)
+
+    # --- MÉTODO QUE CIERRA UNA IMPORTACIÓN DE CARPETA CON UN ÚNICO RESUMEN ---
+    def finalizar_importacion_carpeta(self, rutas, importados, fallos, rechazados=()):
+        # Se escribe el índice de la caché una sola vez para toda la carpeta
+        self.cache_extraccion.sincronizar()
+        self.mostrar_estado(f"Carpeta importada ({self.cache_extraccion.resumen()}).{self.aviso_sin_punkt()}")
+
+        # Se actualiza el menú de historial con todos los documentos registrados
+        self.actualizar_menu_historial()
+
+        # Si no había un documento visible, se muestra el primero importado
+        if importados and not self.ruta:
+            self.cambiar_archivo(sorted(importados)[0], guardar_antes=False)
+
+        # Se muestra un único resumen con el resultado de la importación
+        resumen = f"Documentos importados: {len(importados)} de {len(rutas)}."
+        # Los rechazados se registran en el hilo de la interfaz, después de calcular 'fallos'
+        fallos = list(fallos) + list(rechazados)
+        if fallos:
+            detalle = "\n".join(f"• {os.path.basename(ruta)}: {error}" for ruta, error in fallos[:20])
+            if len(fallos) > 20:
+                detalle += f"\n... y {len(fallos) - 20} más."
+            messagebox.showwarning("Importar Carpeta", f"{resumen}\n\nNo se pudieron importar:\n{detalle}")
+        else:
+            messagebox.showinfo("Importar Carpeta", resumen)
+
+    # --- MÉTODO PARA CAMBIAR EL MOTOR DE SEGMENTACIÓN DEL PROYECTO ---
+    def cambiar_segmentador(self):
+        # El cambio solo afecta a los documentos que se importen a partir de ahora, para no
+        # alterar la disposición del texto sobre la que ya se aplicaron las codificaciones
+        motor = SEGMENTADORES[self.motor_segmentacion.get()]
+        # El motor elegido se guarda de inmediato, antes de segmentar con él ningún documento
+        self.proyecto.guardar_estado({"segmentador": motor.nombre})
+        self.mostrar_estado(f"Los nuevos documentos se segmentarán con: {motor.descripcion}.{self.aviso_sin_punkt()}")
+
+    # --- MÉTODO QUE AVISA EN LA BARRA DE ESTADO QUE SE ESTÁ SEGMENTANDO POR PUNTOS ---
+    def aviso_sin_punkt(self):
+        # Con el motor NLTK elegido y sin el modelo punkt en disco, los documentos se segmentan por puntos
+        if self.motor_segmentacion.get() != SegmentadorNLTK.nombre or punkt_disponible():
+            return ""
+        return " Sin el modelo punkt de NLTK se segmenta por puntos (Edición → Descargar Modelo de NLTK)."
+
+    # --- MÉTODO PARA DESCARGAR EL MODELO PUNKT DE NLTK A PEDIDO DEL USUARIO ---
+    def descargar_modelo_nltk(self):
+        if punkt_disponible():
+            messagebox.showinfo("Modelo de NLTK", "El modelo punkt de NLTK ya está disponible en este equipo.")
+            return
+        if not messagebox.askyesno("Descargar Modelo de NLTK",
+                                   "Se descargará el modelo punkt de NLTK desde internet. ¿Desea continuar?"):
+            return
+        self.mostrar_estado("Descargando el modelo punkt de NLTK...")
+        # La descarga se hace en un hilo aparte; se revisa periódicamente si terminó
+        hilo = precargar_en_segundo_plano(descargar=True)
+        self.raiz.after(INTERVALO_COLA_MS, self.esperar_descarga_nltk, hilo)
+
+    def esperar_descarga_nltk(self, hilo):
+        if hilo.is_alive():
+            self.raiz.after(INTERVALO_COLA_MS, self.esperar_descarga_nltk, hilo)
+        elif punkt_disponible():
+            self.mostrar_estado("Modelo punkt de NLTK descargado.")
+        else:
+            self.mostrar_estado("")
+            messagebox.showwarning("Modelo de NLTK", "No se pudo descargar el modelo punkt de NLTK. "
+                                   "Los documentos se segmentarán por puntos.")
+
+    # --- MÉTODO QUE RETORNA EL NOMBRE DEL CÓDIGO DE UN FRAGMENTO A PARTIR DE SU IDENTIFICADOR (TAG) ---
+    def etiqueta_de_tag(self, tag_name):
+        anotacion = self.anotaciones.por_id.get(tag_name)
+        if anotacion is not None:
+            return self.anotaciones.libro.nombre(self.anotaciones.libro.resolver(anotacion.codigo))
+        # Asignaciones sin fragmento en el almacén (datos de versiones anteriores)
+        return next((etiqueta for etiqueta, tag in self.etiquetas_asignadas if tag == tag_name), None)
+
+    # --- MÉTODO QUE RETORNA EL CÓDIGO VISIBLE DE UN NOMBRE (RESUELVE LOS CÓDIGOS ANEXADOS) ---
+    def codigo_de_nombre(self, nombre):
+        codigo = self.anotaciones.libro.id_de(nombre)
+        return self.anotaciones.libro.resolver(codigo) if codigo is not None else None
+
+    # --- MÉTODO PARA MOSTRAR MENSAJES EN LA BARRA DE ESTADO ---
+    def mostrar_estado(self, mensaje):
+        # Se actualiza el texto de la barra de estado y se redibuja la ventana de inmediato
+        self.estado_var.set(mensaje)
+        self.raiz.update_idletasks()
 
     # --- MÉTODO PARA RESTAURAR CURSOR POR DEFECTO ---
     def restaurar_cursor(self, event):
@@ -685,16 +939,41 @@ class EtiquetadoApp:
 
     # --- MÉTODO PARA DETECTAR HOVER SOBRE ETIQUETAS ---
     def cambiar_cursor_segun_posicion(self, event):
-        # Se obtienen las coordenadas X e Y del ratón en el evento
-        x, y = event.x, event.y
-        # Se comprueba qué tags (etiquetas de texto) existen en esa posición específica
-        tags = self.texto_original.tag_names("@{},{}".format(x, y))
-        # Si alguno de los tags encontrados comienza con "Color_", se cambia el cursor a un círculo
-        if any(tag.startswith("Color_") for tag in tags):
-            self.texto_original.config(cursor="circle")
-        else:
-            # De lo contrario, se usa el cursor de texto estándar (xterm)
-            self.texto_original.config(cursor="xterm")
+        # Se guarda solo la última posición del ratón; los eventos <Motion> que llegan dentro del mismo
+        # intervalo se agrupan en una única consulta
+        self.posicion_hover = (event.x, event.y, event.x_root, event.y_root)
+        if self.consulta_hover is None:
+            self.consulta_hover = self.raiz.after(INTERVALO_HOVER_MS, self.actualizar_cursor_hover)
+
+    def actualizar_cursor_hover(self):
+        self.consulta_hover = None
+        x, y, x_root, y_root = self.posicion_hover
+        # Se pregunta una sola vez al índice de intervalos si la posición está codificada; la respuesta
+        # sirve para el cursor y para el tooltip, que solo pide los códigos cuando se muestra
+        codificado = None
+        if self.ruta and self.disposicion is not None:
+            posicion = self.desplazamiento_en_texto("@{},{}".format(x, y))
+            if self.anotaciones.hay_en(os.path.basename(self.ruta), posicion):
+                codificado = posicion
+        # Si hay algún fragmento codificado se usa un círculo; de lo contrario, el cursor de texto (xterm).
+        # El widget solo se reconfigura cuando el cursor cambia
+        cursor = "circle" if codificado is not None else "xterm"
+        if cursor != self.cursor_texto:
+            self.cursor_texto = cursor
+            self.texto_original.config(cursor=cursor)
+        self.tooltip_codigos.actualizar(codificado, x_root, y_root)
+
+    def nombres_de_codigos_en(self, posicion):
+        # Se listan todos los códigos de los fragmentos superpuestos en esa posición del documento actual
+        if not self.ruta:
+            return []
+        codigos = self.anotaciones.codigos_superpuestos(os.path.basename(self.ruta), posicion, posicion + 1)
+        return [self.anotaciones.libro.nombre(codigo) for codigo in codigos]
+
+    def cancelar_hover(self, event=None):
+        if self.consulta_hover is not None:
+            self.raiz.after_cancel(self.consulta_hover)
+            self.consulta_hover = None
 
     # --- MÉTODO PRINCIPAL DE CODIFICACIÓN (ETIQUETADO) ---
     def etiquetar_fragmento(self):
@@ -753,29 +1032,11 @@ class EtiquetadoApp:
             self.texto_etiquetado.tag_configure(
                 "negrita", font=("Arial", 12, "bold"))
 
-            # Se aplica el subrayado visual en el texto original y se obtiene el nombre único del tag generado
-            tag_name = self.aplicar_subrayado(color_subrayado)
-
-            # Se gestiona la creación o recuperación del objeto Tooltip
-            if etiqueta in self.tooltips_asignados:
-                tooltip = self.tooltips_asignados[etiqueta]
-            else:
-                tooltip = Tooltip(self.texto_original, etiqueta)
-                self.tooltips_asignados[etiqueta] = tooltip
-
-            # Se vinculan los eventos de ratón al nuevo tag para mostrar/ocultar el tooltip
-            self.texto_original.tag_bind(tag_name, "<Enter>", lambda event, tooltip=tooltip,
-                                         tag_name=tag_name: tooltip.show_tooltip(event, tag_name))
-            self.texto_original.tag_bind(
-                tag_name, "<Leave>", tooltip.hide_tooltip)
-            self.texto_original.tag_bind(
-                tag_name, "<Motion>", tooltip.update_position)
+            # Se aplica el subrayado visual en el texto original y se obtiene el identificador único del fragmento
+            tag_name = self.aplicar_subrayado(color_subrayado, etiqueta)
 
             # Se registra la asignación en la lista global de etiquetas asignadas
-            self.etiquetas_asignadas.append((etiqueta, tag_name))
-
-            # Se guarda el estado actual de los subrayados para persistencia
-            self.guardar_subrayados()
+            self.registrar_operacion("asignar", etiqueta, tag_name)
 
             # Se obtienen las palabras clave para el análisis (si las hay) desde la variable de control
             palabras_clave = self.palabras_clave_var.get().split(',')
@@ -792,10 +1053,16 @@ class EtiquetadoApp:
             nuevos_parrafos_etiquetados = self.buscar_y_etiquetar_parrafos(
                 palabras_clave, etiqueta, [seleccion])
 
+            # Cada cita se vincula con el identificador de su fragmento para poder eliminarla con exactitud
+            nuevos_parrafos_etiquetados = [(tag_name, sentencia, etiq) for _, sentencia, etiq in nuevos_parrafos_etiquetados]
+
             # Se actualizan las listas globales de índices y párrafos etiquetados
             self.indices_etiquetados.extend(
                 parrafo[0] for parrafo in nuevos_parrafos_etiquetados)
-            self.parrafos_etiquetados.extend(nuevos_parrafos_etiquetados)
+            self.registrar_operacion("citar", nuevos_parrafos_etiquetados)
+
+            # Se guardan el fragmento, la asignación y las citas en una sola transacción
+            self.guardar_subrayados()
             
             # Se actualizan los paneles visuales con los nuevos datos
             self.mostrar_fragmento_etiquetado(
@@ -836,27 +1103,7 @@ class EtiquetadoApp:
             # Se desplaza la vista del widget al final para mostrar lo agregado
             self.texto_etiquetado.see(tk.END)
 
-            # ----------------------------------------------------------------------
-            # SECCIÓN: RE-APLICACIÓN VISUAL DEL SUBRAYADO EN EL TEXTO ORIGINAL
-            # ----------------------------------------------------------------------
-            # Se genera el nombre del tag visual combinando color y nombre de etiqueta
-            tag_name_visual = f"Color_{color_subrayado}_{etiqueta.replace(' ', '_')}"
-            try:
-                # Se obtienen los índices de la selección actual del usuario
-                inicio = self.texto_original.index(tk.SEL_FIRST)
-                fin = self.texto_original.index(tk.SEL_LAST)
-
-                # Se aplica el tag y su configuración al texto original
-                self.texto_original.tag_add(tag_name_visual, inicio, fin)
-                self.texto_original.tag_configure(
-                    tag_name_visual,
-                    underline=True,
-                    font=("Arial", 14, "bold"),
-                    foreground=color_subrayado
-                )
-            except tk.TclError:
-                # Se ignora la excepción si no hay selección válida en este momento
-                pass
+            # El subrayado en el texto original ya lo dibujó 'aplicar_subrayado' con el tag del código
 
         # Se eleva la etiqueta "sel" para mantener visible la selección del usuario sobre el coloreado
         self.texto_original.tag_raise("sel")
@@ -873,57 +1120,45 @@ class EtiquetadoApp:
                 # Se retorna inmediatamente si no hay selección
                 return
 
-            # Se obtienen todos los tags presentes en el inicio de la selección
-            tags_en_seleccion = self.texto_original.tag_names(sel_first)
-            
-            # Se filtran los tags que corresponden a colores (creados por la aplicación)
-            tags_a_eliminar = [tag for tag in tags_en_seleccion if tag.startswith("Color_")]
+            # Se obtienen, con el índice de intervalos, los fragmentos codificados que se superponen con la selección
+            if not self.ruta:
+                return
+            nombre_archivo = os.path.basename(self.ruta)
+            anotaciones_a_eliminar = self.anotaciones.que_se_superponen(
+                nombre_archivo, self.desplazamiento_en_texto(sel_first), self.desplazamiento_en_texto(sel_last))
 
-            # Si no hay tags para eliminar en la selección, se retorna
-            if not tags_a_eliminar:
+            # Si no hay fragmentos para eliminar en la selección, se retorna
+            if not anotaciones_a_eliminar:
                 return
 
-            # Se itera sobre los tags identificados para eliminar
-            for tag in tags_a_eliminar:
-                # Se remueve el tag del rango de texto seleccionado
-                self.texto_original.tag_remove(tag, sel_first, sel_last)
-                try:
-                    # Se desvinculan los eventos asociados al tag (hover, leave, motion)
-                    self.texto_original.tag_unbind(tag, "<Enter>")
-                    self.texto_original.tag_unbind(tag, "<Leave>")
-                    self.texto_original.tag_unbind(tag, "<Motion>")
-                except:
-                    pass
+            # Se itera sobre los fragmentos identificados para eliminar
+            for anotacion in anotaciones_a_eliminar:
+                tag = anotacion.id
+                # Se elimina el fragmento del almacén y se borra su subrayado visual
+                self.anotaciones.eliminar(anotacion)
+                self.borrar_subrayado_visible(anotacion)
 
-                etiqueta_nombre = None
-                
-                # Se busca y elimina la referencia en la lista global de etiquetas asignadas
-                copia_asignadas = list(self.etiquetas_asignadas)
-                for item in copia_asignadas:
-                    if item[1] == tag: 
-                        etiqueta_nombre = item[0]
-                        self.etiquetas_asignadas.remove(item)
-                        break
-                
-                # Manejo de fallback para intentar obtener el nombre del tag si no se encontró
-                if not etiqueta_nombre:
-                    partes = tag.split("_")
-                    if len(partes) >= 3:
-                        pass 
-
-                # Se limpian los párrafos etiquetados almacenados en memoria
-                if etiqueta_nombre:
-                    texto_sel_clean = texto_seleccionado.strip().replace('\n', ' ')
+                # Se busca el nombre del código en la lista global de etiquetas asignadas
+                etiqueta_nombre = next((item[0] for item in self.etiquetas_asignadas if item[1] == tag), None)
+
+                # Se eliminan la asignación y las citas vinculadas al identificador del fragmento
+                cantidad_citas = len(self.parrafos_etiquetados)
+                self.registrar_operacion("quitar_fragmento", tag)
+
+                # Para citas de versiones anteriores (sin identificador) se busca por el texto del fragmento
+                if etiqueta_nombre and len(self.parrafos_etiquetados) == cantidad_citas:
+                    texto_fragmento = (self.contenido or "")[anotacion.inicio:anotacion.fin] or texto_seleccionado
+                    texto_sel_clean = texto_fragmento.strip().replace('\n', ' ')
                     
                     for i, (idx_sent, sentencia, etiq) in enumerate(self.parrafos_etiquetados):
-                        if etiq == etiqueta_nombre:
+                        if etiq == etiqueta_nombre and str(idx_sent) == "0":
                             sentencia_clean = sentencia.strip().replace('\n', ' ')
                             # Se comprueba la coincidencia entre el texto seleccionado y el guardado
                             coincide = (texto_sel_clean in sentencia_clean) or \
                                        (sentencia_clean in texto_sel_clean) or \
                                        (len(texto_sel_clean) > 0 and texto_sel_clean == sentencia_clean)
                             if coincide:
-                                del self.parrafos_etiquetados[i]
+                                self.registrar_operacion("quitar_cita", i)
                                 break
 
             # Se guardan los cambios realizados en los subrayados
@@ -935,6 +1170,64 @@ class EtiquetadoApp:
             # Se imprime el error en consola si ocurre alguna excepción durante el proceso
             print(f"Error al remover: {e}")
 
+    # --- MÉTODO PARA INFORMAR LOS CÓDIGOS QUE SE SUPERPONEN CON LA SELECCIÓN ---
+    def mostrar_codigos_en_seleccion(self):
+        try:
+            sel_first = self.texto_original.index(tk.SEL_FIRST)
+            sel_last = self.texto_original.index(tk.SEL_LAST)
+        except tk.TclError:
+            # Sin selección se consulta la posición del cursor de inserción
+            sel_first = self.texto_original.index(tk.INSERT)
+            sel_last = self.texto_original.index(f"{sel_first} + 1 chars")
+        if not self.ruta:
+            return
+        nombre_archivo = os.path.basename(self.ruta)
+        inicio, fin = self.desplazamiento_en_texto(sel_first), self.desplazamiento_en_texto(sel_last)
+        superpuestas = self.anotaciones.que_se_superponen(nombre_archivo, inicio, max(fin, inicio + 1))
+        if not superpuestas:
+            messagebox.showinfo("Códigos en la Selección", "No hay fragmentos codificados en la selección.")
+            return
+        # Se cuenta cuántos fragmentos de cada código se superponen y cuántos quedan completamente dentro
+        contenidas = set(self.anotaciones.contenidas_en(nombre_archivo, inicio, fin))
+        resumen = {}
+        for anotacion in sorted(superpuestas, key=lambda a: a.inicio):
+            codigo = self.anotaciones.libro.nombre(anotacion.codigo)
+            total, dentro = resumen.get(codigo, (0, 0))
+            resumen[codigo] = (total + 1, dentro + (anotacion in contenidas))
+        lineas = [f"{codigo}: {total} fragmento(s), {dentro} completo(s) en la selección"
+                  for codigo, (total, dentro) in resumen.items()]
+        messagebox.showinfo("Códigos en la Selección", "\n".join(lineas))
+
+    # --- MÉTODO PARA BORRAR DEL WIDGET EL SUBRAYADO DE UN FRAGMENTO ---
+    def borrar_subrayado_visible(self, anotacion):
+        tramo = self.tramo_en_widget(anotacion.inicio, anotacion.fin)
+        if tramo is None:
+            return
+        # Se vuelven a dibujar los demás fragmentos del mismo código y color que compartían el tag
+        restantes = []
+        for otra in self.anotaciones.de_documento(anotacion.documento):
+            if otra.codigo == anotacion.codigo and otra.color == anotacion.color:
+                tramo_otra = self.tramo_en_widget(otra.inicio, otra.fin)
+                if tramo_otra is not None:
+                    restantes.append(tramo_otra)
+        self.capa_subrayados.quitar(anotacion.codigo, anotacion.color, tramo[0], tramo[1], restantes)
+
+    # --- MÉTODOS DE TRADUCCIÓN ENTRE EL WIDGET Y LOS DESPLAZAMIENTOS DEL TEXTO ORIGINAL ---
+    # Son el único punto donde las anotaciones se convierten a índices "línea.columna" de Tk
+    def desplazamiento_en_texto(self, indice_widget):
+        if self.vista_virtual is not None:
+            indice = self.vista_virtual.a_absoluto(indice_widget)
+        else:
+            indice = self.texto_original.index(indice_widget)
+        return self.disposicion.a_desplazamiento(indice)
+
+    def tramo_en_widget(self, inicio, fin):
+        # Retorna el tramo en índices del widget, o None si no está materializado en la vista virtual
+        inicio, fin = self.disposicion.a_indice(inicio), self.disposicion.a_indice(fin)
+        if self.vista_virtual is not None:
+            return self.vista_virtual.a_widget_recortado(inicio, fin)
+        return inicio, fin
+
     # --- MÉTODO DE BÚSQUEDA Y ETIQUETADO AUTOMÁTICO ---
     def buscar_y_etiquetar_parrafos(self, palabras_clave, etiqueta, sentencias):
         parrafos_etiquetados = []
@@ -950,40 +1243,84 @@ class EtiquetadoApp:
         return parrafos_etiquetados
 
     # --- MÉTODO PARA RENDERIZAR EL CONTENIDO EN EL ÁREA PRINCIPAL ---
-    def mostrar_contenido_original(self):
-        # Se valida que la variable tokens sea una lista válida
-        if not self.tokens or not isinstance(self.tokens, (list, tuple)):
-            self.tokens = []
-        # Se une el contenido de los tokens para mostrarlo
-        contenido_mostrar = '\n'.join(str(t) for t in self.tokens)
+    def mostrar_contenido_original(self, progresivo=False):
+        # Se cancela el renderizado progresivo pendiente de un documento anterior
+        self.cancelar_renderizado()
+        # Se descarta la vista virtual del documento anterior
+        if self.vista_virtual is not None:
+            self.vista_virtual.desconectar_barra()
+            self.vista_virtual = None
         # Se limpia el área de texto central completamente
         self.texto_original.delete(1.0, tk.END)
-        
-        # Se crea una fuente en negrita basada en la fuente actual del widget
-        bold_font = font.Font(self.texto_original, self.texto_original.cget("font"))
-        bold_font.configure(weight="bold")
 
-        # Se divide el contenido por líneas e inserta SIN numeración visual
-        lineas = contenido_mostrar.split('\n')
-        for linea in lineas:
-            # Se inserta cada línea seguida de dos saltos de línea para espaciado, sin el formato de número
-            self.texto_original.insert(tk.END, f"{linea}\n\n")
+        # Se obtienen las oraciones del documento activo (vista perezosa sobre su texto)
+        oraciones = self.documento.oraciones if self.documento else ()
+        total = len(oraciones)
+        if self.vista_virtual_activa.get() and total >= ORACIONES_UMBRAL_VIRTUAL:
+            # Documento muy grande: solo se materializa la ventana de oraciones alrededor de la zona visible
+            self.vista_virtual = VistaVirtual(self.texto_original, self.disposicion)
+            self.vista_virtual.conectar_barra(self.scroll_texto_original)
+            self.vista_virtual.materializar(0)
+            # A partir de aquí, cada desplazamiento de la ventana vuelve a dibujar sus subrayados
+            self.vista_virtual.despues_de_materializar = self.reaplicar_subrayados_visibles
+            self.mostrar_estado(f"Vista virtual: {total} oraciones.")
+            return
+        if not progresivo:
+            self.insertar_oraciones(oraciones, 0, total)
+            return
+
+        # Se inserta de inmediato la primera pantalla para que el usuario pueda empezar a leer
+        fin = min(ORACIONES_PRIMERA_PANTALLA, total)
+        self.insertar_oraciones(oraciones, 0, fin)
+        if fin < total:
+            self._renderizado_pendiente = self.raiz.after(1, self.continuar_renderizado, oraciones, fin)
+
+    # --- MÉTODO QUE INSERTA LA SIGUIENTE TANDA DE ORACIONES SIN BLOQUEAR LA INTERFAZ ---
+    def continuar_renderizado(self, oraciones, inicio):
+        total = len(oraciones)
+        fin = min(inicio + ORACIONES_POR_TANDA, total)
+        # Se insertan al final del texto, por lo que la posición de lectura del usuario no cambia
+        self.insertar_oraciones(oraciones, inicio, fin)
+        if fin < total:
+            self.mostrar_estado(f"Mostrando texto: {fin} de {total} oraciones...")
+            self._renderizado_pendiente = self.raiz.after(1, self.continuar_renderizado, oraciones, fin)
+        else:
+            self._renderizado_pendiente = None
+            self.mostrar_estado(f"Texto completo: {total} oraciones.")
 
-        # Se configura el tag para que la numeración aparezca en negrita (aunque ya no se use para números)
-        self.texto_original.tag_configure("bold", font=bold_font)
+    # --- MÉTODO QUE VUELVE A APLICAR LOS SUBRAYADOS AL MATERIALIZAR OTRA ZONA DEL DOCUMENTO ---
+    def reaplicar_subrayados_visibles(self):
+        if self.ruta:
+            self.aplicar_anotaciones(self.anotaciones.de_documento(os.path.basename(self.ruta)))
+
+    # --- MÉTODO PARA ACTIVAR O DESACTIVAR LA VISTA VIRTUAL ---
+    def cambiar_vista_virtual(self):
+        # Se vuelve a mostrar el documento activo con el modo elegido, conservando sus subrayados
+        if self.ruta and self.documento is not None:
+            self.cambiar_archivo(os.path.basename(self.ruta))
+
+    # --- MÉTODO PARA CANCELAR EL RENDERIZADO PROGRESIVO EN CURSO ---
+    def cancelar_renderizado(self):
+        if self._renderizado_pendiente is not None:
+            self.raiz.after_cancel(self._renderizado_pendiente)
+            self._renderizado_pendiente = None
+
+    # --- MÉTODO PARA INSERTAR UN RANGO DE ORACIONES EN EL ÁREA PRINCIPAL ---
+    def insertar_oraciones(self, oraciones, inicio, fin):
+        if inicio >= fin:
+            return
+        # Cada línea de cada oración va seguida de dos saltos de línea (sin numeración visual).
+        # Se construye el texto completo del rango en Python y se envía a Tk en una sola inserción,
+        # en lugar de una llamada a Tcl por cada línea
+        texto = '\n'.join(oraciones[inicio:fin]).replace('\n', '\n\n') + '\n\n'
+        self.texto_original.insert(tk.END, texto)
 
     # --- MÉTODO PARA NAVEGAR ENTRE ETIQUETAS (RESALTAR AL CLIC EN LISTA) ---
-    def resaltar_etiqueta(self, tag_name):
+    # 'paso' es 1 para ir a la siguiente ocurrencia y -1 para volver a la anterior
+    def resaltar_etiqueta(self, tag_name, paso=1):
         try:
-            # Se guardan los subrayados actuales antes de navegar
-            self.guardar_subrayados()
-            
             # Se busca el nombre de la etiqueta asociado al tag proporcionado
-            etiqueta_buscada = None
-            for etiq, tag in self.etiquetas_asignadas:
-                if tag == tag_name:
-                    etiqueta_buscada = etiq
-                    break
+            etiqueta_buscada = self.etiqueta_de_tag(tag_name)
             
             # Intento de recuperación por nombre del tag si falla la búsqueda directa
             if not etiqueta_buscada:
@@ -995,62 +1332,37 @@ class EtiquetadoApp:
             if not etiqueta_buscada:
                 return
 
-            coincidencias_globales = []
-            # Se realiza la búsqueda de coincidencias en todos los archivos abiertos
-            for nombre_archivo, datos in self.archivos_abiertos.items():
-                if isinstance(datos, dict):
-                    subrayados = datos.get("subrayados", [])
-                    for sub in subrayados:
-                        if sub["etiqueta"] == etiqueta_buscada:
-                            # Se prepara la clave de ordenamiento basada en la posición
-                            start_idx = str(sub["start"])
-                            try:
-                                line, col = map(int, start_idx.split('.'))
-                                sort_key = (nombre_archivo, line, col)
-                            except ValueError:
-                                sort_key = (nombre_archivo, 0, 0)
-
-                            # Se añade el hallazgo a la lista de coincidencias globales
-                            coincidencias_globales.append({
-                                "archivo": nombre_archivo,
-                                "start": sub["start"],
-                                "end": sub["end"],
-                                "color": sub["color"],
-                                "tag": sub["tag"],
-                                "sort_key": sort_key
-                            })
+            # Se resuelve el código visible (si el código fue anexado a otro, se navega por el grupo completo)
+            codigo = self.codigo_de_nombre(etiqueta_buscada)
+            if codigo is not None:
+                etiqueta_buscada = self.anotaciones.libro.nombre(codigo)
+
+            # Lógica de carrusel sobre las ocurrencias del código, que el almacén mantiene ordenadas por
+            # documento y posición: avanzar o retroceder es un acceso directo por índice, sin recorrer ni ordenar
+            posicion = self.indice_navegacion.get(etiqueta_buscada, -1 if paso > 0 else 0) + paso
+            match, posicion = self.anotaciones.ocurrencia(codigo, posicion) if codigo is not None else (None, -1)
 
             # Si no hay coincidencias globales, se notifica al usuario
-            if not coincidencias_globales:
+            if match is None:
                 messagebox.showinfo("Sin coincidencias", f"No hay fragmentos marcados como '{etiqueta_buscada}'.")
                 return
-
-            # Se ordenan las coincidencias para una navegación secuencial lógica
-            coincidencias_globales.sort(key=lambda x: x["sort_key"])
-
-            # Se inicializa el índice de navegación para esa etiqueta si no existe
-            if etiqueta_buscada not in self.indice_navegacion:
-                self.indice_navegacion[etiqueta_buscada] = -1
-            
-            # Lógica de carrusel: Se avanza al siguiente índice en la lista
-            self.indice_navegacion[etiqueta_buscada] += 1
-            # Si se supera el límite de coincidencias, se vuelve al inicio (carrusel)
-            if self.indice_navegacion[etiqueta_buscada] >= len(coincidencias_globales):
-                self.indice_navegacion[etiqueta_buscada] = 0
-            
-            # Se obtiene la coincidencia actual según el índice
-            match = coincidencias_globales[self.indice_navegacion[etiqueta_buscada]]
+            self.indice_navegacion[etiqueta_buscada] = posicion
 
             # Se cambia de archivo si la coincidencia está en otro documento distinto al actual
             nombre_actual = os.path.basename(self.ruta) if self.ruta else ""
-            if match["archivo"] != nombre_actual:
-                self.cambiar_archivo(match["archivo"])
+            if match.documento != nombre_actual:
+                self.cambiar_archivo(match.documento)
                 self.raiz.update_idletasks() 
             
+            # Se traducen los desplazamientos a índices del widget (materializando su zona con la vista virtual)
+            if self.vista_virtual is not None:
+                self.vista_virtual.asegurar_visible(self.disposicion.a_indice(match.inicio))
+            inicio, fin = self.tramo_en_widget(match.inicio, match.fin)
+
             # Se realiza scroll hasta la coincidencia y se aplica un resaltado temporal (amarillo)
-            self.texto_original.see(match["start"])
+            self.texto_original.see(inicio)
             self.texto_original.tag_remove("resaltado", "1.0", tk.END)
-            self.texto_original.tag_add("resaltado", match["start"], match["end"])
+            self.texto_original.tag_add("resaltado", inicio, fin)
             self.texto_original.tag_config("resaltado", background="yellow")
             self.texto_original.focus_set()
             # Se programa la eliminación del resaltado temporal después de 1 segundo (1000 ms)
@@ -1063,17 +1375,21 @@ class EtiquetadoApp:
     # --- MÉTODO PARA RECUPERAR TEXTO CODIFICADO AL PANEL DERECHO ---
     def recuperar_fragmento_codificado(self, tag_name):
         # Se busca el nombre de la etiqueta correspondiente al tag
-        etiqueta_resaltada = None
-        for etiqueta, tag in self.etiquetas_asignadas:
-            if tag == tag_name:
-                etiqueta_resaltada = etiqueta
-                break
+        etiqueta_resaltada = self.etiqueta_de_tag(tag_name)
 
         if etiqueta_resaltada:
+            # Se incluyen las citas de todos los nombres del grupo (el código visible y sus códigos anexados)
+            nombres = {etiqueta_resaltada}
+            codigo = self.codigo_de_nombre(etiqueta_resaltada)
+            if codigo is not None:
+                libro = self.anotaciones.libro
+                etiqueta_resaltada = libro.nombre(codigo)
+                nombres = {libro.por_id[m].nombre for m in libro.miembros(codigo) if m in libro.por_id}
+
             # Se agrupan los fragmentos existentes por su etiqueta
             fragmentos_por_etiqueta = {}
             for indice, sentencia, etiqueta in self.parrafos_etiquetados:
-                if etiqueta == etiqueta_resaltada:
+                if etiqueta in nombres:
                     if etiqueta_resaltada not in fragmentos_por_etiqueta:
                         fragmentos_por_etiqueta[etiqueta_resaltada] = []
                     fragmentos_por_etiqueta[etiqueta_resaltada].append(
@@ -1117,22 +1433,11 @@ class EtiquetadoApp:
     # --- MÉTODO PARA GESTIONAR BARRA HORIZONTAL DINÁMICA ---
     def actualizar_scroll_horizontal_codigos(self):
         try:
-            # Se obtiene el ancho visible del widget Text de la lista
-            visible_w = self.lista_etiquetado.winfo_width()
-            
-            # Se busca el ancho máximo requerido entre los widgets hijos (botones)
-            max_child_w = 0
-            for child in self.lista_etiquetado.winfo_children():
-                try:
-                    # Se obtiene el ancho requerido por el widget hijo actual
-                    w = child.winfo_reqwidth()
-                    if w > max_child_w:
-                        max_child_w = w
-                except:
-                    pass
+            # Las filas son líneas de texto: el propio widget informa si alguna excede el ancho visible
+            primero, ultimo = self.lista_etiquetado.xview()
 
             # Lógica de visualización: Si el contenido es más ancho que el visor, se muestra la barra
-            if max_child_w > (visible_w - 5):
+            if primero > 0.0 or ultimo < 1.0:
                 self.scrollHorizontal.grid()   # Se muestra la barra de scroll
             else:
                 self.scrollHorizontal.grid_remove()  # Se oculta la barra de scroll
@@ -1143,110 +1448,31 @@ class EtiquetadoApp:
 
     # --- MÉTODO PARA ACTUALIZAR LA LISTA DE CÓDIGOS (PANEL IZQUIERDO) ---
     def actualizar_lista_etiquetado(self):
-        # Se habilita temporalmente el widget para permitir la edición y limpieza
-        self.lista_etiquetado.config(state="normal") 
-        # Se limpia todo el contenido actual del widget
-        self.lista_etiquetado.delete(1.0, tk.END)
-        
-        # Se destruyen los widgets hijos previos (botones) para evitar duplicados
-        for widget in self.lista_etiquetado.winfo_children():
-            widget.destroy()
-
-        etiquetas_unicas = set()
-
-        # Se inserta un espaciado inicial en la lista
-        self.lista_etiquetado.insert(tk.END, "\n")
-
-        # Se itera sobre las etiquetas asignadas para renderizarlas
-        for idx, (etiqueta, tag_name) in enumerate(self.etiquetas_asignadas, start=0):
-            if etiqueta in etiquetas_unicas:
-               continue
-            etiquetas_unicas.add(etiqueta)
-
-            # Se calcula cuántas veces aparece esta etiqueta en los párrafos
-            contador = sum(
-                1 for _, _, etiq in self.parrafos_etiquetados if etiq == etiqueta)
-
-            # Se intenta recuperar el color de fondo asociado al tag
-            color_bg = None
-            try:
-                # Intento obtener el color desde el tag en el texto original si existe
-                color_bg = self.texto_original.tag_cget(tag_name, "foreground")
-            except Exception: pass
-
-            # Fallback para obtener el color desde el nombre del tag si no está presente en el texto original
-            if not color_bg:
-                 try:
-                     parts = tag_name.split('_')
-                     if len(parts) > 1 and parts[1].startswith('#'):
-                         color_bg = parts[1]
-                 except Exception: pass
-            
-            # Fallback buscando en archivos guardados globalmente si no se ha encontrado aún
-            if not color_bg:
-                for datos in self.archivos_abiertos.values():
-                    found = False
-                    for sub in datos.get("subrayados", []):
-                        if sub["tag"] == tag_name:
-                            color_bg = sub["color"]
-                            found = True
-                            break
-                    if found: break
-            
-            # Se asigna un color por defecto (gris) si no se encuentra ninguno
-            if not color_bg: color_bg = "gray"
-
-            # --- CONSTRUCCIÓN DE LA FILA USANDO window_create ---
-            
-            # 1. Se crea e inserta la etiqueta de Conteo
-            label_contador = tk.Label(self.lista_etiquetado, text=f"[{contador}]", font=(
-                "Arial", 12, "bold"), fg="purple", bg="#FFFFCC")
-            self.lista_etiquetado.window_create(tk.END, window=label_contador)
-            
-            # Se inserta un espaciador visual
-            self.lista_etiquetado.insert(tk.END, "  ")
-
-            # 2. Se crea e inserta el Botón de Color
-            btn_color = tk.Button(self.lista_etiquetado, text="  ", bg=color_bg, relief="groove", borderwidth=2, command=lambda t=tag_name: self.resaltar_etiqueta(t))
-            btn_color.bind("<Enter>", lambda event, btn=btn_color: btn.config(cursor="hand2"))
-            btn_color.bind("<Leave>", lambda event, btn=btn_color: btn.config(cursor=""))
-            self.lista_etiquetado.window_create(tk.END, window=btn_color)
-
-            # Se inserta un espaciador visual
-            self.lista_etiquetado.insert(tk.END, "  ")
-
-            # 3. Se crea e inserta el Botón con el Nombre del Código (Etiqueta)
-            btn_resaltar = tk.Button(self.lista_etiquetado, text=f"{etiqueta}", command=lambda t=tag_name: self.recuperar_fragmento_codificado(
-                t), justify=tk.LEFT, font=("arial", 10, "bold"), bg="SystemButtonFace")
-            
-            # Se configuran los efectos de Hover (pasar el ratón por encima)
-            btn_resaltar.bind("<Enter>", lambda event, btn=btn_resaltar: btn.config(cursor="hand2", bg="cyan"))
-            btn_resaltar.bind("<Leave>", lambda event, btn=btn_resaltar: btn.config(cursor="", bg="SystemButtonFace"))
-
-            # Se crea y configura el menú contextual específico para el botón
-            menu_contextual = tk.Menu(btn_resaltar, tearoff=0)
-            menu_contextual.add_command(label="Eliminar Código", image=self.icono_eliminar, compound='left', font=(
-                "arial", 11, "bold"), foreground="red", command=lambda lc=label_contador, bc=btn_color, br=btn_resaltar, e=etiqueta:
-                self.eliminar_etiqueta(lc, bc, br, e))
-            menu_contextual.add_separator()
-            menu_contextual.add_command(
-                label="Anexar a otro Código", image=self.icono_anexar, compound='left', font=(
-                "arial", 12, "bold"), foreground="navy blue", command=lambda b=btn_resaltar, e=etiqueta: self.asignar_etiqueta(b, e))
-
-            # Se vincula el menú contextual al evento de clic derecho
-            btn_resaltar.bind("<Button-3>", lambda event, menu=menu_contextual: menu.post(event.x_root, event.y_root))
-
-            # Se inserta el botón principal en la ventana de texto
-            self.lista_etiquetado.window_create(tk.END, window=btn_resaltar)
-
-            # Se inserta salto de línea para separar el siguiente elemento
-            self.lista_etiquetado.insert(tk.END, "\n\n")
+        # Se arma la lista de filas (un código visible por fila, en el orden en que se crearon) a partir de
+        # los contadores del almacén, sin recorrer las asignaciones: el costo depende de la cantidad de
+        # códigos y no de la de fragmentos. Los códigos anexados se muestran en la fila de su código visible
+        libro = self.anotaciones.libro
+        filas = []
+        for codigo in sorted({libro.resolver(codigo) for codigo in self.anotaciones.estadisticas.codigos()}):
+            ocurrencias = self.anotaciones.ocurrencias(codigo)
+            if not ocurrencias:
+                continue
+            # La fila se identifica con uno de los fragmentos del código (lo usan la navegación y las citas)
+            tag_name = ocurrencias[0].id
+            # Se asigna un color por defecto (gris) si el código no tiene ninguno
+            color_bg = self.anotaciones.color_de_codigo(codigo) or "gray"
+            filas.append((libro.nombre(codigo), tag_name, self.anotaciones.fragmentos(codigo), color_bg))
+
+        # Solo se reescriben las filas de los códigos nuevos, eliminados o con contador o color distintos
+        self.lista_codigos.sincronizar(filas)
 
         # Se verifica finalmente el estado de la barra de scroll horizontal
-        self.actualizar_scroll_horizontal_codigos()
+        self.lista_etiquetado.after_idle(self.actualizar_scroll_horizontal_codigos)
 
     # --- MÉTODO PARA ELIMINAR UNA ETIQUETA ---
-    def eliminar_etiqueta(self, label_contador, boton_color, boton_resaltar, etiqueta):
+    def eliminar_etiqueta(self, etiqueta):
+        if not etiqueta:
+            return
         # Se solicita confirmación de seguridad al usuario antes de eliminar
         confirmacion = messagebox.askyesno("Confirmar Eliminación", 
             f"¿Estás seguro de que deseas eliminar el código '{etiqueta}'?\n\nEsta acción eliminará todas las referencias y subrayados asociados al código asignado en la interfaz.")
@@ -1254,46 +1480,30 @@ class EtiquetadoApp:
             return
 
         try:
-            # Se procede a la eliminación en todos los archivos cargados
-            for nombre_archivo, datos in self.archivos_abiertos.items():
-                if isinstance(datos, dict):
-                    subrayados = datos.get("subrayados", [])
-                    nuevos_subrayados = []
-                    # Se filtran los subrayados para eliminar los de la etiqueta seleccionada
-                    for sub in subrayados:
-                        if sub["etiqueta"] == etiqueta:
-                            try:
-                                # Se remueve visualmente el tag y se desvinculan sus eventos
-                                self.texto_original.tag_remove(sub["tag"], "1.0", tk.END)
-                                self.texto_original.tag_unbind(sub["tag"], "<Enter>")
-                                self.texto_original.tag_unbind(sub["tag"], "<Leave>")
-                                self.texto_original.tag_unbind(sub["tag"], "<Motion>")
-                            except Exception:
-                                pass
-                        else:
-                            nuevos_subrayados.append(sub)
-                    # Se actualiza la lista de subrayados en los datos del archivo
-                    datos["subrayados"] = nuevos_subrayados
-
-            # Se identifican y limpian tags residuales en el widget de texto actual
-            tags_a_borrar = []
-            for tag in self.texto_original.tag_names():
-                if etiqueta in tag or tag in [t for e, t in self.etiquetas_asignadas if e == etiqueta]:
-                    tags_a_borrar.append(tag)
-            
-            for tag in tags_a_borrar:
-                self.texto_original.tag_remove(tag, "1.0", tk.END)
-
-            # Se eliminan las referencias de los tooltips y colores en los diccionarios
-            self.tooltips_asignados.pop(etiqueta, None)
+            # El código visible incluye a los códigos anexados a él: se eliminan todos sus nombres
+            nombres = {etiqueta}
+            codigo = self.codigo_de_nombre(etiqueta)
+            if codigo is not None:
+                libro = self.anotaciones.libro
+                miembros = libro.miembros(codigo)
+                nombres.update(libro.por_id[m].nombre for m in miembros if m in libro.por_id)
+
+                # Se procede a la eliminación de los fragmentos del grupo en todos los archivos cargados
+                self.anotaciones.eliminar_codigo(codigo)
+
+                # Se eliminan del widget los tags compartidos de los códigos (rangos, estilo y eventos)
+                for miembro in miembros:
+                    self.capa_subrayados.quitar_codigo(miembro)
+
+            # Se eliminan las referencias de navegación y colores en los diccionarios
+            self.indice_navegacion.pop(etiqueta, None)
             
             for color, etiq in list(self.color_tooltips.items()):
-                if etiq == etiqueta:
+                if etiq in nombres:
                     self.color_tooltips.pop(color, None)
 
             # Se eliminan las asignaciones y párrafos correspondientes de la memoria
-            self.etiquetas_asignadas = [et for et in self.etiquetas_asignadas if et[0] != etiqueta]
-            self.parrafos_etiquetados = [p for p in self.parrafos_etiquetados if p[2] != etiqueta]
+            self.registrar_operacion("quitar_codigo", sorted(nombres, key=str))
 
             # Se actualizan las tareas pendientes de la interfaz gráfica
             self.raiz.update_idletasks()
@@ -1307,7 +1517,7 @@ class EtiquetadoApp:
             print(f"[Error al eliminar etiqueta: {e}]")
 
     # --- MÉTODO PARA FUSIONAR ETIQUETAS ---
-    def asignar_etiqueta(self, boton, etiqueta_actual):
+    def asignar_etiqueta(self, etiqueta_actual):
         # Se solicita el nombre del código destino para la fusión mediante un diálogo
         nuevo_nombre = simpledialog.askstring(
             "Anexar", f"Nombre del código a Anexar:")
@@ -1317,138 +1527,84 @@ class EtiquetadoApp:
                 self.combinar_etiquetas(etiqueta_actual, nuevo_nombre)
                 self.actualizar_lista_etiquetado()
 
-    # --- LÓGICA DE FUSIÓN DE ETIQUETAS (ACTUALIZACIÓN GLOBAL AUTOMÁTICA) ---
+    # --- LÓGICA DE FUSIÓN DE ETIQUETAS (ALIAS EN EL LIBRO DE CÓDIGOS) ---
     def combinar_etiquetas(self, etiqueta_origen, etiqueta_destino):
         """
-        Fusiona 'etiqueta_origen' en 'etiqueta_destino'.
-        Actualiza los datos de subrayado en TODOS los archivos (visibles u ocultos),
-        unifica colores y tooltips, y refresca la vista actual automáticamente.
+        Anexa 'etiqueta_origen' a 'etiqueta_destino'.
+        No se reescribe ningún fragmento ni cita: el libro de códigos registra el código origen como
+        alias del destino, y los totales, la navegación y los colores se resuelven a partir de ese alias.
+        La anexión puede revertirse con 'deshacer_anexion'.
         """
-        
-        # 1. Asegurar el estado actual antes de proceder
-        # Esto guarda los cambios visuales del documento actual en self.archivos_abiertos
-        self.guardar_subrayados()
-
-        # 2. Determinar el color de destino (usando lógica existente)
-        color_destino = None
-        
-        # Intento A: Buscar color en asignaciones existentes
-        for etiq, tag in self.etiquetas_asignadas:
-            if etiq == etiqueta_destino:
-                parts = tag.split("_")
-                if len(parts) >= 2 and parts[1].startswith("#"):
-                    color_destino = parts[1]
-                    break
-        
-        # Intento B: Buscar en caché de colores
-        if not color_destino:
-            for col, name in self.color_tooltips.items():
-                if name == etiqueta_destino:
-                    color_destino = col
-                    break
-
-        # Intento C: Color por defecto si no se encuentra otro
-        if not color_destino:
-            color_destino = "#444444"
-
-        # 3. ACTUALIZACIÓN MASIVA EN ESTRUCTURA DE DATOS (ARCHIVOS ABIERTOS)
-        # Se recorren TODOS los archivos cargados, no solo el visible.
-        
-        for nombre_archivo, datos in self.archivos_abiertos.items():
-            subrayados = datos.get("subrayados", [])
-            nuevos_subrayados_archivo = []
-            
-            for sub in subrayados:
-                if sub["etiqueta"] == etiqueta_origen:
-                    # Si el subrayado pertenece a la etiqueta origen, se actualiza
-                    
-                    # Se genera un nuevo tag único que incluya el nuevo color
-                    # Esto es crucial para que al cargar el archivo, se aplique el estilo correcto
-                    nuevo_tag_id = str(uuid.uuid4())[:8]
-                    nuevo_tag_nombre = f"Color_{color_destino}_{nuevo_tag_id}"
-                    
-                    # Se actualiza el registro con los nuevos datos
-                    sub["etiqueta"] = etiqueta_destino
-                    sub["color"] = color_destino
-                    sub["tag"] = nuevo_tag_nombre
-                
-                nuevos_subrayados_archivo.append(sub)
-            
-            # Se guarda la lista actualizada en el archivo correspondiente
-            datos["subrayados"] = nuevos_subrayados_archivo
+        origen = self.codigo_de_nombre(etiqueta_origen)
+        destino = self.codigo_de_nombre(etiqueta_destino)
+        if origen is None or destino is None:
+            return
+        if origen == destino:
+            messagebox.showinfo("Anexar", f"El código '{etiqueta_origen}' ya forma parte de '{etiqueta_destino}'.")
+            return
 
-        # 4. ACTUALIZACIÓN DE METADATOS GLOBALES
-        
-        # Actualizar lista de párrafos etiquetados (para exportación y recuperación)
-        # Se crea una nueva lista donde se reemplaza el nombre de la etiqueta antigua por la nueva
-        self.parrafos_etiquetados = [
-            (idx, txt, etiqueta_destino if etiq == etiqueta_origen else etiq)
-            for idx, txt, etiq in self.parrafos_etiquetados
-        ]
+        # Se registra la anexión en el libro de códigos (union-find)
+        self.anotaciones.fusionar_codigos(origen, destino)
+        # El código origen deja de mostrarse; su posición de navegación no se traslada al destino
+        self.indice_navegacion.pop(etiqueta_origen, None)
+        self.indice_navegacion.pop(etiqueta_destino, None)
 
-        # Reconstruir la lista de etiquetas asignadas globalmente
-        # Se escanea 'archivos_abiertos' para tener la lista maestra actualizada
-        # esto asegura que los botones del panel izquierdo tengan los TAGS nuevos correctos
-        nueva_lista_asignadas = []
-        for nombre_archivo, datos in self.archivos_abiertos.items():
-            for sub in datos.get("subrayados", []):
-                # Se añade el par (NombreEtiqueta, NombreTag)
-                nueva_lista_asignadas.append((sub["etiqueta"], sub["tag"]))
-        
-        self.etiquetas_asignadas = nueva_lista_asignadas
+        # Se actualiza el color de los tags de todo el grupo (solo su estilo, sin redibujar los rangos)
+        self.capa_subrayados.recolorear(self.anotaciones.libro.miembros(destino))
+        # Se guarda la anexión en el proyecto
+        self.guardar_subrayados()
 
-        # Actualizar caché de tooltips (si existe la ventana, se actualiza referencia)
-        if etiqueta_destino not in self.tooltips_asignados:
-             self.tooltips_asignados[etiqueta_destino] = Tooltip(self.texto_original, etiqueta_destino)
+        messagebox.showinfo(
+            "Anexación completada",
+            f"El contenido del código '{etiqueta_origen}' ha sido anexado correctamente a '{etiqueta_destino}'.\n\n"
+            "Puede revertirse desde Edición > Deshacer Anexión de Códigos."
+        )
 
-        # 5. REFRESCO VISUAL AUTOMÁTICO
-        # Para que el usuario vea los cambios INMEDIATAMENTE sin hacer nada,
-        # se recarga el archivo actual usando la función cambiar_archivo.
-        # Como ya se actualizó 'self.archivos_abiertos' (la fuente de verdad),
-        # al recargar, se pintarán los subrayados con los nuevos colores y tooltips.
-        
-        nombre_actual = ""
-        if self.ruta:
-            nombre_actual = os.path.basename(self.ruta)
-            # Se encuentra el nombre exacto en el diccionario por seguridad
-            for k in self.archivos_abiertos.keys():
-                if self.archivos_abiertos[k]["contenido"] == self.contenido: 
-                    if k == nombre_actual:
-                         break
-                    
-        # --- 8) Mensaje de confirmación ---
-            messagebox.showinfo(
-                "Anexación completada",
-                f"El contenido del código '{etiqueta_origen}' ha sido anexado correctamente a '{etiqueta_destino}'."
-            )
-            
-            # Se fuerza la recarga del archivo actual para redibujar la interfaz.
-            # IMPORTANTE: Se usa guardar_antes=False porque la vista actual tiene TAGS VIEJOS.
-            # Si se guarda ahora, el sistema buscará los tags nuevos (que ya están en memoria) en la vista vieja,
-            # no los encontrará, y guardará una lista vacía, borrando los subrayados.
-            self.cambiar_archivo(nombre_actual, guardar_antes=False)
+    # --- MÉTODO PARA DESHACER LA ÚLTIMA ANEXIÓN DE CÓDIGOS ---
+    def deshacer_anexion(self):
+        fusion = self.anotaciones.deshacer_fusion()
+        if fusion is None:
+            messagebox.showinfo("Deshacer Anexión", "No hay anexiones de códigos para deshacer.")
+            return
+        libro = self.anotaciones.libro
+        # Los dos grupos recuperan sus colores y sus recorridos de navegación independientes
+        self.capa_subrayados.recolorear(libro.miembros(fusion.origen) + libro.miembros(fusion.destino))
+        self.indice_navegacion.pop(libro.nombre(fusion.destino), None)
+        self.guardar_subrayados()
+        self.actualizar_lista_etiquetado()
+        self.mostrar_estado(f"Se separó el código '{libro.nombre(fusion.origen)}' de '{libro.nombre(fusion.destino)}'.")
 
     # --- MÉTODO PARA CREAR SUBRAYADO VISUAL ---
-    def aplicar_subrayado(self, color_subrayado):
+    def aplicar_subrayado(self, color_subrayado, etiqueta):
         # Se obtienen los índices de inicio y fin de la selección actual
         sel_first = self.texto_original.index(tk.SEL_FIRST)
         sel_last = self.texto_original.index(tk.SEL_LAST)
 
-        # Se genera un identificador único para el tag visual
+        # Se genera un identificador único para el fragmento (ya no es un tag de Tk)
         identificador_unico = str(uuid.uuid4())[:8] 
         tag_name = f"Color_{color_subrayado}_{identificador_unico}"
-        
-        # Se configura el tag con el color y estilo especificados
-        self.texto_original.tag_configure(tag_name, underline=True, font=(
-            "Arial", 14, "bold"), foreground=color_subrayado)
 
-        # Se aplica el tag al rango seleccionado en el texto
-        self.texto_original.tag_add(tag_name, sel_first, sel_last)
+        # Se obtiene el identificador del código en el libro de códigos (se crea si es nuevo)
+        libro = self.anotaciones.libro
+        codigo = libro.obtener_o_crear(etiqueta, color_subrayado)
+        # Si un código visible se vuelve a usar con otro color, ese pasa a ser su color en la lista; los
+        # fragmentos de los códigos anexados a él se dibujan con el color nuevo
+        if libro.resolver(codigo) == codigo and libro.color(codigo) != color_subrayado:
+            libro.cambiar_color(codigo, color_subrayado)
+            self.capa_subrayados.recolorear(libro.miembros(codigo))
+
+        # Se registra el fragmento en el almacén con desplazamientos sobre el texto original
+        if self.ruta:
+            self.anotaciones.agregar(tag_name, os.path.basename(self.ruta), codigo, color_subrayado,
+                                     self.desplazamiento_en_texto(sel_first), self.desplazamiento_en_texto(sel_last))
+
+        # Se aplica el tag compartido del código al rango seleccionado en el texto
+        self.capa_subrayados.agregar(codigo, color_subrayado, sel_first, sel_last)
         
         # Se eleva la selección para mantener la visibilidad
         self.texto_original.tag_raise("sel")
         
-        # Se retorna el nombre del tag creado
+        # Se retorna el identificador del fragmento creado
         return tag_name
 
     # --- MÉTODO PARA LIMPIAR EL PANEL DE CITAS ---
@@ -1460,47 +1616,53 @@ class EtiquetadoApp:
 
     # --- MÉTODO PARA PERSISTENCIA DE SUBRAYADOS ---
     def guardar_subrayados(self):
-        # Se verifica si hay una ruta de archivo activa
-        if self.ruta:
-            nombre_archivo = os.path.basename(self.ruta)
-            subrayados = []
-
-            tags_procesados = set()
-
-            # Se recorren las etiquetas para guardar su estado visual actual
-            for etiqueta, tag_name in self.etiquetas_asignadas:
-                ranges = self.texto_original.tag_ranges(tag_name)
-                
-                if ranges and tag_name not in tags_procesados:
-                    start, end = ranges[0], ranges[1]
-                    
-                    try:
-                        color = self.texto_original.tag_cget(tag_name, "foreground")
-                    except:
-                        # Fallback por si tag_cget falla al obtener el color
-                        color = "black"
-                        parts = tag_name.split('_')
-                        if len(parts) > 1 and parts[1].startswith('#'):
-                            color = parts[1]
-
-                    subrayados.append({
-                        "tag": tag_name,
-                        "start": start,
-                        "end": end,
-                        "color": color,
-                        "etiqueta": etiqueta
-                    })
-                    tags_procesados.add(tag_name)
-
-            # Se actualiza la entrada en el diccionario de archivos abiertos con los datos más recientes
-            self.archivos_abiertos[nombre_archivo] = {
-                "contenido": self.contenido,
-                "subrayados": subrayados
-            }
+        # Se escriben en la base, en una sola transacción, los fragmentos creados o eliminados desde la
+        # última sincronización (y el libro de códigos si cambió) junto con las operaciones del diario:
+        # el costo depende del cambio y no del tamaño del proyecto
+        self.proyecto.guardar_cambios(self.anotaciones.tomar_cambios(), self.anotaciones.libro)
+        # La sincronización con el disco se agrupa: como máximo una vez por intervalo y fuera de este hilo
+        if self.sincronizacion_programada is None:
+            self.sincronizacion_programada = self.raiz.after(INTERVALO_SINCRONIZACION_MS, self.sincronizar_proyecto)
+        # El texto del documento ya está en la base: su copia en memoria la administra 'documentos_residentes'
 
     def restaurar_subrayados(self):
         pass
 
+    # --- MÉTODO QUE SINCRONIZA EL PROYECTO CON EL DISCO Y COMPACTA SU DIARIO ---
+    def sincronizar_proyecto(self):
+        self.sincronizacion_programada = None
+        # Cuando el diario crece, se reemplaza por el estado actual (que ya incluye sus operaciones): aquí
+        # solo se copian las listas; la serialización y la escritura se hacen en el hilo de mantenimiento
+        estado = self.estado_del_proyecto() if self.proyecto.debe_compactarse() else None
+        self.proyecto.mantener(estado)
+
+    # --- MÉTODOS DEL DIARIO DE OPERACIONES SOBRE LAS ASIGNACIONES Y LAS CITAS ---
+    def registrar_operacion(self, operacion, *argumentos):
+        # Se aplica la operación y se agrega al diario del proyecto (se escribe con 'guardar_subrayados')
+        self.aplicar_operacion(operacion, *argumentos)
+        self.proyecto.anotar(operacion, *argumentos)
+
+    def aplicar_operacion(self, operacion, *argumentos):
+        # Se usa tanto al registrar cada operación como al reproducir el diario al iniciar
+        if operacion == "asignar":
+            etiqueta, tag_name = argumentos
+            self.etiquetas_asignadas.append((etiqueta, tag_name))
+        elif operacion == "citar":
+            self.parrafos_etiquetados.extend(tuple(cita) for cita in argumentos[0])
+        elif operacion == "quitar_fragmento":
+            tag = argumentos[0]
+            for posicion, item in enumerate(self.etiquetas_asignadas):
+                if item[1] == tag:
+                    del self.etiquetas_asignadas[posicion]
+                    break
+            self.parrafos_etiquetados = [p for p in self.parrafos_etiquetados if p[0] != tag]
+        elif operacion == "quitar_cita":
+            del self.parrafos_etiquetados[argumentos[0]]
+        elif operacion == "quitar_codigo":
+            nombres = set(argumentos[0])
+            self.etiquetas_asignadas = [et for et in self.etiquetas_asignadas if et[0] not in nombres]
+            self.parrafos_etiquetados = [p for p in self.parrafos_etiquetados if p[2] not in nombres]
+
     # --- MÉTODO PARA EXPORTAR SOLO FRAGMENTOS ---
     def guardar_etiquetado(self, nuevos_parrafos_etiquetados):
         # Se abre el diálogo para guardar archivo seleccionando la ruta
@@ -1534,17 +1696,43 @@ class EtiquetadoApp:
             # Se muestra confirmación de guardado exitoso
             messagebox.showinfo("Guardado", "El fragmento codificado se ha guardado correctamente.")
 
+    # --- MÉTODO PARA EXPORTAR LAS ESTADÍSTICAS DE LOS CÓDIGOS ---
+    def exportar_estadisticas(self):
+        ruta_guardado = filedialog.asksaveasfilename(
+            defaultextension=".csv", filetypes=[("Archivos CSV", "*.csv")])
+        if ruta_guardado:
+            # Los totales se leen de los contadores que mantiene el almacén de anotaciones, agrupando
+            # cada código visible con los códigos anexados a él
+            libro = self.anotaciones.libro
+            visibles = {libro.resolver(codigo) for codigo in self.anotaciones.estadisticas.codigos()}
+            grupos = [(libro.nombre(codigo), self.anotaciones.color_de_codigo(codigo), libro.miembros(codigo))
+                      for codigo in visibles]
+            self.anotaciones.estadisticas.exportar_csv(ruta_guardado, grupos)
+            messagebox.showinfo("Guardado", "Las estadísticas de los códigos se han exportado correctamente.")
+
+    # --- MÉTODO PARA MOSTRAR EL ALMACENAMIENTO DE LOS TEXTOS DEL PROYECTO ---
+    def mostrar_informacion_proyecto(self):
+        # Los textos se guardan comprimidos y una vez por contenido; se informa la proporción de
+        # compresión, el tiempo de lectura al abrir documentos y los documentos en memoria
+        messagebox.showinfo("Información del Proyecto",
+                            f"{self.proyecto.resumen_textos()}\n{self.documentos_residentes.resumen()}")
+
     # --- MÉTODO DE SALIDA Y CIERRE ---
     def salir_programa(self):
-        # Se guardan los subrayados pendientes antes de salir
+        # Se guardan los subrayados pendientes antes de salir (el cierre del proyecto sincroniza el disco)
         self.guardar_subrayados() 
+        if self.sincronizacion_programada is not None:
+            self.raiz.after_cancel(self.sincronizacion_programada)
+            self.sincronizacion_programada = None
+        # Se conserva el orden de uso de la caché de extracción para la siguiente sesión
+        self.cache_extraccion.sincronizar()
         
         # Se realiza una limpieza de archivos inválidos antes de guardar el estado final
         archivos_validos = {}
         nombres_validos = set()
 
         for nombre, datos in self.archivos_abiertos.items():
-            if datos.get("subrayados"): 
+            if self.anotaciones.de_documento(nombre): 
                 archivos_validos[nombre] = datos
                 nombres_validos.add(nombre)
         
@@ -1555,58 +1743,38 @@ class EtiquetadoApp:
             h for h in self.historial_archivos 
             if h["nombre"] in nombres_validos
         ]
-        
-        # Se prepara la estructura de datos para la serialización (Pickle)
-        datos_a_guardar = {
+
+        # Los documentos y fragmentos ya están en la base: solo se quitan los documentos sin codificar
+        # y el diario se compacta en el estado de la interfaz
+        self.proyecto.conservar_documentos(nombres_validos)
+        self.proyecto.compactar(self.estado_del_proyecto())
+        self.proyecto.cerrar()
+
+        # Se destruye la ventana raíz y se finaliza la ejecución de la aplicación
+        self.raiz.destroy()
+
+    # --- MÉTODO QUE REÚNE EL ESTADO DE LA INTERFAZ QUE SE GUARDA CON EL PROYECTO ---
+    def estado_del_proyecto(self):
+        return {
             "historial_archivos": list(self.historial_archivos),
             "etiquetas_asignadas": [(str(e), str(t)) for e, t in self.etiquetas_asignadas],
             "parrafos_etiquetados": [tuple(map(str, p)) for p in self.parrafos_etiquetados],
             "color_tooltips": dict(self.color_tooltips),
             "indice_navegacion": dict(self.indice_navegacion),
-            "archivos_abiertos": {}
+            "segmentador": self.motor_segmentacion.get(),
         }
 
-        # Se procesan los datos de archivos abiertos para su guardado persistente
-        for nombre_archivo, datos in self.archivos_abiertos.items():
-            contenido = datos.get("contenido", "")
-            subrayados_guardados = []
-            for sub in datos.get("subrayados", []):
-                subrayados_guardados.append({
-                    "tag": str(sub["tag"]),
-                    "color": str(sub["color"]),
-                    "start": str(sub["start"]),
-                    "end": str(sub["end"]),
-                    "etiqueta": str(sub["etiqueta"]) if sub["etiqueta"] else None
-                })
-            datos_a_guardar["archivos_abiertos"][nombre_archivo] = {
-                "contenido": str(contenido),
-                "subrayados": subrayados_guardados
-            }
-
-        # LÓGICA DE GUARDADO CONDICIONAL:
-        # Se utiliza self.ruta_pickle (ruta absoluta) para asegurar que se guarda/borra
-        # en la misma carpeta del script, independientemente de donde se ejecute.
-        if not self.archivos_abiertos:
-            if os.path.exists(self.ruta_pickle):
-                try:
-                    os.remove(self.ruta_pickle)
-                except OSError:
-                    pass
-        else:
-            # Si HAY datos válidos, se escribe/sobreescribe el archivo pickle usando la ruta absoluta
-            with open(self.ruta_pickle, "wb") as archivo:
-                pickle.dump(datos_a_guardar, archivo)
-
-        # Se destruye la ventana raíz y se finaliza la ejecución de la aplicación
-        self.raiz.destroy()
-
 # --- BLOQUE PRINCIPAL DE EJECUCIÓN ---
 if __name__ == "__main__":
+    # Se habilita el soporte de multiprocesamiento en el ejecutable generado con PyInstaller
+    multiprocessing.freeze_support()
     # Se crea la instancia principal de la ventana Tk
     raiz = tk.Tk()
     # Se define la geometría inicial de la ventana
     raiz.geometry("1500x700")  
     # Se instancia la aplicación de etiquetado
     app = EtiquetadoApp(raiz)
+    # Se precarga el modelo de NLTK (si ya está en disco) en segundo plano una vez que la ventana ya está creada
+    precargar_en_segundo_plano()
     # Se inicia el bucle principal de eventos de la interfaz
     raiz.mainloop()
\ No newline at end of file
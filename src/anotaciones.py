@@ -0,0 +1,274 @@
+# --- MÓDULO DEL ALMACÉN DE ANOTACIONES (FRAGMENTOS CODIFICADOS) ---
+# Cada anotación guarda el documento, el código y los límites del fragmento como desplazamientos
+# de caracteres sobre el texto original ('contenido'), sin depender de cómo se dibuja el texto en
+# el panel. La traducción a índices "línea.columna" de Tk se hace solo en la interfaz, mediante
+# 'DisposicionTexto', por lo que las anotaciones pueden procesarse sin ningún widget.
+# El código de cada anotación es el identificador estable del libro de códigos; las anexiones entre
+# códigos se resuelven en las consultas (alias), sin modificar las anotaciones.
+from bisect import bisect_left
+from heapq import merge
+from indice_intervalos import IndiceIntervalos
+from estadisticas_codigos import EstadisticasCodigos
+from libro_codigos import LibroCodigos
+
+
+# --- CLASE DE UNA ANOTACIÓN ---
+class Anotacion:
+    __slots__ = ("id", "documento", "codigo", "color", "inicio", "fin")
+
+    def __init__(self, id, documento, codigo, color, inicio, fin):
+        # Identificador único del fragmento
+        self.id = id
+        # Nombre del documento al que pertenece
+        self.documento = documento
+        # Código asignado al fragmento y color con el que se subraya
+        self.codigo = codigo
+        self.color = color
+        # Desplazamientos [inicio, fin) sobre el texto original del documento
+        self.inicio = inicio
+        self.fin = fin
+
+    def clave_orden(self):
+        # Orden de navegación dentro de un código: documento, posición y desempate por identificador
+        return (self.documento, self.inicio, self.fin, self.id)
+
+    def como_tupla(self):
+        return (self.id, self.codigo, self.color, self.inicio, self.fin)
+
+    def __repr__(self):
+        return f"Anotacion({self.id!r}, {self.documento!r}, {self.codigo!r}, {self.inicio}, {self.fin})"
+
+
+# --- CLASE DEL ALMACÉN DE ANOTACIONES ---
+class AlmacenAnotaciones:
+    def __init__(self):
+        # Identificador -> anotación
+        self.por_id = {}
+        # Documento -> lista de anotaciones en orden de creación
+        self.por_documento = {}
+        # Documento -> índice de intervalos de sus anotaciones (consultas de superposición). Se construye
+        # en bloque la primera vez que se consulta un documento (ver '_indice'), no al cargar el proyecto
+        self.intervalos = {}
+        # Índice invertido: código -> ocurrencias ordenadas por documento y posición en todo el corpus,
+        # junto con sus claves de orden para ubicar cada ocurrencia con búsqueda binaria
+        self.por_codigo = {}
+        self._claves_por_codigo = {}
+        # Contadores por código, documento y color, actualizados en cada cambio
+        self.estadisticas = EstadisticasCodigos()
+        # Libro de códigos: nombres, colores y anexiones (alias) entre códigos
+        self.libro = LibroCodigos()
+        # Código visible -> (claves, ocurrencias) combinadas de todos los códigos anexados a él.
+        # Se construye al navegar por primera vez un grupo y luego se mantiene como el índice por código
+        self._combinadas = {}
+        # Cambios pendientes de sincronizar con la persistencia: id -> (documento, anotación o None si se
+        # eliminó). Solo se registran las altas y bajas hechas después de la carga
+        self._pendientes = {}
+        self.registrar_cambios = True
+
+    def __len__(self):
+        return len(self.por_id)
+
+    # --- ALTAS Y BAJAS ---
+    def agregar(self, id, documento, codigo, color, inicio, fin):
+        anotacion = Anotacion(id, documento, codigo, color, inicio, fin)
+        self.por_id[id] = anotacion
+        self.por_documento.setdefault(documento, []).append(anotacion)
+        # Si el índice del documento aún no existe, incluirá esta anotación cuando se construya
+        indice = self.intervalos.get(documento)
+        if indice is not None:
+            indice.insertar(inicio, fin, anotacion)
+        self._indexar_codigo(anotacion)
+        self.estadisticas.registrar(anotacion)
+        if self.registrar_cambios:
+            self._pendientes[id] = (documento, anotacion)
+        return anotacion
+
+    # --- MANTENIMIENTO DEL ÍNDICE INVERTIDO CÓDIGO -> OCURRENCIAS ---
+    def _indexar_codigo(self, anotacion):
+        clave = anotacion.clave_orden()
+        claves = self._claves_por_codigo.setdefault(anotacion.codigo, [])
+        posicion = bisect_left(claves, clave)
+        claves.insert(posicion, clave)
+        self.por_codigo.setdefault(anotacion.codigo, []).insert(posicion, anotacion)
+        combinadas = self._combinadas.get(self.libro.resolver(anotacion.codigo))
+        if combinadas is not None:
+            posicion = bisect_left(combinadas[0], clave)
+            combinadas[0].insert(posicion, clave)
+            combinadas[1].insert(posicion, anotacion)
+
+    def _desindexar_codigo(self, anotacion):
+        clave = anotacion.clave_orden()
+        _quitar_ordenada(self._claves_por_codigo, self.por_codigo, anotacion.codigo, clave, anotacion)
+        combinadas = self._combinadas.get(self.libro.resolver(anotacion.codigo))
+        if combinadas is not None:
+            posicion = bisect_left(combinadas[0], clave)
+            if posicion < len(combinadas[0]) and combinadas[1][posicion] is anotacion:
+                del combinadas[0][posicion]
+                del combinadas[1][posicion]
+
+    def eliminar(self, anotacion):
+        if self.por_id.pop(anotacion.id, None) is None:
+            return
+        self._desindexar_codigo(anotacion)
+        self.estadisticas.retirar(anotacion)
+        if self.registrar_cambios:
+            self._pendientes[anotacion.id] = (anotacion.documento, None)
+        anotaciones = self.por_documento.get(anotacion.documento)
+        if anotaciones:
+            anotaciones.remove(anotacion)
+            indice = self.intervalos.get(anotacion.documento)
+            if indice is not None:
+                indice.eliminar(anotacion)
+            if not anotaciones:
+                del self.por_documento[anotacion.documento]
+                self.intervalos.pop(anotacion.documento, None)
+
+    def eliminar_codigo(self, codigo):
+        # Se eliminan las anotaciones del código y de todos los códigos anexados a él, y el grupo se
+        # retira del libro (sus nombres quedan libres para un código nuevo)
+        eliminadas = list(self.ocurrencias(codigo))
+        for anotacion in eliminadas:
+            self.eliminar(anotacion)
+        self._combinadas.pop(self.libro.resolver(codigo), None)
+        self.libro.eliminar(codigo)
+        return eliminadas
+
+    # --- ANEXIÓN DE CÓDIGOS (ALIAS EN EL LIBRO, SIN REESCRIBIR ANOTACIONES) ---
+    def fusionar_codigos(self, origen, destino):
+        self._combinadas.pop(self.libro.resolver(origen), None)
+        self._combinadas.pop(self.libro.resolver(destino), None)
+        return self.libro.fusionar(origen, destino)
+
+    def deshacer_fusion(self):
+        fusion = self.libro.deshacer()
+        if fusion is not None:
+            self._combinadas.pop(fusion.origen, None)
+            self._combinadas.pop(fusion.destino, None)
+        return fusion
+
+    # --- CONSULTAS ---
+    def de_documento(self, documento):
+        return self.por_documento.get(documento, [])
+
+    def documentos(self):
+        return list(self.por_documento)
+
+    def ocurrencias(self, codigo):
+        # Ocurrencias del código (incluidas las de sus alias) ordenadas por documento y posición.
+        # Es una lista mantenida: no se debe modificar
+        visible = self.libro.resolver(codigo)
+        miembros = self.libro.miembros(visible)
+        if len(miembros) == 1:
+            return self.por_codigo.get(visible, [])
+        combinadas = self._combinadas.get(visible)
+        if combinadas is None:
+            ocurrencias = list(merge(*(self.por_codigo.get(m, []) for m in miembros), key=Anotacion.clave_orden))
+            combinadas = self._combinadas[visible] = ([a.clave_orden() for a in ocurrencias], ocurrencias)
+        return combinadas[1]
+
+    def ocurrencia(self, codigo, posicion):
+        # Ocurrencia en la posición indicada del recorrido circular de un código: O(1)
+        ocurrencias = self.ocurrencias(codigo)
+        if not ocurrencias:
+            return None, -1
+        posicion %= len(ocurrencias)
+        return ocurrencias[posicion], posicion
+
+    # --- CONSULTAS POR POSICIÓN (RESUELTAS CON EL ÍNDICE DE INTERVALOS) ---
+    def _indice(self, documento):
+        indice = self.intervalos.get(documento)
+        if indice is None:
+            anotaciones = self.por_documento.get(documento)
+            if not anotaciones:
+                return None
+            indice = self.intervalos[documento] = IndiceIntervalos.desde_intervalos(
+                (anotacion.inicio, anotacion.fin, anotacion) for anotacion in anotaciones)
+        return indice
+
+    def hay_en(self, documento, desplazamiento):
+        # Indica si la posición está codificada, sin construir la lista de anotaciones (hover del ratón)
+        indice = self._indice(documento)
+        return indice.hay_en(desplazamiento) if indice else False
+
+    def que_se_superponen(self, documento, inicio, fin):
+        # Anotaciones que comparten al menos un carácter con el tramo [inicio, fin)
+        indice = self._indice(documento)
+        return indice.que_se_superponen(inicio, fin) if indice else []
+
+    def contenidas_en(self, documento, inicio, fin):
+        # Anotaciones que están completamente dentro del tramo [inicio, fin)
+        indice = self._indice(documento)
+        return indice.contenidos_en(inicio, fin) if indice else []
+
+    def codigos_superpuestos(self, documento, inicio, fin):
+        # Códigos distintos presentes en el tramo, en el orden en que aparecen en el texto
+        codigos = {}
+        for anotacion in sorted(self.que_se_superponen(documento, inicio, fin), key=lambda a: a.inicio):
+            codigos.setdefault(self.libro.resolver(anotacion.codigo), anotacion.color)
+        return codigos
+
+    def color_de_codigo(self, codigo):
+        color = self.libro.color(codigo)
+        if color is None:
+            ocurrencias = self.ocurrencias(codigo)
+            color = ocurrencias[0].color if ocurrencias else None
+        return color
+
+    # --- TOTALES DE UN CÓDIGO VISIBLE (SUMA DE SUS ALIAS EN LAS ESTADÍSTICAS) ---
+    def fragmentos(self, codigo):
+        return sum(self.estadisticas.fragmentos(m) for m in self.libro.miembros(codigo))
+
+    # --- SEGUIMIENTO DE CAMBIOS: SOLO LOS FRAGMENTOS MODIFICADOS DESDE LA ÚLTIMA SINCRONIZACIÓN ---
+    def tomar_cambios(self):
+        # Retorna [(id, documento, fila o None)] y vacía los pendientes; una fila None indica una baja.
+        # Un fragmento creado y eliminado entre dos sincronizaciones aparece solo como baja
+        cambios = [(id, documento, anotacion.como_tupla() if anotacion is not None else None)
+                   for id, (documento, anotacion) in self._pendientes.items()]
+        self._pendientes = {}
+        return cambios
+
+    # --- PERSISTENCIA: documento -> [(id, código, color, inicio, fin), ...] ---
+    def a_datos(self):
+        return {documento: [anotacion.como_tupla() for anotacion in anotaciones]
+                for documento, anotaciones in self.por_documento.items()}
+
+    def cargar_documento(self, documento, filas):
+        # Lo que se carga ya está persistido: no se registra como cambio pendiente
+        registrar, self.registrar_cambios = self.registrar_cambios, False
+        try:
+            for id, codigo, color, inicio, fin in filas:
+                # Los datos anteriores al libro de códigos guardan el nombre del código en lugar de su identificador
+                if isinstance(codigo, str):
+                    codigo = self.libro.obtener_o_crear(codigo, color)
+                self.agregar(id, documento, codigo, color, inicio, fin)
+        finally:
+            self.registrar_cambios = registrar
+
+
+def _quitar_ordenada(claves_por_codigo, por_codigo, codigo, clave, anotacion):
+    claves = claves_por_codigo.get(codigo)
+    if not claves:
+        return
+    posicion = bisect_left(claves, clave)
+    if posicion < len(claves) and por_codigo[codigo][posicion] is anotacion:
+        del claves[posicion]
+        del por_codigo[codigo][posicion]
+        if not claves:
+            del claves_por_codigo[codigo]
+            del por_codigo[codigo]
+
+
+# --- FUNCIÓN PARA CONVERTIR SUBRAYADOS DE VERSIONES ANTERIORES (ÍNDICES DE TK) ---
+def migrar_subrayados(subrayados, disposicion):
+    # Los datos antiguos guardan "start"/"end" como índices "línea.columna" del panel; se traducen
+    # a desplazamientos del texto original con la disposición con la que fueron creados
+    filas = []
+    for sub in subrayados:
+        try:
+            inicio = disposicion.a_desplazamiento(sub["start"])
+            fin = disposicion.a_desplazamiento(sub["end"])
+        except (KeyError, ValueError):
+            continue
+        if fin > inicio:
+            filas.append((str(sub["tag"]), sub["etiqueta"], str(sub["color"]), inicio, fin))
+    return filas
@@ -0,0 +1,190 @@
+# --- MÓDULO DE CACHÉ EN DISCO DEL TEXTO EXTRAÍDO DE LOS DOCUMENTOS ---
+# Cada entrada guarda el contenido y los límites de sus oraciones (por motor de segmentación)
+# y se identifica por el hash de los bytes del archivo (direccionamiento por contenido). Un índice
+# adicional asocia (ruta, tamaño, fecha de modificación) con ese hash para no leer el archivo
+# cuando no ha cambiado.
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from segmentacion import MOTOR_POR_DEFECTO
+
+# Tamaño máximo por defecto que puede ocupar la caché en disco (256 MB)
+LIMITE_BYTES_POR_DEFECTO = 256 * 1024 * 1024
+# Versión del formato de las entradas; al cambiarla se invalidan las entradas anteriores
+VERSION_FORMATO = 4
+# Errores al leer un archivo de la caché que no existe, no se puede abrir o está truncado o dañado
+_ERRORES_LECTURA = (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError,
+                    TypeError, ValueError)
+
+
+# --- FUNCIÓN PARA CALCULAR EL HASH DEL CONTENIDO DE UN ARCHIVO ---
+def calcular_hash_archivo(ruta_archivo, tam_bloque=1024 * 1024):
+    # Se lee el archivo por bloques para no cargar documentos grandes completos en memoria
+    hash_contenido = hashlib.sha256()
+    with open(ruta_archivo, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(tam_bloque), b""):
+            hash_contenido.update(bloque)
+    return hash_contenido.hexdigest()
+
+
+# --- CLASE DE LA CACHÉ DE EXTRACCIÓN ---
+class CacheExtraccion:
+    def __init__(self, carpeta, limite_bytes=LIMITE_BYTES_POR_DEFECTO):
+        # Se asigna la carpeta donde se almacenan las entradas y el índice
+        self.carpeta = carpeta
+        # Se asigna el límite de tamaño total de las entradas
+        self.limite_bytes = limite_bytes
+        # Se inicializan los contadores de diagnóstico
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+        self.ruta_indice = os.path.join(carpeta, "indice.pkl")
+        # Índice de huellas: ruta -> (tamaño, fecha de modificación, hash)
+        self.huellas = {}
+        # Entradas en orden LRU (la menos usada primero): hash -> tamaño en disco
+        self.entradas = OrderedDict()
+        # Indica que el índice en memoria tiene cambios que aún no se escribieron en disco; se escribe
+        # una sola vez por importación (con 'sincronizar') y no después de cada documento
+        self._indice_modificado = False
+        self._cargar_indice()
+
+    # --- MÉTODOS INTERNOS DE PERSISTENCIA DEL ÍNDICE ---
+    def _cargar_indice(self):
+        try:
+            with open(self.ruta_indice, "rb") as archivo:
+                datos = pickle.load(archivo)
+            if datos.get("version") == VERSION_FORMATO:
+                self.huellas = datos.get("huellas", {})
+                self.entradas = OrderedDict(datos.get("entradas", []))
+            else:
+                # Se eliminan las entradas escritas con un formato anterior
+                for hash_contenido, _ in datos.get("entradas", []):
+                    try:
+                        os.remove(self._ruta_entrada(hash_contenido))
+                    except OSError:
+                        pass
+        except _ERRORES_LECTURA:
+            # Si el índice no existe o está dañado, se comienza con una caché vacía
+            self.huellas = {}
+            self.entradas = OrderedDict()
+
+    def _guardar_indice(self):
+        os.makedirs(self.carpeta, exist_ok=True)
+        # Se escribe en un archivo temporal y se reemplaza para no dejar un índice a medias
+        ruta_temporal = self.ruta_indice + ".tmp"
+        with open(ruta_temporal, "wb") as archivo:
+            pickle.dump({"version": VERSION_FORMATO, "huellas": self.huellas,
+                         "entradas": list(self.entradas.items())}, archivo)
+        os.replace(ruta_temporal, self.ruta_indice)
+
+    def _ruta_entrada(self, hash_contenido):
+        return os.path.join(self.carpeta, f"{hash_contenido}.pkl")
+
+    # --- MÉTODO PARA OBTENER LA HUELLA (TAMAÑO, FECHA Y HASH) DE UN ARCHIVO ---
+    def huella(self, ruta_archivo):
+        ruta_absoluta = os.path.abspath(ruta_archivo)
+        estado = os.stat(ruta_absoluta)
+        conocida = self.huellas.get(ruta_absoluta)
+        # Si la ruta, el tamaño y la fecha coinciden, se reutiliza el hash sin leer el archivo
+        if conocida and conocida[0] == estado.st_size and conocida[1] == estado.st_mtime_ns:
+            return conocida[2]
+        hash_contenido = calcular_hash_archivo(ruta_absoluta)
+        self.huellas[ruta_absoluta] = (estado.st_size, estado.st_mtime_ns, hash_contenido)
+        self._indice_modificado = True
+        return hash_contenido
+
+    # --- MÉTODO PARA LEER UNA ENTRADA: (contenido, {motor: límites}) ---
+    def _leer_entrada(self, hash_contenido):
+        with open(self._ruta_entrada(hash_contenido), "rb") as archivo:
+            return pickle.load(archivo)
+
+    # --- MÉTODO PARA CONSULTAR LA CACHÉ ---
+    # Retorna (contenido, límites) o None; los límites son None si el texto está en caché
+    # pero aún no se ha segmentado con el motor solicitado
+    def obtener(self, ruta_archivo, motor=None):
+        try:
+            hash_contenido = self.huella(ruta_archivo)
+        except OSError:
+            self.fallos += 1
+            return None
+
+        if hash_contenido in self.entradas:
+            try:
+                contenido, limites_por_motor = self._leer_entrada(hash_contenido)
+                # Se marca la entrada como usada recientemente
+                self.entradas.move_to_end(hash_contenido)
+                self._indice_modificado = True
+                self.aciertos += 1
+                return contenido, limites_por_motor.get(motor or MOTOR_POR_DEFECTO)
+            except _ERRORES_LECTURA:
+                # Se descarta una entrada que ya no existe o no se puede leer
+                self.entradas.pop(hash_contenido, None)
+                self._indice_modificado = True
+
+        self.fallos += 1
+        return None
+
+    # --- MÉTODO PARA ALMACENAR EL RESULTADO DE UNA EXTRACCIÓN ---
+    def guardar(self, ruta_archivo, contenido, limites, motor=None):
+        try:
+            hash_contenido = self.huella(ruta_archivo)
+            os.makedirs(self.carpeta, exist_ok=True)
+            # Se conservan los límites ya calculados con otros motores para el mismo texto
+            limites_por_motor = {}
+            if hash_contenido in self.entradas:
+                try:
+                    limites_por_motor = self._leer_entrada(hash_contenido)[1]
+                except _ERRORES_LECTURA:
+                    limites_por_motor = {}
+            limites_por_motor[motor or MOTOR_POR_DEFECTO] = limites
+            ruta_entrada = self._ruta_entrada(hash_contenido)
+            with open(ruta_entrada, "wb") as archivo:
+                pickle.dump((contenido, limites_por_motor), archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            self.entradas[hash_contenido] = os.path.getsize(ruta_entrada)
+            self.entradas.move_to_end(hash_contenido)
+            self._desalojar()
+            self._indice_modificado = True
+        except OSError:
+            # La caché es opcional: si no se puede escribir, se continúa sin ella
+            pass
+
+    # --- MÉTODO PARA DESALOJAR LAS ENTRADAS MENOS USADAS AL SUPERAR EL LÍMITE ---
+    def _desalojar(self):
+        total = sum(self.entradas.values())
+        while total > self.limite_bytes and len(self.entradas) > 1:
+            hash_contenido, tamano = self.entradas.popitem(last=False)
+            total -= tamano
+            self.desalojos += 1
+            try:
+                os.remove(self._ruta_entrada(hash_contenido))
+            except OSError:
+                pass
+        # Se eliminan del índice de huellas las rutas que apuntaban a entradas desalojadas
+        self.huellas = {ruta: huella for ruta, huella in self.huellas.items()
+                        if huella[2] in self.entradas}
+
+    # --- MÉTODO PARA ESCRIBIR EL ÍNDICE (AL TERMINAR UNA IMPORTACIÓN Y AL CERRAR LA APLICACIÓN) ---
+    def sincronizar(self):
+        if not self._indice_modificado:
+            return
+        try:
+            self._guardar_indice()
+            self._indice_modificado = False
+        except OSError:
+            pass
+
+    # --- MÉTODO PARA CONSULTAR LOS CONTADORES DE DIAGNÓSTICO ---
+    def estadisticas(self):
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "entradas": len(self.entradas),
+            "bytes": sum(self.entradas.values()),
+            "limite_bytes": self.limite_bytes,
+        }
+
+    def resumen(self):
+        return f"caché: {self.aciertos} aciertos, {self.fallos} fallos"
@@ -0,0 +1,75 @@
+# --- MÓDULO DE LA CAPA DE SUBRAYADOS DEL PANEL "TEXTO" ---
+# En el widget Text existe un solo tag de estilo por cada par (código, color), compartido por todos
+# los tramos codificados con ese código. El color que se dibuja puede diferir del de la clave (por
+# ejemplo, el de un código anexado a otro) y se cambia reconfigurando solo el tag, sin tocar los rangos.
+# La identidad de cada tramo (su identificador, su código y sus límites) vive en el almacén de
+# anotaciones, no en Tk, y los tags no tienen manejadores de eventos (el tooltip de los códigos se
+# alimenta desde el hover del widget), por lo que el número de tags no crece con los fragmentos.
+
+# Prefijo de los tags de estilo creados por la capa
+PREFIJO_TAG = "Codigo_"
+
+
+# --- CLASE DE LA CAPA DE SUBRAYADOS ---
+class CapaSubrayados:
+    def __init__(self, widget, fuente=("Arial", 14, "bold"), color_visible=None):
+        # Se asigna el widget Text sobre el que se dibujan los subrayados
+        self.widget = widget
+        # Se asigna la fuente común de los fragmentos codificados
+        self.fuente = fuente
+        # Función que retorna el color con que se dibuja un (código, color): color_visible(etiqueta, color)
+        self.color_visible = color_visible or (lambda etiqueta, color: color)
+        # (etiqueta, color) -> nombre del tag de estilo
+        self.tag_por_estilo = {}
+        # nombre del tag de estilo -> (etiqueta, color)
+        self.estilo_por_tag = {}
+        self._siguiente = 0
+
+    # --- MÉTODO QUE RETORNA (Y CREA SI HACE FALTA) EL TAG COMPARTIDO DE UN CÓDIGO Y COLOR ---
+    def tag_de(self, etiqueta, color):
+        clave = (etiqueta, color)
+        tag_name = self.tag_por_estilo.get(clave)
+        if tag_name is None:
+            tag_name = f"{PREFIJO_TAG}{self._siguiente}"
+            self._siguiente += 1
+            self.tag_por_estilo[clave] = tag_name
+            self.estilo_por_tag[tag_name] = clave
+            # El estilo se configura una sola vez por código, no por fragmento
+            self.widget.tag_configure(tag_name, underline=True, font=self.fuente, foreground=self.color_visible(etiqueta, color))
+        return tag_name
+
+    # --- MÉTODO PARA DIBUJAR UN TRAMO CODIFICADO ---
+    def agregar(self, etiqueta, color, inicio, fin):
+        self.widget.tag_add(self.tag_de(etiqueta, color), inicio, fin)
+
+    # --- MÉTODO PARA DIBUJAR DE UNA VEZ VARIOS TRAMOS DEL MISMO CÓDIGO Y COLOR ---
+    def agregar_varios(self, etiqueta, color, tramos):
+        # 'tag add' acepta varios pares inicio/fin, por lo que todos los tramos se envían en una sola llamada a Tcl
+        indices = [indice for tramo in tramos for indice in tramo]
+        if indices:
+            self.widget.tag_add(self.tag_de(etiqueta, color), *indices)
+
+    # --- MÉTODO PARA BORRAR UN TRAMO CODIFICADO ---
+    # 'restantes' son los tramos (inicio, fin) del mismo código y color que deben seguir visibles,
+    # ya que el tag compartido no distingue entre tramos superpuestos
+    def quitar(self, etiqueta, color, inicio, fin, restantes=()):
+        tag_name = self.tag_por_estilo.get((etiqueta, color))
+        if tag_name is None:
+            return
+        self.widget.tag_remove(tag_name, inicio, fin)
+        self.agregar_varios(etiqueta, color, restantes)
+
+    # --- MÉTODO PARA VOLVER A CALCULAR EL COLOR VISIBLE DE LOS TAGS DE VARIOS CÓDIGOS ---
+    def recolorear(self, etiquetas):
+        etiquetas = set(etiquetas)
+        for (etiqueta, color), tag_name in self.tag_por_estilo.items():
+            if etiqueta in etiquetas:
+                self.widget.tag_configure(tag_name, foreground=self.color_visible(etiqueta, color))
+
+    # --- MÉTODO PARA BORRAR TODOS LOS TAGS DE UN CÓDIGO ---
+    def quitar_codigo(self, etiqueta):
+        for clave in [clave for clave in self.tag_por_estilo if clave[0] == etiqueta]:
+            tag_name = self.tag_por_estilo.pop(clave)
+            del self.estilo_por_tag[tag_name]
+            # tag_delete elimina a la vez los rangos y el estilo
+            self.widget.tag_delete(tag_name)
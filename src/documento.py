@@ -0,0 +1,141 @@
+# --- MÓDULO DEL MODELO DE DOCUMENTO ---
+# Un documento conserva su texto una sola vez. Las oraciones se representan con un arreglo
+# compacto de desplazamientos (array('I')) y se exponen como una vista perezosa: cada
+# fragmento se recorta del texto solo en el momento en que se solicita.
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+
+
+# --- CLASE DE VISTA PEREZOSA SOBRE FRAGMENTOS DEL TEXTO ---
+class VistaFragmentos(Sequence):
+    __slots__ = ("_texto", "_limites")
+
+    def __init__(self, texto, limites):
+        # Se guardan referencias al texto y a los límites, sin copiar ninguno de los dos
+        self._texto = texto
+        self._limites = limites
+
+    def __len__(self):
+        return len(self._limites) // 2
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            # Un recorte devuelve otra vista que comparte el mismo texto
+            pares = range(len(self))[indice]
+            if pares.step == 1:
+                limites = self._limites[2 * pares.start:2 * pares.stop]
+            else:
+                limites = array('I')
+                for i in pares:
+                    limites.append(self._limites[2 * i])
+                    limites.append(self._limites[2 * i + 1])
+            return VistaFragmentos(self._texto, limites)
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de fragmento fuera de rango")
+        return self._texto[self._limites[2 * indice]:self._limites[2 * indice + 1]]
+
+    # --- MÉTODO PARA CONSULTAR LOS DESPLAZAMIENTOS DE UN FRAGMENTO ---
+    def limites(self, indice):
+        return self._limites[2 * indice], self._limites[2 * indice + 1]
+
+
+# --- CLASE PRINCIPAL DEL DOCUMENTO ---
+class Documento:
+    __slots__ = ("nombre", "texto", "limites_oraciones")
+
+    def __init__(self, nombre, texto, limites_oraciones):
+        # Se asigna el nombre del archivo que identifica al documento
+        self.nombre = nombre
+        # Se asigna el texto completo (única copia del contenido del documento)
+        self.texto = texto
+        # Se asigna el arreglo de límites de oraciones [inicio_0, fin_0, inicio_1, fin_1, ...]
+        self.limites_oraciones = limites_oraciones
+
+    # --- CONSTRUCTOR A PARTIR DE UNA ENTRADA DE 'archivos_abiertos' ---
+    @classmethod
+    def desde_datos(cls, nombre, datos):
+        return cls(nombre, datos.get("contenido", ""), datos.get("limites") or array('I'))
+
+    @property
+    def oraciones(self):
+        return VistaFragmentos(self.texto, self.limites_oraciones)
+
+    def __len__(self):
+        return len(self.texto)
+
+
+# --- CLASE DE LA DISPOSICIÓN DEL DOCUMENTO EN EL PANEL "TEXTO" ---
+# El panel muestra cada línea de cada oración seguida de una línea en blanco. Esta clase traduce
+# entre desplazamientos de caracteres del texto original y los índices "línea.columna" de esa
+# disposición; es la única parte que conoce cómo se dibuja el documento.
+class DisposicionTexto:
+    __slots__ = ("documento", "inicios", "lineas", "total_lineas")
+
+    def __init__(self, documento):
+        self.documento = documento
+        limites = documento.limites_oraciones
+        # Desplazamiento donde comienza cada oración
+        self.inicios = limites[0::2]
+        # Línea del panel donde comienza cada oración (cada línea del texto ocupa dos renglones)
+        self.lineas = array('I')
+        linea = 1
+        texto = documento.texto
+        for i in range(0, len(limites), 2):
+            self.lineas.append(linea)
+            linea += 2 * (texto.count('\n', limites[i], limites[i + 1]) + 1)
+        self.total_lineas = linea
+
+    @property
+    def oraciones(self):
+        return self.documento.oraciones
+
+    def oracion_de_linea(self, linea):
+        return max(0, bisect_right(self.lineas, linea) - 1)
+
+    # --- DESPLAZAMIENTO DEL TEXTO -> ÍNDICE "línea.columna" DEL PANEL ---
+    def a_indice(self, desplazamiento):
+        if not self.inicios:
+            return "1.0"
+        limites = self.documento.limites_oraciones
+        i = max(0, bisect_right(self.inicios, desplazamiento) - 1)
+        inicio, fin = limites[2 * i], limites[2 * i + 1]
+        desplazamiento = max(desplazamiento, inicio)
+        if desplazamiento > fin:
+            # El texto entre dos oraciones no se muestra: se usa el comienzo de la siguiente oración
+            if i + 1 < len(self.inicios):
+                i += 1
+                inicio = desplazamiento = limites[2 * i]
+            else:
+                desplazamiento = fin
+        texto = self.documento.texto
+        saltos = texto.count('\n', inicio, desplazamiento)
+        inicio_linea = texto.rfind('\n', inicio, desplazamiento) + 1 if saltos else inicio
+        return f"{self.lineas[i] + 2 * saltos}.{desplazamiento - inicio_linea}"
+
+    # --- ÍNDICE "línea.columna" DEL PANEL -> DESPLAZAMIENTO DEL TEXTO ---
+    def a_desplazamiento(self, indice):
+        if not self.inicios:
+            return 0
+        linea, columna = (int(parte) for parte in str(indice).split('.'))
+        limites = self.documento.limites_oraciones
+        texto = self.documento.texto
+        i = self.oracion_de_linea(linea)
+        inicio, fin = limites[2 * i], limites[2 * i + 1]
+        renglon = max(0, linea - self.lineas[i])
+        if renglon % 2:
+            # Línea en blanco que sigue a una línea de la oración: equivale al final de esa línea
+            columna = len(texto)
+        # Se avanza hasta el comienzo de la línea correspondiente dentro de la oración
+        inicio_linea = inicio
+        for _ in range(renglon // 2):
+            salto = texto.find('\n', inicio_linea, fin)
+            if salto < 0:
+                return fin
+            inicio_linea = salto + 1
+        fin_linea = texto.find('\n', inicio_linea, fin)
+        if fin_linea < 0:
+            fin_linea = fin
+        return min(inicio_linea + columna, fin_linea)
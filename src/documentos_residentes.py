@@ -0,0 +1,57 @@
+# --- MÓDULO DE LOS DOCUMENTOS RESIDENTES EN MEMORIA ---
+# Al iniciar solo se lee el manifiesto del proyecto (nombres de los documentos, libro de códigos y
+# fragmentos codificados); el texto y los límites de oraciones de cada documento se cargan de la base
+# cuando se abre. Se conservan en memoria los últimos documentos usados (LRU) y a los demás se les
+# quita el texto, que sigue guardado en el proyecto y se vuelve a leer si se abren otra vez.
+from collections import OrderedDict
+
+# Cantidad máxima de documentos con su texto en memoria
+LIMITE_RESIDENTES = 8
+
+
+# --- CLASE DE LOS DOCUMENTOS RESIDENTES ---
+class DocumentosResidentes:
+    def __init__(self, archivos, cargar, limite=LIMITE_RESIDENTES):
+        # Diccionario nombre -> datos del documento (el mismo objeto que 'archivos_abiertos')
+        self.archivos = archivos
+        # Función que lee de la base el texto y los límites de un documento: cargar(nombre) -> (contenido, limites)
+        self.cargar = cargar
+        self.limite = limite
+        # Documentos con su texto en memoria, del menos al más recientemente usado
+        self.orden = OrderedDict()
+        # Contadores de diagnóstico
+        self.cargas = 0
+        self.desalojos = 0
+        # Los documentos que ya llegaron con su texto (por ejemplo, al migrar un pickle) cuentan como residentes
+        for nombre, datos in archivos.items():
+            if "contenido" in datos:
+                self.orden[nombre] = True
+        self._desalojar()
+
+    def obtener(self, nombre):
+        # Retorna los datos del documento con su texto y sus límites, leyéndolos de la base si hace falta
+        datos = self.archivos[nombre]
+        # El texto y los límites se cargan y se desalojan juntos; si falta alguno se leen los dos de la base
+        if "contenido" not in datos or "limites" not in datos:
+            datos["contenido"], datos["limites"] = self.cargar(nombre)
+            self.cargas += 1
+        self.registrar(nombre)
+        return datos
+
+    def registrar(self, nombre):
+        # Marca el documento como el más recientemente usado
+        self.orden[nombre] = True
+        self.orden.move_to_end(nombre)
+        self._desalojar()
+
+    def _desalojar(self):
+        while len(self.orden) > self.limite:
+            nombre, _ = self.orden.popitem(last=False)
+            datos = self.archivos.get(nombre)
+            if datos is not None:
+                datos.pop("contenido", None)
+                datos.pop("limites", None)
+                self.desalojos += 1
+
+    def resumen(self):
+        return f"{len(self.orden)} documentos en memoria, {self.cargas} cargas, {self.desalojos} desalojos"
@@ -0,0 +1,68 @@
+# --- MÓDULO DE ESTADÍSTICAS DE LOS CÓDIGOS ---
+# Contadores que el almacén de anotaciones actualiza en cada alta, baja o reasignación de un
+# fragmento codificado: cantidad de fragmentos por código y por código y documento, además de los
+# caracteres codificados por código. Así la lista de códigos y las exportaciones leen los totales
+# directamente, sin recorrer todas las citas en cada actualización.
+import csv
+from collections import Counter
+
+
+# --- CLASE DE LAS ESTADÍSTICAS ---
+class EstadisticasCodigos:
+    def __init__(self):
+        # Código -> cantidad de fragmentos
+        self.por_codigo = Counter()
+        # Código -> (documento -> cantidad de fragmentos)
+        self.por_codigo_documento = {}
+        # Código -> cantidad de caracteres codificados (suma de las longitudes de sus fragmentos)
+        self.caracteres_por_codigo = Counter()
+
+    # --- ACTUALIZACIÓN INCREMENTAL ---
+    def registrar(self, anotacion):
+        self.por_codigo[anotacion.codigo] += 1
+        self.por_codigo_documento.setdefault(anotacion.codigo, Counter())[anotacion.documento] += 1
+        self.caracteres_por_codigo[anotacion.codigo] += anotacion.fin - anotacion.inicio
+
+    def retirar(self, anotacion):
+        _descontar(self.por_codigo, anotacion.codigo)
+        _descontar(self.caracteres_por_codigo, anotacion.codigo, anotacion.fin - anotacion.inicio)
+        documentos = self.por_codigo_documento.get(anotacion.codigo)
+        if documentos is not None:
+            _descontar(documentos, anotacion.documento)
+            if not documentos:
+                del self.por_codigo_documento[anotacion.codigo]
+
+    # --- CONSULTAS: O(1) POR CÓDIGO ---
+    def fragmentos(self, codigo):
+        return self.por_codigo.get(codigo, 0)
+
+    def caracteres(self, codigo):
+        return self.caracteres_por_codigo.get(codigo, 0)
+
+    def codigos(self):
+        return list(self.por_codigo)
+
+    # --- EXPORTACIÓN: UNA FILA POR CÓDIGO Y OTRA POR CADA PAR CÓDIGO-DOCUMENTO ---
+    # 'grupos' es una lista de (nombre, color, identificadores): los totales de un código visible
+    # suman los de todos los códigos anexados a él
+    def exportar_csv(self, ruta, grupos):
+        with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["codigo", "color", "documento", "fragmentos", "documentos", "caracteres"])
+            for nombre, color, miembros in sorted(grupos, key=lambda grupo: str(grupo[0])):
+                por_documento = Counter()
+                for miembro in miembros:
+                    por_documento.update(self.por_codigo_documento.get(miembro, {}))
+                escritor.writerow([nombre, color or "", "", sum(por_documento.values()), len(por_documento),
+                                   sum(self.caracteres(miembro) for miembro in miembros)])
+                for documento, cantidad in sorted(por_documento.items()):
+                    escritor.writerow([nombre, "", documento, cantidad, "", ""])
+
+
+def _descontar(contador, clave, cantidad=1):
+    # Se resta y se elimina la clave al llegar a cero para que los totales no acumulen códigos vacíos
+    restante = contador.get(clave, 0) - cantidad
+    if restante > 0:
+        contador[clave] = restante
+    else:
+        contador.pop(clave, None)
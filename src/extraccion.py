@@ -0,0 +1,187 @@
+# --- MÓDULO DE EXTRACCIÓN DE TEXTO DE DOCUMENTOS (.txt, .docx, .pdf) ---
+# Este módulo no depende de Tkinter para que pueda importarse desde los procesos
+# de trabajo (ProcessPoolExecutor) sin arrastrar la interfaz gráfica.
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import docx
+import fitz  # Se importa PyMuPDF para manejo de archivos PDF
+from segmentacion import segmentar_con_motor
+
+# Extensiones de archivo que la aplicación puede importar
+EXTENSIONES_COMPATIBLES = ('.txt', '.docx', '.pdf')
+
+# Número mínimo de páginas a partir del cual conviene repartir la extracción entre procesos
+UMBRAL_PAGINAS_PARALELO = 48
+# Número de páginas que procesa cada tarea enviada al grupo de procesos
+PAGINAS_POR_LOTE = 24
+
+
+# --- FUNCIÓN DE TRABAJO PARA EXTRAER UN LOTE DE PÁGINAS (SE EJECUTA EN OTRO PROCESO) ---
+def _extraer_lote_pdf(ruta_archivo, inicio, fin):
+    # Cada proceso abre su propia copia del documento, ya que los objetos de PyMuPDF no se pueden compartir
+    with fitz.open(ruta_archivo) as pdf_doc:
+        return [pdf_doc[num_pagina].get_text() for num_pagina in range(inicio, fin)]
+
+
+# --- GENERADOR DE PÁGINAS DE UN PDF EN ORDEN ---
+def iterar_paginas_pdf(ruta_archivo, procesos=None, progreso=None):
+    # Se obtiene el número de páginas abriendo el documento solo para consultarlo
+    with fitz.open(ruta_archivo) as pdf_doc:
+        total_paginas = pdf_doc.page_count
+
+        # Para documentos cortos (o si se pide un solo proceso) se extrae en el mismo proceso
+        if total_paginas < UMBRAL_PAGINAS_PARALELO or procesos == 1:
+            for num_pagina in range(total_paginas):
+                yield pdf_doc[num_pagina].get_text()
+                if progreso:
+                    progreso(num_pagina + 1, total_paginas)
+            return
+
+    # Se divide el documento en lotes de páginas consecutivas
+    lotes = [(inicio, min(inicio + PAGINAS_POR_LOTE, total_paginas))
+             for inicio in range(0, total_paginas, PAGINAS_POR_LOTE)]
+    max_procesos = min(procesos or os.cpu_count() or 1, len(lotes))
+
+    # Se reparten los lotes en el grupo de procesos; 'map' entrega los resultados en orden de página
+    # conforme van terminando, por lo que las páginas se transmiten sin esperar al documento completo
+    with ProcessPoolExecutor(max_workers=max_procesos) as grupo:
+        resultados = grupo.map(_extraer_lote_pdf,
+                               [ruta_archivo] * len(lotes),
+                               [inicio for inicio, _ in lotes],
+                               [fin for _, fin in lotes])
+        paginas_listas = 0
+        for paginas in resultados:
+            for texto_pagina in paginas:
+                yield texto_pagina
+            paginas_listas += len(paginas)
+            if progreso:
+                progreso(paginas_listas, total_paginas)
+
+
+# --- FUNCIÓN PARA EXTRAER EL TEXTO COMPLETO DE UN PDF ---
+def extraer_texto_pdf(ruta_archivo, procesos=None, progreso=None):
+    # Se unen todas las páginas en una sola operación para evitar la concatenación repetida de cadenas
+    return ''.join(iterar_paginas_pdf(ruta_archivo, procesos=procesos, progreso=progreso))
+
+
+# --- FUNCIÓN GLOBAL PARA CARGAR CONTENIDO DE ARCHIVOS ---
+def cargar_contenido(ruta_archivo, progreso=None, procesos=None):
+    # Se verifica si la extensión del archivo corresponde a un archivo de texto plano (.txt)
+    if ruta_archivo.lower().endswith('.txt'):
+        # Se abre el archivo en modo lectura utilizando la codificación UTF-8
+        with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
+            # Se lee todo el contenido del archivo y se almacena en la variable 'contenido'
+            contenido = archivo.read()
+    # Se verifica si la extensión del archivo corresponde a un documento de Word (.docx)
+    elif ruta_archivo.lower().endswith('.docx'):
+        # Se utiliza la librería docx para crear un objeto Document con el archivo especificado
+        doc = docx.Document(ruta_archivo)
+        # Se unen los textos de todos los párrafos del documento separándolos con saltos de línea
+        contenido = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+    # Se verifica si la extensión del archivo corresponde a un documento PDF (.pdf)
+    elif ruta_archivo.lower().endswith('.pdf'):
+        # Se extraen las páginas (en paralelo si el documento es extenso) informando el avance
+        contenido = extraer_texto_pdf(ruta_archivo, procesos=procesos, progreso=progreso)
+    else:
+        # Se lanza una excepción de tipo ValueError si el formato del archivo no es compatible
+        raise ValueError(
+            "Formato de archivo no compatible. Utilice archivos .txt, .docx o .pdf.")
+    # Se retorna el contenido extraído del archivo procesado
+    return contenido
+
+
+# --- FUNCIÓN DE TRABAJO PARA IMPORTAR UN DOCUMENTO COMPLETO (SE EJECUTA EN OTRO PROCESO) ---
+def procesar_documento(ruta_archivo, motor=None, contenido=None):
+    # Se extrae el texto en el mismo proceso de trabajo (un proceso por documento, sin grupos anidados),
+    # salvo que el texto ya venga de la caché y solo falte segmentarlo con el motor indicado
+    if contenido is None:
+        contenido = cargar_contenido(ruta_archivo, procesos=1)
+    # Se calculan los límites de las oraciones dentro del mismo proceso: (contenido, límites, motor usado)
+    return (contenido,) + segmentar_con_motor(contenido, motor)
+
+
+# --- FUNCIÓN PARA CARGAR Y SEGMENTAR UN DOCUMENTO CONSULTANDO LA CACHÉ ---
+def cargar_documento(ruta_archivo, cache=None, progreso=None, motor=None):
+    # Si el documento no ha cambiado desde la última extracción, se evita volver a procesarlo
+    contenido = limites = None
+    if cache is not None:
+        resultado = cache.obtener(ruta_archivo, motor)
+        if resultado is not None:
+            contenido, limites = resultado
+            if limites is not None:
+                return contenido, limites
+    if contenido is None:
+        contenido = cargar_contenido(ruta_archivo, progreso=progreso)
+    # Se segmenta el texto (también cuando la caché solo tenía el texto, pero no los límites de este motor)
+    # Los límites se guardan con el motor que realmente se usó (por ejemplo, por puntos si NLTK no está
+    # disponible), para que la próxima importación vuelva a intentar con el motor solicitado
+    limites, motor_usado = segmentar_con_motor(contenido, motor)
+    if cache is not None:
+        cache.guardar(ruta_archivo, contenido, limites, motor_usado)
+    return contenido, limites
+
+
+# --- FUNCIÓN PARA LISTAR LOS DOCUMENTOS IMPORTABLES DE UNA CARPETA ---
+def listar_documentos(carpeta):
+    # Se devuelven en orden alfabético las rutas de los archivos con extensión compatible
+    return [os.path.join(carpeta, nombre) for nombre in sorted(os.listdir(carpeta))
+            if nombre.lower().endswith(EXTENSIONES_COMPATIBLES)
+            and os.path.isfile(os.path.join(carpeta, nombre))]
+
+
+# --- FUNCIÓN PARA IMPORTAR VARIOS DOCUMENTOS EN PARALELO (API SIN INTERFAZ) ---
+def importar_documentos(rutas, registrar, procesos=None, progreso=None, cache=None, motor=None):
+    """
+    Extrae y segmenta los documentos de 'rutas' en un grupo de procesos.
+    Por cada documento terminado se llama a registrar(ruta, contenido, limites)
+    en el proceso que invoca la función, en el orden en que van terminando.
+    Los documentos presentes en 'cache' se registran sin enviarse al grupo.
+    Retorna la lista de fallos como tuplas (ruta, mensaje de error).
+    """
+    fallos = []
+    terminados = 0
+
+    # Se registran primero los documentos que ya están en la caché y se separan los pendientes
+    # (los que solo tienen el texto en caché se envían con él para segmentarlos sin volver a extraerlos)
+    pendientes = []
+    for ruta in rutas:
+        resultado = cache.obtener(ruta, motor) if cache is not None else None
+        if resultado is None or resultado[1] is None:
+            pendientes.append((ruta, resultado[0] if resultado else None))
+            continue
+        terminados += 1
+        try:
+            registrar(ruta, *resultado)
+        except Exception as e:
+            fallos.append((ruta, str(e)))
+        if progreso:
+            progreso(terminados, len(rutas))
+
+    if not pendientes:
+        return fallos
+
+    max_procesos = min(procesos or os.cpu_count() or 1, len(pendientes))
+    with ProcessPoolExecutor(max_workers=max_procesos) as grupo:
+        # Se envía cada documento como una tarea independiente
+        tareas = {grupo.submit(procesar_documento, ruta, motor, contenido): ruta
+                  for ruta, contenido in pendientes}
+        for tarea in as_completed(tareas):
+            ruta = tareas[tarea]
+            terminados += 1
+            try:
+                contenido, limites, motor_usado = tarea.result()
+                if cache is not None:
+                    cache.guardar(ruta, contenido, limites, motor_usado)
+                registrar(ruta, contenido, limites)
+            except Exception as e:
+                # Se acumula el error para mostrar un único resumen al final
+                fallos.append((ruta, str(e)))
+            if progreso:
+                progreso(terminados, len(rutas))
+    return fallos
+
+
+# --- FUNCIÓN PARA IMPORTAR TODOS LOS DOCUMENTOS DE UNA CARPETA ---
+def importar_carpeta(carpeta, registrar, procesos=None, progreso=None, cache=None, motor=None):
+    return importar_documentos(listar_documentos(carpeta), registrar,
+                               procesos=procesos, progreso=progreso, cache=cache, motor=motor)
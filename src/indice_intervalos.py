@@ -0,0 +1,168 @@
+# --- MÓDULO DEL ÍNDICE DE INTERVALOS PARA LOS FRAGMENTOS CODIFICADOS ---
+# Árbol de intervalos dinámico: un treap (árbol binario de búsqueda con prioridades aleatorias)
+# ordenado por el inicio de cada intervalo, en el que cada nodo guarda además el mayor 'fin' de su
+# subárbol. Con ese dato se descartan ramas completas, de modo que las consultas de superposición
+# cuestan O(log n + k) en promedio, siendo k el número de resultados.
+import random
+
+
+# --- CLASE DE UN NODO DEL ÁRBOL ---
+class _Nodo:
+    __slots__ = ("clave", "inicio", "fin", "valor", "prioridad", "izquierdo", "derecho", "max_fin")
+
+    def __init__(self, clave, inicio, fin, valor, prioridad):
+        self.clave = clave
+        self.inicio = inicio
+        self.fin = fin
+        self.valor = valor
+        self.prioridad = prioridad
+        self.izquierdo = None
+        self.derecho = None
+        self.max_fin = fin
+
+
+def _actualizar(nodo):
+    max_fin = nodo.fin
+    if nodo.izquierdo is not None and nodo.izquierdo.max_fin > max_fin:
+        max_fin = nodo.izquierdo.max_fin
+    if nodo.derecho is not None and nodo.derecho.max_fin > max_fin:
+        max_fin = nodo.derecho.max_fin
+    nodo.max_fin = max_fin
+
+
+def _dividir(nodo, clave):
+    # Retorna (nodos con clave < 'clave', nodos con clave >= 'clave')
+    if nodo is None:
+        return None, None
+    if nodo.clave < clave:
+        menores, mayores = _dividir(nodo.derecho, clave)
+        nodo.derecho = menores
+        _actualizar(nodo)
+        return nodo, mayores
+    menores, mayores = _dividir(nodo.izquierdo, clave)
+    nodo.izquierdo = mayores
+    _actualizar(nodo)
+    return menores, nodo
+
+
+def _unir(menores, mayores):
+    # Todas las claves de 'menores' deben ser menores que las de 'mayores'
+    if menores is None:
+        return mayores
+    if mayores is None:
+        return menores
+    if menores.prioridad > mayores.prioridad:
+        menores.derecho = _unir(menores.derecho, mayores)
+        _actualizar(menores)
+        return menores
+    mayores.izquierdo = _unir(menores, mayores.izquierdo)
+    _actualizar(mayores)
+    return mayores
+
+
+# --- CLASE DEL ÍNDICE DE INTERVALOS ---
+class IndiceIntervalos:
+    def __init__(self, semilla=None):
+        self._raiz = None
+        # Valor -> clave (inicio, fin, secuencia) con la que se insertó, para poder eliminarlo
+        self._claves = {}
+        self._secuencia = 0
+        self._aleatorio = random.Random(semilla)
+
+    @classmethod
+    def desde_intervalos(cls, intervalos, semilla=None):
+        # Construcción en bloque a partir de (inicio, fin, valor): se ordenan una vez y el treap se arma en
+        # O(n) con una pila (árbol cartesiano por prioridad), sin dividir ni unir en cada inserción
+        indice = cls(semilla)
+        raiz_pila = []
+        for inicio, fin, valor in sorted(intervalos, key=lambda intervalo: (intervalo[0], intervalo[1])):
+            if valor in indice._claves:
+                continue
+            clave = (inicio, fin, indice._secuencia)
+            indice._secuencia += 1
+            indice._claves[valor] = clave
+            nodo = _Nodo(clave, inicio, fin, valor, indice._aleatorio.random())
+            ultimo = None
+            while raiz_pila and raiz_pila[-1].prioridad < nodo.prioridad:
+                ultimo = raiz_pila.pop()
+            nodo.izquierdo = ultimo
+            if raiz_pila:
+                raiz_pila[-1].derecho = nodo
+            raiz_pila.append(nodo)
+        if raiz_pila:
+            indice._raiz = raiz_pila[0]
+            # Se calcula el mayor 'fin' de cada subárbol en postorden
+            pendientes = [(indice._raiz, False)]
+            while pendientes:
+                nodo, hijos_listos = pendientes.pop()
+                if hijos_listos:
+                    _actualizar(nodo)
+                    continue
+                pendientes.append((nodo, True))
+                for hijo in (nodo.izquierdo, nodo.derecho):
+                    if hijo is not None:
+                        pendientes.append((hijo, False))
+        return indice
+
+    def __len__(self):
+        return len(self._claves)
+
+    def __contains__(self, valor):
+        return valor in self._claves
+
+    # --- ALTAS Y BAJAS: O(log n) EN PROMEDIO ---
+    def insertar(self, inicio, fin, valor):
+        if valor in self._claves:
+            self.eliminar(valor)
+        clave = (inicio, fin, self._secuencia)
+        self._secuencia += 1
+        self._claves[valor] = clave
+        nodo = _Nodo(clave, inicio, fin, valor, self._aleatorio.random())
+        menores, mayores = _dividir(self._raiz, clave)
+        self._raiz = _unir(_unir(menores, nodo), mayores)
+
+    def eliminar(self, valor):
+        clave = self._claves.pop(valor, None)
+        if clave is None:
+            return False
+        menores, resto = _dividir(self._raiz, clave)
+        _, mayores = _dividir(resto, (clave[0], clave[1], clave[2] + 1))
+        self._raiz = _unir(menores, mayores)
+        return True
+
+    # --- CONSULTAS ---
+    def que_se_superponen(self, inicio, fin):
+        # Valores cuyos intervalos [a, b) comparten al menos un carácter con [inicio, fin)
+        resultado = []
+        pendientes = [self._raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            # Si ningún intervalo del subárbol termina después de 'inicio', se descarta completo
+            if nodo is None or nodo.max_fin <= inicio:
+                continue
+            pendientes.append(nodo.izquierdo)
+            # Los nodos a la derecha comienzan en o después de este: si este comienza en 'fin', ninguno sirve
+            if nodo.inicio < fin:
+                if nodo.fin > inicio:
+                    resultado.append(nodo.valor)
+                pendientes.append(nodo.derecho)
+        return resultado
+
+    def hay_en(self, posicion):
+        # Indica si algún intervalo contiene la posición; se detiene en el primero que la contiene
+        pendientes = [self._raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo is None or nodo.max_fin <= posicion:
+                continue
+            if nodo.inicio <= posicion:
+                if nodo.fin > posicion:
+                    return True
+                pendientes.append(nodo.derecho)
+            pendientes.append(nodo.izquierdo)
+        return False
+
+    def contenidos_en(self, inicio, fin):
+        # Valores cuyos intervalos están completamente dentro de [inicio, fin)
+        return [valor for valor in self.que_se_superponen(inicio, fin)
+                if self._claves[valor][0] >= inicio and self._claves[valor][1] <= fin]
@@ -0,0 +1,197 @@
+# --- MÓDULO DEL LIBRO DE CÓDIGOS ---
+# Cada código tiene un identificador numérico estable; las anotaciones guardan ese identificador y
+# no el nombre. Anexar un código a otro no reescribe ninguna anotación: se registra un alias en una
+# estructura de conjuntos disjuntos (union-find) y todas las consultas resuelven el código visible
+# del grupo. La unión es por tamaño y sin compresión de caminos, por lo que cada anexión queda
+# registrada en una pila y puede deshacerse restaurando exactamente el estado anterior.
+
+
+# --- CLASE DE UN CÓDIGO ---
+class Codigo:
+    __slots__ = ("id", "nombre", "color")
+
+    def __init__(self, id, nombre, color):
+        self.id = id
+        self.nombre = nombre
+        self.color = color
+
+    def __repr__(self):
+        return f"Codigo({self.id}, {self.nombre!r}, {self.color!r})"
+
+
+# --- CLASE DE UNA ANEXIÓN (SUFICIENTE PARA DESHACERLA) ---
+class Fusion:
+    __slots__ = ("origen", "destino", "raiz_hija", "raiz_padre", "representante_anterior")
+
+    def __init__(self, origen, destino, raiz_hija, raiz_padre, representante_anterior):
+        # Códigos visibles que se anexaron (origen) y que se conservan (destino)
+        self.origen = origen
+        self.destino = destino
+        # Raíces internas del union-find: 'raiz_hija' quedó colgando de 'raiz_padre'
+        self.raiz_hija = raiz_hija
+        self.raiz_padre = raiz_padre
+        # Código visible que tenía el grupo de 'raiz_padre' antes de la anexión
+        self.representante_anterior = representante_anterior
+
+
+# --- CLASE DEL LIBRO DE CÓDIGOS ---
+class LibroCodigos:
+    def __init__(self):
+        # Identificador -> Codigo
+        self.por_id = {}
+        # Nombre -> identificador (los nombres de los códigos anexados siguen siendo alias válidos)
+        self.por_nombre = {}
+        # Union-find: identificador -> padre (solo para los que no son raíz), tamaño y subgrupos por raíz
+        self._padre = {}
+        self._tamano = {}
+        self._hijos = {}
+        # Raíz -> código visible del grupo (el destino de la última anexión)
+        self._representante = {}
+        # Pila de anexiones, en orden, para deshacerlas
+        self.fusiones = []
+        self._siguiente = 1
+        # Se incrementa en cada alta, baja, anexión o deshacer (permite saber si hay que volver a guardarlo)
+        self.version = 0
+
+    def __len__(self):
+        return len(self.por_id)
+
+    # --- ALTAS Y BAJAS ---
+    def crear(self, nombre, color, id=None):
+        if id is None:
+            id = self._siguiente
+        self._siguiente = max(self._siguiente, id + 1)
+        self.por_id[id] = Codigo(id, nombre, color)
+        self.por_nombre.setdefault(nombre, id)
+        self.version += 1
+        return id
+
+    def eliminar(self, codigo):
+        # Se retira el grupo completo de 'codigo' (el código visible y sus anexados): sus anexiones salen
+        # de la pila y sus nombres dejan de resolverse, de modo que un código nuevo con el mismo nombre
+        # recibe otro identificador. Las anexiones de otros grupos no comparten raíces con estas, por lo
+        # que se pueden seguir deshaciendo. Retorna los identificadores retirados
+        miembros = set(self.miembros(codigo))
+        self.fusiones = [fusion for fusion in self.fusiones if fusion.raiz_hija not in miembros]
+        nombres = set()
+        for miembro in miembros:
+            self._padre.pop(miembro, None)
+            self._tamano.pop(miembro, None)
+            self._hijos.pop(miembro, None)
+            self._representante.pop(miembro, None)
+            entrada = self.por_id.pop(miembro, None)
+            if entrada is not None and self.por_nombre.get(entrada.nombre) == miembro:
+                del self.por_nombre[entrada.nombre]
+                nombres.add(entrada.nombre)
+        # Si otro código conserva alguno de esos nombres, el nombre vuelve a apuntar a él
+        for entrada in self.por_id.values():
+            if entrada.nombre in nombres:
+                self.por_nombre.setdefault(entrada.nombre, entrada.id)
+        self.version += 1
+        return sorted(miembros)
+
+    def obtener_o_crear(self, nombre, color):
+        id = self.por_nombre.get(nombre)
+        return id if id is not None else self.crear(nombre, color)
+
+    def cambiar_color(self, codigo, color):
+        # El color del código es el de su última codificación (es el que muestra la lista de códigos)
+        entrada = self.por_id.get(codigo)
+        if entrada is not None and color and entrada.color != color:
+            entrada.color = color
+            self.version += 1
+
+    def id_de(self, nombre):
+        return self.por_nombre.get(nombre)
+
+    # --- RESOLUCIÓN DE ALIAS: O(log n) POR LA UNIÓN POR TAMAÑO ---
+    def _raiz(self, codigo):
+        while codigo in self._padre:
+            codigo = self._padre[codigo]
+        return codigo
+
+    def resolver(self, codigo):
+        # Código visible del grupo al que pertenece 'codigo' (él mismo si nunca se anexó)
+        raiz = self._raiz(codigo)
+        return self._representante.get(raiz, raiz)
+
+    def nombre(self, codigo):
+        entrada = self.por_id.get(self.resolver(codigo))
+        return entrada.nombre if entrada is not None else codigo
+
+    def color(self, codigo):
+        entrada = self.por_id.get(self.resolver(codigo))
+        return entrada.color if entrada is not None else None
+
+    def color_visible(self, codigo, color):
+        # Los fragmentos de un código anexado se dibujan con el color del código que lo absorbió;
+        # los del propio código visible conservan el color con el que se codificaron
+        visible = self.resolver(codigo)
+        if visible == codigo:
+            return color
+        return self.color(visible) or color
+
+    def miembros(self, codigo):
+        # Todos los identificadores del grupo de 'codigo', incluido el visible
+        pendientes = [self._raiz(codigo)]
+        miembros = []
+        while pendientes:
+            actual = pendientes.pop()
+            miembros.append(actual)
+            pendientes.extend(self._hijos.get(actual, ()))
+        return miembros
+
+    # --- ANEXIÓN Y DESHACER ---
+    def fusionar(self, origen, destino):
+        # Anexa el grupo de 'origen' al de 'destino'; retorna la anexión o None si ya estaban juntos
+        raiz_origen, raiz_destino = self._raiz(origen), self._raiz(destino)
+        if raiz_origen == raiz_destino:
+            return None
+        visible_origen = self._representante.get(raiz_origen, raiz_origen)
+        visible_destino = self._representante.get(raiz_destino, raiz_destino)
+        # Se cuelga el grupo más pequeño del más grande; el código visible resultante es el destino
+        if self._tamano.get(raiz_origen, 1) > self._tamano.get(raiz_destino, 1):
+            raiz_hija, raiz_padre = raiz_destino, raiz_origen
+        else:
+            raiz_hija, raiz_padre = raiz_origen, raiz_destino
+        fusion = Fusion(visible_origen, visible_destino, raiz_hija, raiz_padre,
+                        self._representante.get(raiz_padre))
+        self._padre[raiz_hija] = raiz_padre
+        self._tamano[raiz_padre] = self._tamano.get(raiz_padre, 1) + self._tamano.get(raiz_hija, 1)
+        self._hijos.setdefault(raiz_padre, []).append(raiz_hija)
+        self._representante[raiz_padre] = visible_destino
+        self.fusiones.append(fusion)
+        self.version += 1
+        return fusion
+
+    def deshacer(self):
+        # Revierte la última anexión; retorna la anexión deshecha o None si no hay ninguna
+        if not self.fusiones:
+            return None
+        fusion = self.fusiones.pop()
+        del self._padre[fusion.raiz_hija]
+        self._tamano[fusion.raiz_padre] -= self._tamano.get(fusion.raiz_hija, 1)
+        self._hijos[fusion.raiz_padre].pop()
+        if not self._hijos[fusion.raiz_padre]:
+            del self._hijos[fusion.raiz_padre]
+        if fusion.representante_anterior is None:
+            self._representante.pop(fusion.raiz_padre, None)
+        else:
+            self._representante[fusion.raiz_padre] = fusion.representante_anterior
+        self.version += 1
+        return fusion
+
+    # --- PERSISTENCIA: CÓDIGOS Y ANEXIONES EN ORDEN (SE REPRODUCEN AL CARGAR) ---
+    def a_datos(self):
+        return {
+            "codigos": [(c.id, c.nombre, c.color) for c in self.por_id.values()],
+            "fusiones": [(f.origen, f.destino) for f in self.fusiones],
+        }
+
+    def cargar(self, datos):
+        if not datos:
+            return
+        for id, nombre, color in datos.get("codigos", []):
+            self.crear(nombre, color, id)
+        for origen, destino in datos.get("fusiones", []):
+            self.fusionar(origen, destino)
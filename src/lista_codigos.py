@@ -0,0 +1,156 @@
+# --- MÓDULO DE LA LISTA DE CÓDIGOS (PANEL IZQUIERDO) ---
+# Cada código ocupa una línea del widget Text de la lista: el contador, la muestra de color y el
+# nombre se dibujan como texto con tags compartidos (uno por color), sin crear un Label, dos Buttons y
+# un Menu por fila. Tk solo calcula la disposición de las líneas visibles, por lo que el costo de los
+# códigos fuera de la vista es el de una línea de texto. Los clics, el hover y el menú contextual se
+# resuelven con unos pocos manejadores del widget a partir de la línea bajo el ratón, y al cambiar la
+# lista solo se reescriben las filas que cambiaron.
+
+# Tags de las partes de cada fila
+TAG_CONTADOR = "contador"
+TAG_NOMBRE = "nombre"
+TAG_NOMBRE_ACTIVO = "nombre_activo"
+PREFIJO_MUESTRA = "muestra_"
+
+# Separación entre la muestra de color y los textos vecinos
+ESPACIO = "  "
+MUESTRA = "    "
+
+
+# --- CLASE DE LA LISTA DE CÓDIGOS ---
+class ListaCodigos:
+    def __init__(self, widget, al_resaltar, al_recuperar, menu_contextual=None):
+        # Se asigna el widget Text en el que se dibuja la lista
+        self.widget = widget
+        # al_resaltar(tag_name, paso): navegar a la siguiente (paso=1) o anterior (paso=-1) ocurrencia
+        self.al_resaltar = al_resaltar
+        # al_recuperar(tag_name): recuperar las citas del código en el panel derecho
+        self.al_recuperar = al_recuperar
+        # Menú que se abre con clic derecho sobre el nombre; sus comandos leen 'codigo_activo'
+        self.menu_contextual = menu_contextual
+        self.codigo_activo = None
+        # Códigos en el orden de las filas (la fila k ocupa la línea k + 1)
+        self.orden = []
+        # Código -> (tag_name, contador, color) tal como está dibujada la fila
+        self.filas = {}
+        self._muestras = set()
+        self._linea_activa = None
+        self._cursor = ""
+
+        widget.configure(spacing1=6, spacing3=6, padx=4, pady=8)
+        widget.tag_configure(TAG_CONTADOR, font=("Arial", 12, "bold"), foreground="purple")
+        widget.tag_configure(TAG_NOMBRE, font=("arial", 10, "bold"), background="#F0F0F0", relief="raised", borderwidth=2)
+        widget.tag_configure(TAG_NOMBRE_ACTIVO, background="cyan")
+        widget.tag_raise(TAG_NOMBRE_ACTIVO, TAG_NOMBRE)
+
+        # Se reemplaza el bloqueo del clic por el manejador de la lista (que también retorna "break")
+        widget.bind("<Button-1>", self._al_clic)
+        widget.bind("<Shift-Button-1>", lambda event: self._al_clic(event, paso=-1))
+        widget.bind("<Button-3>", self._al_clic_derecho)
+        widget.bind("<Motion>", self._al_mover)
+        widget.bind("<Leave>", self._al_salir)
+
+    # --- SINCRONIZACIÓN CON LOS DATOS: SOLO SE REESCRIBEN LAS FILAS QUE CAMBIARON ---
+    def sincronizar(self, filas):
+        # 'filas' es la lista ordenada de (código, tag_name, contador, color)
+        datos = {codigo: (tag_name, contador, color) for codigo, tag_name, contador, color in filas}
+        nuevos = list(datos)
+        # Los códigos que permanecen deben conservar su orden relativo; si no, se redibuja todo
+        if [c for c in self.orden if c in datos] != [c for c in nuevos if c in self.filas]:
+            self.limpiar()
+
+        # Se borran de abajo hacia arriba las filas de los códigos que ya no existen
+        for posicion in range(len(self.orden) - 1, -1, -1):
+            codigo = self.orden[posicion]
+            if codigo not in datos:
+                self.widget.delete(f"{posicion + 1}.0", f"{posicion + 2}.0")
+                del self.filas[codigo]
+        self._linea_activa = None
+
+        # Se insertan las filas nuevas en su posición y se reescriben las que cambiaron
+        for posicion, codigo in enumerate(nuevos):
+            linea = posicion + 1
+            anterior = self.filas.get(codigo)
+            if anterior == datos[codigo]:
+                continue
+            if anterior is not None:
+                self.widget.delete(f"{linea}.0", f"{linea + 1}.0")
+            self.filas[codigo] = datos[codigo]
+            self._escribir_fila(linea, codigo)
+        self.orden = nuevos
+
+    def limpiar(self):
+        self.widget.delete("1.0", "end")
+        self.orden = []
+        self.filas = {}
+        self._linea_activa = None
+
+    def _escribir_fila(self, linea, codigo):
+        # Una sola inserción por fila: pares (texto, tags) para el contador, la muestra y el nombre
+        _, contador, color = self.filas[codigo]
+        self.widget.insert(f"{linea}.0",
+                           f"[{contador}]", TAG_CONTADOR, ESPACIO, (),
+                           MUESTRA, self._tag_muestra(color), ESPACIO, (),
+                           f" {codigo} ", TAG_NOMBRE, "\n", ())
+
+    def _tag_muestra(self, color):
+        # Un tag de muestra por color, compartido por todos los códigos de ese color
+        tag = f"{PREFIJO_MUESTRA}{color}"
+        if tag not in self._muestras:
+            self._muestras.add(tag)
+            self.widget.tag_configure(tag, background=color, relief="groove", borderwidth=2)
+        return tag
+
+    # --- RESOLUCIÓN DE LA FILA Y LA PARTE BAJO EL RATÓN ---
+    def _bajo_raton(self, event):
+        indice = self.widget.index(f"@{event.x},{event.y}")
+        linea = int(indice.split('.')[0])
+        if not 1 <= linea <= len(self.orden):
+            return None, None, None
+        parte = None
+        for tag in self.widget.tag_names(indice):
+            if tag == TAG_NOMBRE:
+                parte = TAG_NOMBRE
+            elif tag.startswith(PREFIJO_MUESTRA):
+                parte = PREFIJO_MUESTRA
+        return linea, self.orden[linea - 1], parte
+
+    def _al_clic(self, event, paso=1):
+        linea, codigo, parte = self._bajo_raton(event)
+        if parte == PREFIJO_MUESTRA:
+            self.al_resaltar(self.filas[codigo][0], paso)
+        elif parte == TAG_NOMBRE and paso == 1:
+            self.al_recuperar(self.filas[codigo][0])
+        return "break"
+
+    def _al_clic_derecho(self, event):
+        linea, codigo, parte = self._bajo_raton(event)
+        if parte == TAG_NOMBRE and self.menu_contextual is not None:
+            self.codigo_activo = codigo
+            self.menu_contextual.post(event.x_root, event.y_root)
+        return "break"
+
+    # --- HOVER: CURSOR DE MANO Y NOMBRE RESALTADO, SOLO CUANDO CAMBIAN ---
+    def _al_mover(self, event):
+        linea, codigo, parte = self._bajo_raton(event)
+        self._cambiar_cursor("hand2" if parte else "")
+        self._resaltar_nombre(linea if parte == TAG_NOMBRE else None)
+
+    def _al_salir(self, event):
+        self._cambiar_cursor("")
+        self._resaltar_nombre(None)
+
+    def _cambiar_cursor(self, cursor):
+        if cursor != self._cursor:
+            self._cursor = cursor
+            self.widget.config(cursor=cursor)
+
+    def _resaltar_nombre(self, linea):
+        if linea == self._linea_activa:
+            return
+        self.widget.tag_remove(TAG_NOMBRE_ACTIVO, "1.0", "end")
+        self._linea_activa = linea
+        if linea is not None:
+            rango = self.widget.tag_nextrange(TAG_NOMBRE, f"{linea}.0", f"{linea}.end")
+            if rango:
+                self.widget.tag_add(TAG_NOMBRE_ACTIVO, *rango)
@@ -0,0 +1,485 @@
+# --- MÓDULO DEL PROYECTO EN SQLITE ---
+# El estado del proyecto se guarda en una base SQLite en modo WAL en lugar de un pickle escrito una
+# sola vez al salir. El texto y los límites de oraciones de cada documento se escriben una vez al
+# importarlo, y cada acción de codificación se guarda como una transacción pequeña con solo los
+# fragmentos que cambiaron, por lo que un cierre inesperado pierde como máximo la última acción.
+# 'cargar' retorna el manifiesto del proyecto con la misma forma que tenía el pickle, pero sin el
+# texto de los documentos, que se lee con 'cargar_documento' al abrir cada uno; 'importar' migra un
+# proyecto existente (.pkl) a la base.
+# El resto del estado de la interfaz (asignaciones y citas) no se reescribe en cada acción: sus
+# cambios se agregan como operaciones a un diario, que al cargar se reproduce sobre el último estado
+# guardado y que se compacta en ese estado cuando crece. Las transacciones no esperan al disco: la
+# sincronización (fsync) del registro WAL, su traslado a la base y la compactación del diario durante
+# la sesión se hacen por lotes en un hilo aparte.
+# El texto de los documentos se guarda comprimido y una sola vez por contenido: los documentos apuntan
+# al hash de su texto, de modo que una misma entrevista importada con otro nombre no ocupa más espacio.
+import hashlib
+import lzma
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from itertools import groupby
+from operator import itemgetter
+
+# Versión del esquema de la base; se guarda en 'PRAGMA user_version'
+VERSION_ESQUEMA = 3
+# Operaciones en el diario a partir de las cuales conviene compactarlo en el estado
+LIMITE_DIARIO = 500
+# Tamaño del registro WAL a partir del cual se traslada a la base (en segundo plano)
+LIMITE_WAL_BYTES = 4 * 1024 * 1024
+# Compresión de los textos nuevos: "zlib" (descompresión más rápida), "lzma" (archivos más pequeños)
+# o "ninguna". Cada texto guarda el método con el que se comprimió
+COMPRESION_POR_DEFECTO = "zlib"
+
+COMPRESORES = {
+    "ninguna": (lambda datos: datos, lambda datos: datos),
+    "zlib": (lambda datos: zlib.compress(datos, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+ESQUEMA_TEXTOS = """
+-- Textos de los documentos, una vez por contenido: hash SHA-256 del texto en UTF-8 -> texto comprimido
+CREATE TABLE IF NOT EXISTS textos (
+    hash       TEXT PRIMARY KEY,
+    compresion TEXT NOT NULL,
+    bytes      INTEGER NOT NULL,
+    datos      BLOB NOT NULL
+);
+"""
+
+ESQUEMA = ESQUEMA_TEXTOS + """
+CREATE TABLE IF NOT EXISTS documentos (
+    nombre TEXT PRIMARY KEY,
+    texto  TEXT NOT NULL REFERENCES textos(hash),
+    orden  INTEGER NOT NULL
+);
+-- Límites de las oraciones de cada documento: arreglo 'I' de pares (inicio, fin) en caracteres
+CREATE TABLE IF NOT EXISTS oraciones (
+    documento TEXT PRIMARY KEY REFERENCES documentos(nombre) ON DELETE CASCADE,
+    limites   BLOB
+);
+CREATE TABLE IF NOT EXISTS codigos (
+    id     INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    color  TEXT
+);
+-- Anexiones del libro de códigos en el orden en que se hicieron (se reproducen al cargar)
+CREATE TABLE IF NOT EXISTS fusiones (
+    orden   INTEGER PRIMARY KEY,
+    origen  INTEGER NOT NULL,
+    destino INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS anotaciones (
+    id        TEXT PRIMARY KEY,
+    documento TEXT NOT NULL,
+    codigo    INTEGER NOT NULL,
+    color     TEXT,
+    inicio    INTEGER NOT NULL,
+    fin       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS anotaciones_documento ON anotaciones(documento);
+-- Resto del estado de la interfaz (historial, citas, navegación...): clave -> valor serializado
+CREATE TABLE IF NOT EXISTS estado (
+    clave TEXT PRIMARY KEY,
+    valor BLOB
+);
+-- Operaciones sobre el estado posteriores a su última escritura, en orden: (operación, argumentos)
+CREATE TABLE IF NOT EXISTS diario (
+    secuencia INTEGER PRIMARY KEY,
+    operacion TEXT NOT NULL,
+    argumentos BLOB
+);
+"""
+
+
+def _limites_a_blob(limites):
+    if limites is None:
+        return None
+    return array('I', limites).tobytes()
+
+
+def _blob_a_limites(blob):
+    if blob is None:
+        return None
+    limites = array('I')
+    limites.frombytes(blob)
+    return limites
+
+
+def _hash_texto(contenido):
+    # Los textos se identifican por el hash SHA-256 de su contenido en UTF-8
+    return hashlib.sha256((contenido or "").encode("utf-8")).hexdigest()
+
+
+# --- CLASE DEL PROYECTO ---
+class ProyectoSQLite:
+    def __init__(self, ruta, limite_wal=LIMITE_WAL_BYTES, compresion=COMPRESION_POR_DEFECTO):
+        self.ruta = ruta
+        self.limite_wal = limite_wal
+        self.compresion = compresion
+        # Costo de lectura de los textos: cantidad descomprimida y segundos empleados
+        self.textos_leidos = 0
+        self.tiempo_lectura = 0.0
+        self.conexion = sqlite3.connect(ruta)
+        # WAL: las escrituras se agregan al registro y los lectores no se bloquean; con 'synchronous=NORMAL'
+        # una transacción confirmada sobrevive al cierre del programa y la base nunca queda inconsistente
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.execute("PRAGMA foreign_keys=ON")
+        # El traslado del WAL a la base no se hace al confirmar (en el hilo de la interfaz) sino en
+        # 'mantener'; al vaciarse, el archivo WAL se recorta a este tamaño
+        self.conexion.execute("PRAGMA wal_autocheckpoint=0")
+        self.conexion.execute(f"PRAGMA journal_size_limit={limite_wal}")
+        self._migrar_esquema()
+        self.conexion.executescript(ESQUEMA)
+        self.conexion.execute(f"PRAGMA user_version={VERSION_ESQUEMA}")
+        # Versión del libro de códigos escrita por última vez (se reescribe solo si cambió)
+        self._version_libro = None
+        # Operaciones del diario pendientes de escribir y cantidad de operaciones ya escritas (el contador
+        # también lo actualiza el hilo de mantenimiento, por lo que se modifica con el cerrojo)
+        self._operaciones = []
+        self._cerrojo = threading.Lock()
+        # Claves del estado que se escriben directamente con 'guardar_estado' (siempre están al día en la
+        # base): la compactación en segundo plano no las reescribe con su instantánea
+        self._claves_directas = set()
+        self.operaciones_en_diario = self.conexion.execute("SELECT COUNT(*) FROM diario").fetchone()[0]
+        # Hay transacciones confirmadas que todavía no se sincronizaron con el disco
+        self._sin_sincronizar = False
+        self._mantenimiento = None
+
+    def _migrar_esquema(self):
+        # Las bases anteriores a la versión 3 guardan el texto completo en 'documentos.contenido': se pasa
+        # a la tabla de textos y se reconstruye 'documentos' (crear, copiar, borrar y renombrar, con las
+        # claves foráneas desactivadas para no afectar a 'oraciones')
+        columnas = [fila[1] for fila in self.conexion.execute("PRAGMA table_info(documentos)")]
+        if "contenido" not in columnas:
+            return
+        self.conexion.executescript(ESQUEMA_TEXTOS)
+        self.conexion.execute("CREATE TABLE IF NOT EXISTS documentos_nueva (nombre TEXT PRIMARY KEY, "
+                              "texto TEXT NOT NULL REFERENCES textos(hash), orden INTEGER NOT NULL)")
+        self.conexion.execute("PRAGMA foreign_keys=OFF")
+        try:
+            with self.conexion:
+                filas = self.conexion.execute("SELECT nombre, contenido, orden FROM documentos").fetchall()
+                self.conexion.executemany("INSERT INTO documentos_nueva (nombre, texto, orden) VALUES (?, ?, ?)",
+                                          [(nombre, self._guardar_texto(contenido), orden)
+                                           for nombre, contenido, orden in filas])
+                self.conexion.execute("DROP TABLE documentos")
+                self.conexion.execute("ALTER TABLE documentos_nueva RENAME TO documentos")
+        finally:
+            self.conexion.execute("PRAGMA foreign_keys=ON")
+
+    def vacio(self):
+        consulta = "SELECT EXISTS(SELECT 1 FROM documentos) OR EXISTS(SELECT 1 FROM estado)"
+        return not self.conexion.execute(consulta).fetchone()[0]
+
+    # --- CARGA DEL MANIFIESTO: MISMA FORMA QUE LOS DATOS DEL PICKLE, SIN EL TEXTO DE LOS DOCUMENTOS ---
+    def cargar(self):
+        datos = {clave: pickle.loads(valor)
+                 for clave, valor in self.conexion.execute("SELECT clave, valor FROM estado")}
+
+        # Una sola consulta ordenada por documento (con el índice por documento); las filas se agrupan al
+        # leerlas y llegan ya como (id, código, color, inicio, fin)
+        datos["archivos_abiertos"] = {
+            nombre: {"anotaciones": []}
+            for (nombre,) in self.conexion.execute("SELECT nombre FROM documentos ORDER BY orden")}
+        filas = self.conexion.execute(
+            "SELECT documento, id, codigo, color, inicio, fin FROM anotaciones ORDER BY documento, inicio")
+        for documento, grupo in groupby(filas, key=itemgetter(0)):
+            if documento in datos["archivos_abiertos"]:
+                datos["archivos_abiertos"][documento]["anotaciones"] = [fila[1:] for fila in grupo]
+
+        datos["libro_codigos"] = {
+            "codigos": self.conexion.execute("SELECT id, nombre, color FROM codigos").fetchall(),
+            "fusiones": self.conexion.execute("SELECT origen, destino FROM fusiones ORDER BY orden").fetchall(),
+        }
+        # Operaciones que deben reproducirse sobre el estado cargado
+        datos["diario"] = [(operacion, pickle.loads(argumentos)) for operacion, argumentos in
+                           self.conexion.execute("SELECT operacion, argumentos FROM diario ORDER BY secuencia")]
+        return datos
+
+    def cargar_documento(self, nombre):
+        # Texto y límites de oraciones de un documento: (contenido, limites). El texto se descomprime aquí,
+        # al abrir el documento, y se acumula el tiempo empleado
+        inicio = time.perf_counter()
+        fila = self.conexion.execute(
+            "SELECT t.compresion, t.datos, o.limites FROM documentos d JOIN textos t ON t.hash = d.texto "
+            "LEFT JOIN oraciones o ON o.documento = d.nombre WHERE d.nombre = ?", (nombre,)).fetchone()
+        if fila is None:
+            return "", None
+        compresion, datos, limites = fila
+        contenido = COMPRESORES[compresion][1](datos).decode("utf-8")
+        self.textos_leidos += 1
+        self.tiempo_lectura += time.perf_counter() - inicio
+        return contenido, _blob_a_limites(limites)
+
+    def texto_distinto(self, nombre, contenido):
+        # Indica si el documento ya está en la base con otro texto (sin leer ni descomprimir el guardado)
+        fila = self.conexion.execute("SELECT texto FROM documentos WHERE nombre = ?", (nombre,)).fetchone()
+        return fila is not None and fila[0] != _hash_texto(contenido)
+
+    # --- DIARIO DE OPERACIONES SOBRE EL ESTADO ---
+    def anotar(self, operacion, *argumentos):
+        # Se escribe con la siguiente transacción de 'guardar_cambios'
+        self._operaciones.append((operacion, pickle.dumps(argumentos)))
+
+    def debe_compactarse(self):
+        return self.operaciones_en_diario >= LIMITE_DIARIO
+
+    def compactar(self, estado):
+        # Se escribe el estado completo y se descartan las operaciones que ya incluye. Es la compactación
+        # síncrona (al salir); durante la sesión se hace en segundo plano con 'mantener(estado)'. Se espera
+        # al mantenimiento en curso para que una instantánea anterior no reemplace a esta
+        self._esperar_mantenimiento()
+        with self.conexion:
+            self._escribir_estado(estado)
+            self.conexion.execute("DELETE FROM diario")
+        self._operaciones = []
+        with self._cerrojo:
+            self.operaciones_en_diario = 0
+        self._sin_sincronizar = True
+
+    def _compactar_diario(self, estado, hasta):
+        # En el hilo de mantenimiento, con su propia conexión: se serializa la instantánea del estado fuera
+        # de la transacción y se descartan solo las operaciones del diario que ya incluye (secuencia <= hasta);
+        # las que se escriban mientras tanto quedan para reproducirse sobre ella
+        filas = {clave: pickle.dumps(valor) for clave, valor in estado.items()}
+        conexion = sqlite3.connect(self.ruta, isolation_level=None)
+        try:
+            # Con el cerrojo de escritura tomado, una escritura directa posterior espera a esta transacción;
+            # las claves ya marcadas como directas se omiten porque la base tiene un valor más reciente
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                with self._cerrojo:
+                    directas = set(self._claves_directas)
+                conexion.executemany("INSERT OR REPLACE INTO estado (clave, valor) VALUES (?, ?)",
+                                     [(clave, valor) for clave, valor in filas.items() if clave not in directas])
+                conexion.execute("DELETE FROM diario WHERE secuencia <= ?", (hasta,))
+                conexion.execute("COMMIT")
+            except sqlite3.Error:
+                conexion.execute("ROLLBACK")
+                raise
+        finally:
+            conexion.close()
+
+    # --- ESCRITURAS: CADA MÉTODO ES UNA TRANSACCIÓN ---
+    def guardar_documento(self, nombre, contenido, limites):
+        with self.conexion:
+            self._insertar_documento(nombre, contenido, limites)
+        self._sin_sincronizar = True
+
+    def guardar_oraciones(self, nombre, limites, estado=None):
+        # 'estado' (por ejemplo, el motor con el que se segmentó) se escribe en la misma transacción
+        if estado:
+            with self._cerrojo:
+                self._claves_directas.update(estado)
+        with self.conexion:
+            self.conexion.execute("INSERT OR REPLACE INTO oraciones (documento, limites) VALUES (?, ?)",
+                                  (nombre, _limites_a_blob(limites)))
+            if estado:
+                self._escribir_estado(estado)
+        self._sin_sincronizar = True
+
+    def _insertar_documento(self, nombre, contenido, limites):
+        # Un documento que se vuelve a importar con el mismo nombre y otro texto reemplaza al anterior
+        # (conserva su lugar en el orden); si el texto es el mismo no se escribe nada. La interfaz no
+        # reemplaza el texto de un documento con fragmentos codificados (ver 'texto_distinto')
+        anterior = self.conexion.execute("SELECT texto FROM documentos WHERE nombre = ?", (nombre,)).fetchone()
+        hash_texto = self._guardar_texto(contenido)
+        if anterior is None:
+            self.conexion.execute(
+                "INSERT INTO documentos (nombre, texto, orden) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(orden), 0) + 1 FROM documentos))",
+                (nombre, hash_texto))
+        elif anterior[0] != hash_texto:
+            self.conexion.execute("UPDATE documentos SET texto = ? WHERE nombre = ?", (hash_texto, nombre))
+            # Se elimina el texto anterior si ya no lo usa ningún otro documento
+            self.conexion.execute("DELETE FROM textos WHERE hash = ? AND hash NOT IN (SELECT texto FROM documentos)",
+                                  (anterior[0],))
+        else:
+            return
+        self.conexion.execute("INSERT OR REPLACE INTO oraciones (documento, limites) VALUES (?, ?)",
+                              (nombre, _limites_a_blob(limites)))
+
+    def _guardar_texto(self, contenido):
+        # Se guarda el texto solo si su contenido no está ya en la base; retorna su hash
+        codificado = (contenido or "").encode("utf-8")
+        hash_texto = _hash_texto(contenido)
+        if not self.conexion.execute("SELECT 1 FROM textos WHERE hash = ?", (hash_texto,)).fetchone():
+            self.conexion.execute("INSERT INTO textos (hash, compresion, bytes, datos) VALUES (?, ?, ?, ?)",
+                                  (hash_texto, self.compresion, len(codificado),
+                                   COMPRESORES[self.compresion][0](codificado)))
+        return hash_texto
+
+    def guardar_cambios(self, cambios, libro=None):
+        # 'cambios' es la lista [(id, documento, fila o None)] del almacén de anotaciones; el libro de
+        # códigos se reescribe (es pequeño) solo si cambió desde la última escritura
+        libro_cambiado = libro is not None and libro.version != self._version_libro
+        if not cambios and not libro_cambiado and not self._operaciones:
+            return
+        with self.conexion:
+            bajas = [(id,) for id, _, fila in cambios if fila is None]
+            altas = [(documento,) + fila for _, documento, fila in cambios if fila is not None]
+            if bajas:
+                self.conexion.executemany("DELETE FROM anotaciones WHERE id = ?", bajas)
+            if altas:
+                self.conexion.executemany(
+                    "INSERT OR REPLACE INTO anotaciones (documento, id, codigo, color, inicio, fin) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", altas)
+            if libro_cambiado:
+                self._escribir_libro(libro.a_datos())
+            if self._operaciones:
+                self.conexion.executemany("INSERT INTO diario (operacion, argumentos) VALUES (?, ?)",
+                                          self._operaciones)
+        if libro_cambiado:
+            self._version_libro = libro.version
+        with self._cerrojo:
+            self.operaciones_en_diario += len(self._operaciones)
+        self._operaciones = []
+        self._sin_sincronizar = True
+
+    def _escribir_libro(self, datos_libro):
+        self.conexion.execute("DELETE FROM codigos")
+        self.conexion.execute("DELETE FROM fusiones")
+        self.conexion.executemany("INSERT INTO codigos (id, nombre, color) VALUES (?, ?, ?)",
+                                  datos_libro["codigos"])
+        self.conexion.executemany("INSERT INTO fusiones (orden, origen, destino) VALUES (?, ?, ?)",
+                                  [(i,) + tuple(f) for i, f in enumerate(datos_libro["fusiones"])])
+
+    def guardar_estado(self, valores):
+        # Se marcan las claves antes de escribirlas (ver '_compactar_diario')
+        with self._cerrojo:
+            self._claves_directas.update(valores)
+        with self.conexion:
+            self._escribir_estado(valores)
+        self._sin_sincronizar = True
+
+    def _escribir_estado(self, valores):
+        self.conexion.executemany("INSERT OR REPLACE INTO estado (clave, valor) VALUES (?, ?)",
+                                  [(clave, pickle.dumps(valor)) for clave, valor in valores.items()])
+
+    def conservar_documentos(self, nombres):
+        # Se eliminan los documentos que no están en 'nombres' junto con sus oraciones y fragmentos
+        nombres = set(nombres)
+        sobrantes = [(nombre,) for (nombre,) in self.conexion.execute("SELECT nombre FROM documentos")
+                     if nombre not in nombres]
+        if sobrantes:
+            with self.conexion:
+                self.conexion.executemany("DELETE FROM anotaciones WHERE documento = ?", sobrantes)
+                self.conexion.executemany("DELETE FROM documentos WHERE nombre = ?", sobrantes)
+                # Se eliminan los textos que ya no usa ningún documento
+                self.conexion.execute("DELETE FROM textos WHERE hash NOT IN (SELECT texto FROM documentos)")
+            self._sin_sincronizar = True
+
+    # --- MIGRACIÓN DE UN PROYECTO COMPLETO (POR EJEMPLO, DESDE EL PICKLE) EN UNA SOLA TRANSACCIÓN ---
+    def importar(self, archivos_abiertos, anotaciones_por_documento, libro, estado):
+        with self.conexion:
+            for nombre, datos in archivos_abiertos.items():
+                self._insertar_documento(nombre, datos.get("contenido", ""), datos.get("limites"))
+            self.conexion.executemany(
+                "INSERT OR REPLACE INTO anotaciones (documento, id, codigo, color, inicio, fin) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(documento,) + tuple(fila) for documento, filas in anotaciones_por_documento.items()
+                 for fila in filas])
+            self._escribir_libro(libro.a_datos())
+            self._escribir_estado(estado)
+        self._version_libro = libro.version
+        self._sin_sincronizar = True
+
+    # --- ESTADÍSTICAS DEL ALMACENAMIENTO DE LOS TEXTOS ---
+    def estadisticas_textos(self):
+        documentos, bytes_documentos = self.conexion.execute(
+            "SELECT COUNT(*), COALESCE(SUM(t.bytes), 0) FROM documentos d JOIN textos t ON t.hash = d.texto").fetchone()
+        textos, bytes_textos, bytes_comprimidos = self.conexion.execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0), COALESCE(SUM(LENGTH(datos)), 0) FROM textos").fetchone()
+        return {
+            "documentos": documentos,
+            "textos": textos,
+            # Bytes que ocuparían los textos de todos los documentos sin compresión ni deduplicación
+            "bytes_documentos": bytes_documentos,
+            "bytes_textos": bytes_textos,
+            "bytes_comprimidos": bytes_comprimidos,
+            "proporcion": bytes_documentos / bytes_comprimidos if bytes_comprimidos else 1.0,
+            "textos_leidos": self.textos_leidos,
+            "tiempo_lectura": self.tiempo_lectura,
+        }
+
+    def resumen_textos(self):
+        e = self.estadisticas_textos()
+        lectura = (f"{e['tiempo_lectura'] / e['textos_leidos'] * 1e3:.2f} ms por documento abierto"
+                   if e["textos_leidos"] else "ningún documento abierto")
+        return (f"{e['documentos']} documentos, {e['textos']} textos distintos\n"
+                f"Texto original: {e['bytes_documentos'] / 1e6:.1f} MB; "
+                f"guardado: {e['bytes_comprimidos'] / 1e6:.1f} MB ({e['proporcion']:.1f}:1)\n"
+                f"Lectura: {lectura}")
+
+    # --- SINCRONIZACIÓN CON EL DISCO POR LOTES, EN SEGUNDO PLANO ---
+    def mantener(self, estado=None):
+        # Se sincronizan de una vez todas las transacciones confirmadas desde la llamada anterior;
+        # no hace nada si no hubo cambios o si el mantenimiento anterior sigue en curso. Si se recibe
+        # 'estado' (una instantánea del estado de la interfaz, tomada sin serializar), el mismo hilo
+        # compacta antes el diario en ella
+        if self._mantenimiento is not None and self._mantenimiento.is_alive():
+            return False
+        compactacion = None
+        if estado is not None:
+            # Las operaciones pendientes ya están aplicadas en la instantánea: se escriben primero para
+            # que queden dentro de las que se descartan
+            self.guardar_cambios([])
+            hasta = self.conexion.execute("SELECT MAX(secuencia) FROM diario").fetchone()[0]
+            if hasta is not None:
+                with self._cerrojo:
+                    compactacion = (estado, hasta, self.operaciones_en_diario)
+                    self.operaciones_en_diario = 0
+                self._sin_sincronizar = True
+        if not self._sin_sincronizar:
+            return False
+        self._sin_sincronizar = False
+        self._mantenimiento = threading.Thread(target=self._mantener, args=(compactacion,),
+                                               name="mantenimiento-proyecto", daemon=True)
+        self._mantenimiento.start()
+        return True
+
+    def _mantener(self, compactacion):
+        if compactacion is not None:
+            estado, hasta, operaciones = compactacion
+            try:
+                self._compactar_diario(estado, hasta)
+            except (sqlite3.Error, pickle.PicklingError):
+                # Las operaciones siguen en el diario: se vuelven a contar para compactarlas más adelante
+                with self._cerrojo:
+                    self.operaciones_en_diario += operaciones
+        self._sincronizar_disco()
+
+    def _esperar_mantenimiento(self):
+        if self._mantenimiento is not None:
+            self._mantenimiento.join()
+            self._mantenimiento = None
+
+    def _sincronizar_disco(self):
+        ruta_wal = self.ruta + "-wal"
+        try:
+            if os.path.getsize(ruta_wal) >= self.limite_wal:
+                # El traslado del WAL a la base (con su propia conexión) sincroniza el registro y la base;
+                # en modo PASSIVE no bloquea las transacciones del hilo de la interfaz
+                conexion = sqlite3.connect(self.ruta)
+                try:
+                    conexion.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                finally:
+                    conexion.close()
+            else:
+                with open(ruta_wal, "ab") as archivo:
+                    os.fsync(archivo.fileno())
+        except (OSError, sqlite3.Error):
+            # Si falla, los datos siguen en el WAL y se sincronizan en el siguiente lote o al cerrar
+            self._sin_sincronizar = True
+
+    def cerrar(self):
+        self._esperar_mantenimiento()
+        # Se traslada el registro WAL a la base para que quede un solo archivo al salir
+        self.conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conexion.close()
@@ -0,0 +1,256 @@
+# --- MÓDULO DE SEGMENTACIÓN DEL TEXTO EN ORACIONES ---
+# Las oraciones de un documento se representan como un arreglo compacto de desplazamientos
+# de caracteres [inicio_0, fin_0, inicio_1, fin_1, ...] dentro de su contenido, de modo que
+# la segmentación se calcula una sola vez y se guarda junto al texto.
+# NLTK se importa de forma perezosa: el modelo punkt se busca solo en rutas locales la primera
+# vez que se segmenta un texto, y puede precargarse en un hilo en segundo plano. El modelo solo se
+# descarga de internet cuando el usuario lo pide; sin él, se segmenta por puntos y así se informa.
+import os
+import re
+import sys
+import threading
+from array import array
+
+# Motor de segmentación utilizado cuando el proyecto no indica otro
+MOTOR_POR_DEFECTO = "nltk"
+# Nombre con el que se informa la segmentación alternativa por puntos (cuando NLTK no está disponible)
+MOTOR_PUNTOS = "punto"
+
+# Idioma del modelo punkt utilizado por nltk.sent_tokenize
+IDIOMA_PUNKT = "english"
+# Recursos de NLTK que proporcionan el modelo punkt (formato nuevo y formato anterior)
+RECURSOS_PUNKT = ("tokenizers/punkt_tab/{idioma}/", "tokenizers/punkt/{idioma}.pickle")
+
+# Estado de la resolución del modelo: None (sin consultar), True (disponible) o False (no disponible)
+_punkt_disponible = None
+_cerrojo_punkt = threading.Lock()
+
+
+# --- FUNCIÓN PARA LISTAR LAS CARPETAS LOCALES DONDE PUEDE ESTAR 'nltk_data' ---
+def rutas_locales_nltk():
+    rutas = []
+    # Copia empaquetada dentro del ejecutable de PyInstaller
+    if hasattr(sys, "_MEIPASS"):
+        rutas.append(os.path.join(sys._MEIPASS, "nltk_data"))
+    # Copia junto al ejecutable (.exe) o junto al script (.py)
+    if getattr(sys, "frozen", False):
+        rutas.append(os.path.join(os.path.dirname(sys.executable), "nltk_data"))
+    rutas.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data"))
+    return rutas
+
+
+# --- FUNCIÓN PARA RESOLVER (UNA SOLA VEZ) SI EL MODELO PUNKT ESTÁ DISPONIBLE LOCALMENTE ---
+def punkt_disponible():
+    global _punkt_disponible
+    with _cerrojo_punkt:
+        if _punkt_disponible is None:
+            try:
+                import nltk
+                # Se añaden las carpetas locales al inicio de la ruta de búsqueda de NLTK
+                for ruta in reversed(rutas_locales_nltk()):
+                    if os.path.isdir(ruta) and ruta not in nltk.data.path:
+                        nltk.data.path.insert(0, ruta)
+                _punkt_disponible = False
+                for recurso in RECURSOS_PUNKT:
+                    try:
+                        # La búsqueda solo recorre el disco; nunca intenta una conexión de red
+                        nltk.data.find(recurso.format(idioma=IDIOMA_PUNKT))
+                        _punkt_disponible = True
+                        break
+                    except LookupError:
+                        pass
+            except ImportError:
+                _punkt_disponible = False
+        return _punkt_disponible
+
+
+# --- FUNCIÓN PARA PRECARGAR EL MODELO PUNKT SIN BLOQUEAR LA INTERFAZ ---
+def precargar_en_segundo_plano(descargar=False):
+    def precargar():
+        global _punkt_disponible
+        try:
+            if not punkt_disponible() and descargar:
+                # Solo si el modelo no está en disco se intenta descargarlo, fuera del hilo principal
+                import nltk
+                if nltk.download('punkt_tab', quiet=True, raise_on_error=False):
+                    with _cerrojo_punkt:
+                        _punkt_disponible = None
+            if punkt_disponible():
+                # Se carga el modelo en memoria tokenizando un texto mínimo
+                import nltk
+                nltk.sent_tokenize("Precarga.", language=IDIOMA_PUNKT)
+        except Exception:
+            # La precarga es opcional: cualquier fallo se resolverá en la primera segmentación
+            pass
+
+    hilo = threading.Thread(target=precargar, name="precarga-nltk", daemon=True)
+    hilo.start()
+    return hilo
+
+
+# --- FUNCIÓN PARA UBICAR LAS ORACIONES TOKENIZADAS DENTRO DEL CONTENIDO ---
+def alinear_oraciones(contenido, sentencias):
+    limites = array('I')
+    cursor = 0
+    for sentencia in sentencias:
+        # Se busca cada oración a partir del final de la anterior para respetar el orden
+        inicio = contenido.find(sentencia, cursor)
+        if inicio < 0:
+            return None
+        cursor = inicio + len(sentencia)
+        limites.append(inicio)
+        limites.append(cursor)
+    return limites
+
+
+# --- FUNCIÓN DE SEGMENTACIÓN ALTERNATIVA BASADA EN PUNTOS ---
+def limites_por_puntos(contenido):
+    limites = array('I')
+    inicio = 0
+    longitud = len(contenido)
+    while inicio < longitud:
+        # Cada oración termina en el siguiente punto (incluido) o al final del contenido
+        fin = contenido.find('.', inicio)
+        fin = longitud if fin < 0 else fin + 1
+        # Se descartan los espacios y saltos de línea en los extremos del fragmento
+        izquierda, derecha = inicio, fin
+        while izquierda < derecha and contenido[izquierda].isspace():
+            izquierda += 1
+        while derecha > izquierda and contenido[derecha - 1].isspace():
+            derecha -= 1
+        if izquierda < derecha and contenido[izquierda:derecha] != '.':
+            limites.append(izquierda)
+            limites.append(derecha)
+        inicio = fin
+    return limites
+
+
+# --- FUNCIÓN PARA CONVERTIR POSICIONES DE CORTE EN LÍMITES DE ORACIONES ---
+def limites_desde_cortes(contenido, cortes):
+    limites = array('I')
+    inicio = 0
+    for fin in sorted(set(cortes)) + [len(contenido)]:
+        # Se descartan los espacios y saltos de línea en los extremos de cada fragmento
+        izquierda, derecha = inicio, fin
+        while izquierda < derecha and contenido[izquierda].isspace():
+            izquierda += 1
+        while derecha > izquierda and contenido[derecha - 1].isspace():
+            derecha -= 1
+        if izquierda < derecha:
+            limites.append(izquierda)
+            limites.append(derecha)
+        inicio = fin
+    return limites
+
+
+# --- CLASE BASE DE LOS MOTORES DE SEGMENTACIÓN ---
+class Segmentador:
+    # Identificador con el que se guarda el motor elegido en el proyecto
+    nombre = ""
+    # Texto que se muestra en el menú de la interfaz
+    descripcion = ""
+
+    def segmentar(self, contenido):
+        # Se debe retornar un array('I') con los límites [inicio_0, fin_0, inicio_1, fin_1, ...]
+        raise NotImplementedError
+
+    def segmentar_con_motor(self, contenido):
+        # Retorna (límites, nombre del motor que realmente se usó), para guardar los límites con su motor
+        return self.segmentar(contenido), self.nombre
+
+
+# --- MOTOR DE SEGMENTACIÓN BASADO EN EL MODELO PUNKT DE NLTK ---
+class SegmentadorNLTK(Segmentador):
+    nombre = "nltk"
+    descripcion = "NLTK (punkt)"
+
+    def segmentar(self, contenido):
+        return self.segmentar_con_motor(contenido)[0]
+
+    def segmentar_con_motor(self, contenido):
+        if punkt_disponible():
+            try:
+                import nltk
+                # Se tokeniza el contenido en oraciones con NLTK y se ubican en el texto
+                limites = alinear_oraciones(contenido, nltk.sent_tokenize(contenido, language=IDIOMA_PUNKT))
+                if limites is not None:
+                    return limites, self.nombre
+            except LookupError:
+                pass
+        # Fallback de tokenización manual si NLTK no está disponible; se informa como otro motor para
+        # que estos límites no se guarden como si fueran de NLTK
+        return limites_por_puntos(contenido), MOTOR_PUNTOS
+
+
+# --- MOTOR DE SEGMENTACIÓN POR REGLAS PARA ESPAÑOL ---
+class SegmentadorEspanol(Segmentador):
+    nombre = "espanol"
+    descripcion = "Reglas para español (rápido)"
+
+    # Abreviaturas frecuentes que terminan en punto sin cerrar la oración (en minúsculas y sin punto final)
+    ABREVIATURAS = frozenset((
+        "sr", "sra", "sres", "srta", "dr", "dra", "lic", "licda", "ing", "prof", "profa", "arq",
+        "mtro", "mtra", "ud", "uds", "vd", "vds", "etc", "pág", "págs", "núm", "nº", "art", "cap",
+        "aprox", "tel", "av", "avda", "col", "gral", "cía", "dpto", "depto", "ej", "p", "pp", "vol",
+        "ed", "edo", "mpio", "sta", "sto", "fig", "min", "máx", "mín", "a.c", "d.c", "ee.uu",
+        "p.ej", "q.e.p.d", "s.a", "c.p", "tte", "cnel", "gob", "pdte", "dir", "coord", "admón",
+    ))
+
+    # Signo de cierre de oración, con comillas o paréntesis de cierre opcionales, seguido de espacio
+    _FIN = re.compile(r'(?:\.\.\.|…|[.!?])+[»"”’\')\]]*(?=\s)')
+    # Inicio válido de la siguiente oración: mayúscula, dígito, apertura de pregunta/exclamación, comillas o guion
+    _INICIO = re.compile(r'\s+[A-ZÁÉÍÓÚÜÑ0-9¿¡«"“\'(\-—]')
+    # Palabra inmediatamente anterior al signo de cierre (permite abreviaturas con puntos internos)
+    _PALABRA = re.compile(r'([\w.]+)\.$')
+    # Salto de línea seguido de un marcador de hablante ("Entrevistador:", "Joel:", "E1:")
+    _TURNO = re.compile(r'\n[ \t]*(?=[A-ZÁÉÍÓÚÜÑ][\wÁÉÍÓÚÜÑáéíóúüñ .]{0,40}:\s)')
+    # Línea en blanco que separa párrafos
+    _PARRAFO = re.compile(r'\n[ \t]*\n')
+
+    def _es_abreviatura(self, contenido, fin_signo):
+        coincidencia = self._PALABRA.search(contenido, max(0, fin_signo - 20), fin_signo)
+        if not coincidencia:
+            return False
+        palabra = coincidencia.group(1).lower()
+        # Se consideran abreviaturas las de la lista y las iniciales de una sola letra mayúscula
+        return palabra in self.ABREVIATURAS or (len(coincidencia.group(1)) == 1 and coincidencia.group(1).isupper())
+
+    def segmentar(self, contenido):
+        cortes = []
+        for coincidencia in self._FIN.finditer(contenido):
+            fin = coincidencia.end()
+            # La oración solo se cierra si lo que sigue parece el inicio de otra oración
+            if not self._INICIO.match(contenido, fin):
+                continue
+            signo = coincidencia.group(0).rstrip('»"”’\')]')
+            if signo == '.' and self._es_abreviatura(contenido, coincidencia.start() + 1):
+                continue
+            cortes.append(fin)
+        # Cada turno de palabra y cada párrafo inician una oración nueva
+        cortes.extend(m.start() for m in self._TURNO.finditer(contenido))
+        cortes.extend(m.start() for m in self._PARRAFO.finditer(contenido))
+        return limites_desde_cortes(contenido, cortes)
+
+
+# Registro de los motores de segmentación disponibles, por nombre
+SEGMENTADORES = {motor.nombre: motor for motor in (SegmentadorNLTK(), SegmentadorEspanol())}
+
+
+# --- FUNCIÓN PARA OBTENER UN MOTOR DE SEGMENTACIÓN POR SU NOMBRE ---
+def obtener_segmentador(nombre=None):
+    return SEGMENTADORES.get(nombre or MOTOR_POR_DEFECTO, SEGMENTADORES[MOTOR_POR_DEFECTO])
+
+
+# --- FUNCIÓN PARA CALCULAR LOS LÍMITES DE LAS ORACIONES DEL CONTENIDO ---
+def segmentar_limites(contenido, motor=None):
+    return obtener_segmentador(motor).segmentar(contenido)
+
+
+# --- FUNCIÓN PARA CALCULAR LOS LÍMITES JUNTO CON EL MOTOR QUE REALMENTE SE USÓ ---
+def segmentar_con_motor(contenido, motor=None):
+    return obtener_segmentador(motor).segmentar_con_motor(contenido)
+
+
+# --- FUNCIÓN PARA OBTENER EL TEXTO DE LAS ORACIONES A PARTIR DE SUS LÍMITES ---
+def oraciones_desde_limites(contenido, limites):
+    return [contenido[limites[i]:limites[i + 1]] for i in range(0, len(limites), 2)]
@@ -0,0 +1,112 @@
+# --- MÓDULO DEL TOOLTIP DE LOS CÓDIGOS DEL PANEL "TEXTO" ---
+# Una sola ventana de tooltip para todos los códigos, creada la primera vez que se necesita y luego
+# solo ocultada (withdraw) y mostrada (deiconify), en lugar de crear y destruir un Toplevel y un Label
+# en cada <Enter>/<Leave>. El tooltip no consulta la posición del ratón: la interfaz le pasa una vez
+# por cuadro, con 'actualizar', el desplazamiento codificado bajo el cursor (o None si no hay ninguno).
+# Los nombres de los códigos solo se piden con 'codigos_en' cuando el tooltip aparece, después de un
+# breve retardo, o mientras está visible y el ratón pasa a otro carácter. Cuando hay fragmentos
+# superpuestos se listan todos los códigos presentes bajo el cursor.
+import tkinter as tk
+
+# Milisegundos con el ratón sobre un fragmento antes de mostrar el tooltip
+RETARDO_APARICION = 350
+# Separación en píxeles entre el cursor y el tooltip
+DESPLAZAMIENTO = 10
+
+
+# --- CLASE DEL TOOLTIP COMPARTIDO ---
+class TooltipCodigos:
+    def __init__(self, widget, codigos_en, retardo=RETARDO_APARICION):
+        # Se asigna el widget sobre el que se muestran los códigos y la función que retorna los nombres
+        # de los códigos en un desplazamiento del texto
+        self.widget = widget
+        self.codigos_en = codigos_en
+        self.retardo = retardo
+        # Ventana y etiqueta reutilizadas (se crean de forma diferida)
+        self.ventana = None
+        self.etiqueta = None
+        self._visible = False
+        self._texto = None
+        self._geometria = None
+        # Último desplazamiento codificado recibido, desplazamiento mostrado y posición del ratón en la
+        # pantalla: (x_root, y_root)
+        self._desplazamiento = None
+        self._mostrado = None
+        self._posicion = None
+        # Identificador del 'after' pendiente de la aparición con retardo
+        self._aparicion = None
+
+        # Se agregan los manejadores sin reemplazar los que ya tenga el widget
+        widget.bind("<Leave>", self.ocultar, add="+")
+        widget.bind("<MouseWheel>", self.ocultar, add="+")
+
+    def _crear_ventana(self):
+        self.ventana = tk.Toplevel(self.widget)
+        # Se elimina la barra de título y los bordes para que parezca una etiqueta flotante
+        self.ventana.wm_overrideredirect(True)
+        self.ventana.withdraw()
+        self.etiqueta = tk.Label(
+            self.ventana,
+            justify='left',
+            background='#FFFF66',
+            relief='solid',
+            borderwidth=1,
+            font=("arial", 11, "bold", "italic")
+        )
+        self.etiqueta.pack(ipadx=5, ipady=2)
+
+    # --- POSICIÓN CODIFICADA BAJO EL RATÓN, RESUELTA POR LA INTERFAZ UNA VEZ POR CUADRO ---
+    def actualizar(self, desplazamiento, x_root, y_root):
+        # 'desplazamiento' es la posición codificada del texto bajo el ratón en la posición de pantalla
+        # (x_root, y_root), o None si el ratón no está sobre ningún fragmento
+        self._desplazamiento = desplazamiento
+        self._posicion = (x_root, y_root)
+        if desplazamiento is None:
+            self._esconder()
+        elif self._visible:
+            self._mostrar()
+        elif self._aparicion is None:
+            self._aparicion = self.widget.after(self.retardo, self._aparecer)
+
+    def _aparecer(self):
+        # Se usa el último desplazamiento recibido: durante el retardo el ratón pudo salir del fragmento
+        self._aparicion = None
+        if self._desplazamiento is not None:
+            self._mostrar()
+
+    # --- MOSTRAR, MOVER Y OCULTAR (SOLO SE TOCA TK CUANDO ALGO CAMBIA) ---
+    def _mostrar(self):
+        if self.ventana is None:
+            self._crear_ventana()
+        # Los códigos solo se consultan cuando el ratón pasa a otro carácter
+        if self._desplazamiento != self._mostrado:
+            self._mostrado = self._desplazamiento
+            texto = "\n".join(str(codigo) for codigo in self.codigos_en(self._desplazamiento))
+        else:
+            texto = self._texto
+        if texto != self._texto:
+            self._texto = texto
+            self.etiqueta.config(text=texto)
+        geometria = f"+{self._posicion[0] + DESPLAZAMIENTO}+{self._posicion[1] + DESPLAZAMIENTO}"
+        if geometria != self._geometria:
+            self._geometria = geometria
+            self.ventana.wm_geometry(geometria)
+        if not self._visible:
+            self._visible = True
+            self.ventana.deiconify()
+            self.ventana.lift()
+
+    def _esconder(self):
+        if self._aparicion is not None:
+            self.widget.after_cancel(self._aparicion)
+            self._aparicion = None
+        if self._visible:
+            self._visible = False
+            self._mostrado = None
+            self.ventana.withdraw()
+
+    def ocultar(self, event=None):
+        # El ratón salió del widget (o el texto se desplazó bajo él)
+        self._desplazamiento = None
+        self._posicion = None
+        self._esconder()
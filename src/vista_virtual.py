@@ -0,0 +1,164 @@
+# --- MÓDULO DE VISTA VIRTUAL PARA DOCUMENTOS MUY GRANDES ---
+# En lugar de insertar todo el documento en el widget Text, solo se materializa una ventana de
+# oraciones alrededor de la zona visible (más un margen). Los índices "línea.columna" que usa el
+# resto de la aplicación se expresan siempre sobre la disposición COMPLETA del documento
+# (cada línea de cada oración seguida de una línea en blanco, ver 'DisposicionTexto'); esta clase
+# traduce entre esos índices absolutos y los índices del widget, que solo difieren en un
+# desplazamiento de líneas.
+import tkinter as tk
+
+# Oraciones que se materializan para cubrir la zona visible
+ORACIONES_VISIBLES = 200
+# Oraciones adicionales que se materializan antes y después de la zona visible
+MARGEN_ORACIONES = 400
+# Fracción del contenido materializado a partir de la cual se desplaza la ventana al acercarse a un extremo
+UMBRAL_BORDE = 0.15
+
+
+# --- FUNCIÓN PARA SEPARAR UN ÍNDICE "línea.columna" ---
+def separar_indice(indice):
+    linea, columna = str(indice).split('.')
+    return int(linea), int(columna)
+
+
+# --- CLASE DE LA VISTA VIRTUAL ---
+class VistaVirtual:
+    def __init__(self, widget, disposicion, antes_de_materializar=None, despues_de_materializar=None):
+        # Se asigna el widget Text donde se materializa la ventana
+        self.widget = widget
+        # Se asigna la disposición del documento y la secuencia (vista perezosa) de sus oraciones
+        self.disposicion = disposicion
+        self.oraciones = disposicion.oraciones
+        # Funciones que la aplicación usa para guardar y volver a aplicar los subrayados de la ventana
+        self.antes_de_materializar = antes_de_materializar
+        self.despues_de_materializar = despues_de_materializar
+
+        # Línea absoluta donde comienza cada oración y total de líneas de la disposición completa
+        self.lineas = disposicion.lineas
+        self.total_lineas = disposicion.total_lineas
+
+        # Rango de oraciones materializado actualmente [inicio, fin)
+        self.inicio = 0
+        self.fin = 0
+        self._ajuste_pendiente = False
+        self._barra = None
+
+    # --- CONSULTAS SOBRE LA VENTANA MATERIALIZADA ---
+    def desplazamiento(self):
+        # Número de líneas absolutas que quedan antes de la primera línea del widget
+        return self.lineas[self.inicio] - 1 if self.inicio < len(self.lineas) else 0
+
+    def linea_inicial(self):
+        return self.lineas[self.inicio] if self.inicio < len(self.lineas) else self.total_lineas
+
+    def linea_final(self):
+        # Primera línea absoluta que ya NO está materializada
+        return self.lineas[self.fin] if self.fin < len(self.lineas) else self.total_lineas
+
+    def oracion_de_linea(self, linea):
+        return self.disposicion.oracion_de_linea(linea)
+
+    # --- TRADUCCIÓN DE ÍNDICES ---
+    def a_widget(self, indice_absoluto):
+        # Retorna el índice equivalente en el widget, o None si la posición no está materializada
+        linea, columna = separar_indice(indice_absoluto)
+        if not self.linea_inicial() <= linea < self.linea_final():
+            return None
+        return f"{linea - self.desplazamiento()}.{columna}"
+
+    def a_widget_recortado(self, inicio_absoluto, fin_absoluto):
+        # Retorna el tramo (inicio, fin) recortado a la ventana, o None si no se intersecan
+        linea_ini, col_ini = separar_indice(inicio_absoluto)
+        linea_fin, col_fin = separar_indice(fin_absoluto)
+        if (linea_fin, col_fin) <= (self.linea_inicial(), 0) or linea_ini >= self.linea_final():
+            return None
+        desplazamiento = self.desplazamiento()
+        if linea_ini < self.linea_inicial():
+            inicio = "1.0"
+        else:
+            inicio = f"{linea_ini - desplazamiento}.{col_ini}"
+        if linea_fin >= self.linea_final():
+            fin = "end-1c"
+        else:
+            fin = f"{linea_fin - desplazamiento}.{col_fin}"
+        return inicio, fin
+
+    def a_absoluto(self, indice_widget):
+        linea, columna = separar_indice(self.widget.index(indice_widget))
+        return f"{linea + self.desplazamiento()}.{columna}"
+
+    # --- MATERIALIZACIÓN DE LA VENTANA ---
+    def materializar(self, oracion_central):
+        if self.antes_de_materializar:
+            self.antes_de_materializar()
+        total = len(self.lineas)
+        self.inicio = max(0, oracion_central - MARGEN_ORACIONES)
+        self.fin = min(total, oracion_central + ORACIONES_VISIBLES + MARGEN_ORACIONES)
+        # Se inserta toda la ventana en una sola operación
+        self.widget.delete("1.0", tk.END)
+        if self.inicio < self.fin:
+            texto = '\n'.join(self.oraciones[self.inicio:self.fin]).replace('\n', '\n\n') + '\n\n'
+            self.widget.insert(tk.END, texto)
+        if self.despues_de_materializar:
+            self.despues_de_materializar()
+
+    def asegurar_visible(self, indice_absoluto):
+        # Se materializa la zona del índice si hace falta y se desplaza la vista hasta él
+        if self.a_widget(indice_absoluto) is None:
+            linea, _ = separar_indice(indice_absoluto)
+            self.materializar(max(0, self.oracion_de_linea(linea) - ORACIONES_VISIBLES // 2))
+        indice = self.a_widget(indice_absoluto)
+        self.widget.see(indice)
+        return indice
+
+    # --- INTEGRACIÓN CON LA BARRA DE DESPLAZAMIENTO ---
+    def conectar_barra(self, barra):
+        # La barra representa el documento completo, no solo la ventana materializada
+        self._barra = barra
+        barra.config(command=self.desplazar)
+        self.widget.config(yscrollcommand=self._al_desplazarse)
+
+    def desconectar_barra(self):
+        if self._barra is not None:
+            self._barra.config(command=self.widget.yview)
+            self.widget.config(yscrollcommand=self._barra.set)
+            self._barra = None
+
+    def desplazar(self, accion, *argumentos):
+        if accion == "moveto":
+            # Se traduce la fracción del documento completo a una oración y se materializa su zona
+            linea = int(float(argumentos[0]) * self.total_lineas)
+            oracion = self.oracion_de_linea(linea)
+            if not self.inicio <= oracion < self.fin:
+                self.materializar(max(0, oracion - ORACIONES_VISIBLES // 2))
+            indice = self.a_widget(f"{self.lineas[oracion]}.0")
+            if indice:
+                self.widget.yview(indice)
+        else:
+            # El desplazamiento por unidades o páginas actúa sobre el widget directamente
+            self.widget.yview(accion, *argumentos)
+
+    def _al_desplazarse(self, primero, ultimo):
+        primero, ultimo = float(primero), float(ultimo)
+        lineas_widget = max(1, self.linea_final() - self.linea_inicial())
+        # Se informa a la barra la posición relativa al documento completo
+        if self._barra is not None:
+            base = self.desplazamiento()
+            self._barra.set((base + primero * lineas_widget) / self.total_lineas,
+                            (base + ultimo * lineas_widget) / self.total_lineas)
+        # Si la vista se acerca a un extremo de la ventana, se desplaza la ventana (fuera de este evento)
+        cerca_inicio = primero < UMBRAL_BORDE and self.inicio > 0
+        cerca_fin = ultimo > 1 - UMBRAL_BORDE and self.fin < len(self.lineas)
+        if (cerca_inicio or cerca_fin) and not self._ajuste_pendiente:
+            self._ajuste_pendiente = True
+            self.widget.after_idle(self._recentrar)
+
+    def _recentrar(self):
+        self._ajuste_pendiente = False
+        # Se conserva la línea absoluta que está en la parte superior de la vista
+        superior = self.a_absoluto("@0,0")
+        linea, _ = separar_indice(superior)
+        self.materializar(max(0, self.oracion_de_linea(linea) - ORACIONES_VISIBLES // 4))
+        indice = self.a_widget(superior)
+        if indice:
+            self.widget.yview(indice)
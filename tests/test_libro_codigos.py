@@ -0,0 +1,56 @@
+# --- PRUEBAS DEL LIBRO DE CÓDIGOS: ELIMINAR UN CÓDIGO Y VOLVER A CREARLO ---
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from anotaciones import AlmacenAnotaciones  # noqa: E402
+
+
+def test_eliminar_y_volver_a_crear_un_codigo_anexado():
+    almacen = AlmacenAnotaciones()
+    libro = almacen.libro
+    a = libro.crear("A", "red")
+    b = libro.crear("B", "blue")
+    almacen.agregar("f1", "doc", a, "red", 0, 5)
+    almacen.agregar("f2", "doc", b, "blue", 10, 15)
+    almacen.fusionar_codigos(a, b)
+
+    almacen.eliminar_codigo(b)
+
+    # El nombre anexado queda libre: el código nuevo no hereda la identidad ni el color del grupo eliminado
+    nuevo = libro.obtener_o_crear("A", "green")
+    assert nuevo not in (a, b)
+    assert libro.nombre(nuevo) == "A"
+    assert libro.color_visible(nuevo, "green") == "green"
+    almacen.agregar("f3", "doc", nuevo, "green", 20, 25)
+    assert list(almacen.codigos_superpuestos("doc", 20, 21)) == [nuevo]
+    # No queda ninguna anexión del grupo eliminado por deshacer
+    assert almacen.deshacer_fusion() is None
+    assert libro.a_datos() == {"codigos": [(nuevo, "A", "green")], "fusiones": []}
+
+
+def test_eliminar_un_grupo_conserva_las_anexiones_de_otros():
+    almacen = AlmacenAnotaciones()
+    libro = almacen.libro
+    a, b, c, d = (libro.crear(nombre, "red") for nombre in "ABCD")
+    almacen.fusionar_codigos(c, d)
+    almacen.fusionar_codigos(a, b)
+
+    almacen.eliminar_codigo(b)
+
+    assert libro.id_de("A") is None and libro.id_de("B") is None
+    assert libro.nombre(c) == "D"
+    fusion = almacen.deshacer_fusion()
+    assert (fusion.origen, fusion.destino) == (c, d)
+    assert libro.nombre(c) == "C"
+
+
+def test_codificar_con_otro_color_actualiza_el_color_del_codigo():
+    almacen = AlmacenAnotaciones()
+    libro = almacen.libro
+    a = libro.obtener_o_crear("A", "blue")
+    version = libro.version
+    libro.cambiar_color(libro.obtener_o_crear("A", "green"), "green")
+    assert almacen.color_de_codigo(a) == "green"
+    assert libro.version > version
@@ -0,0 +1,18 @@
+# --- PRUEBAS DEL PROYECTO SQLITE: DOCUMENTOS QUE SE VUELVEN A IMPORTAR CON OTRO TEXTO ---
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from proyecto_sqlite import ProyectoSQLite  # noqa: E402
+
+
+def test_texto_distinto_solo_para_documentos_guardados_con_otro_texto(tmp_path):
+    proyecto = ProyectoSQLite(str(tmp_path / "proyecto.db"))
+    try:
+        assert not proyecto.texto_distinto("entrevista.txt", "Hola.")
+        proyecto.guardar_documento("entrevista.txt", "Hola.", None)
+        assert not proyecto.texto_distinto("entrevista.txt", "Hola.")
+        assert proyecto.texto_distinto("entrevista.txt", "Hola de nuevo.")
+    finally:
+        proyecto.cerrar()